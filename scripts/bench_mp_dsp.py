@@ -0,0 +1,74 @@
+"""Benchmark multi-channel NBFM + spectrum in-process vs. the shared-memory process pool."""
+import argparse
+import time
+
+import numpy as np
+
+from nast_gs.demod.fm import NBFMReceiver
+from nast_gs.processing.mp_dsp import ProcessDSPBackend
+from nast_gs.processing.spectrum import SpectrumEngine
+
+FS = 2.4e6
+BLOCK = 16384
+OFFSETS = (-480e3, -310e3, -45e3, 120e3, 260e3, 480e3)
+
+
+def synth(seconds=2.0, fs=FS):
+    n = np.arange(int(seconds * fs))
+    iq = sum(np.exp(2j * np.pi * (f / fs * n + 0.8 * np.sin(2 * np.pi * 1e3 / fs * n))) for f in OFFSETS)
+    return (iq + 0.05 * (np.random.randn(n.size) + 1j * np.random.randn(n.size))).astype(np.complex64)
+
+
+def run_inline(iq):
+    rxs = [NBFMReceiver(FS, center_offset_hz=f) for f in OFFSETS]
+    eng = SpectrumEngine()
+    t0 = time.perf_counter()
+    for i in range(0, iq.size, BLOCK):
+        b = iq[i:i + BLOCK]
+        eng.psd_db(b, 4096, max_segments=0)
+        for rx in rxs:
+            rx.process(b)
+    return time.perf_counter() - t0
+
+
+def run_pool(iq, workers):
+    with ProcessDSPBackend(FS, BLOCK, num_workers=workers, n_slots=32) as be:
+        for k, f in enumerate(OFFSETS):
+            be.add_channel(str(k), "FM", offset_hz=f)
+        # warm up: workers import scipy and build their filters
+        be.submit(iq[:BLOCK])
+        warm = 0
+        while warm < len(OFFSETS) + 1:
+            warm += len(be.poll(5.0))
+
+        expected = 0
+        got = 0
+        t0 = time.perf_counter()
+        for i in range(0, iq.size - BLOCK + 1, BLOCK):
+            while not be.free_slots:
+                got += len(be.poll(0.01))
+            be.submit(iq[i:i + BLOCK])
+            expected += len(OFFSETS) + 1
+            got += len(be.poll(0))
+        while got < expected:
+            got += len(be.poll(5.0))
+        return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--workers", type=int, nargs="*", default=[1, 2, 4])
+    args = ap.parse_args()
+
+    iq = synth()
+    seconds = iq.size / FS
+    print(f"{len(OFFSETS)} NBFM channels + 4096-bin Welch PSD, {seconds:.1f} s at {FS / 1e6:.1f} MS/s")
+    t = run_inline(iq)
+    print(f"  in-process             : {t * 1e3:8.1f} ms  ({seconds / t:5.1f}x real time)")
+    for w in args.workers:
+        t = run_pool(iq, w)
+        print(f"  process pool, {w} worker{'s' if w > 1 else ' '}: {t * 1e3:8.1f} ms  ({seconds / t:5.1f}x real time)")
+
+
+if __name__ == "__main__":
+    main()
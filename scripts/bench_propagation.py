@@ -0,0 +1,122 @@
+"""Benchmark the propagation engine: per-step loop vs. vectorized batch propagation."""
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from skyfield.api import EarthSatellite, load, wgs84
+
+from nast_gs.prop import load_tle, propagate_arrays, propagate_tle
+from nast_gs.prop.catalog import TLECatalog, load_catalog
+from nast_gs.prop.propagator import SatelliteTracker, compute_passes
+from nast_gs.prop.scheduler import build_schedule, compute_catalog_passes
+
+GS = dict(gs_lat=27.7, gs_lon=85.3, gs_alt_m=1300.0)
+
+
+def legacy_propagate(tle, start_dt, minutes, step_s, gs_lat, gs_lon, gs_alt_m=0.0):
+    """The original one-timestep-at-a-time loop, kept here as the baseline."""
+    ts = load.timescale()
+    name, line1, line2 = tle
+    sat = EarthSatellite(line1, line2, name, ts)
+    results = []
+    for i in range(int((minutes * 60) / step_s) + 1):
+        t = start_dt + timedelta(seconds=i * step_s)
+        tt = ts.utc(t.year, t.month, t.day, t.hour, t.minute, t.second + t.microsecond / 1e6)
+        geocentric = sat.at(tt)
+        subpoint = wgs84.subpoint(geocentric)
+        topocentric = geocentric - wgs84.latlon(gs_lat, gs_lon, elevation_m=gs_alt_m).at(tt)
+        alt, az, distance = topocentric.altaz()
+        results.append((t, subpoint.latitude.degrees, az.degrees, alt.degrees, distance.km))
+    return results
+
+
+def legacy_current_state(tle, dt, gs_lat, gs_lon, gs_alt_m=0.0):
+    """The original per-tick path: fresh timescale, satellite and observer every call."""
+    ts = load.timescale()
+    name, line1, line2 = tle
+    sat = EarthSatellite(line1, line2, name, ts)
+    tt = ts.utc(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second + dt.microsecond / 1e6)
+    topocentric = sat.at(tt) - wgs84.latlon(gs_lat, gs_lon, elevation_m=gs_alt_m).at(tt)
+    return topocentric.altaz()
+
+
+def legacy_passes(tle, start_dt, hours, step_s, gs_lat, gs_lon, gs_alt_m=0.0):
+    """The original grid-scan pass finder: first/last positive sample, max sample as TCA."""
+    pts = propagate_tle(tle, start_dt, hours * 60, step_s, gs_lat, gs_lon, gs_alt_m)
+    passes, cur = [], []
+    for p in pts + [{"eldeg": -1.0}]:
+        if p["eldeg"] > 0.0:
+            cur.append(p)
+        elif cur:
+            tca = max(cur, key=lambda x: x["eldeg"])
+            passes.append((cur[0]["time"], cur[-1]["time"], tca["time"], tca["eldeg"]))
+            cur = []
+    return passes
+
+
+def _timeit(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    here = Path(__file__).resolve().parents[1]
+    tle = load_tle(str(here / "data" / "iss.tle"))
+    start = datetime.utcnow()
+    minutes, step_s = 48 * 60, 30
+
+    t_legacy = _timeit(lambda: legacy_propagate(tle, start, minutes, step_s, **GS), repeat=1)
+    t_arrays = _timeit(lambda: propagate_arrays(tle, start, minutes, step_s, **GS))
+    t_dicts = _timeit(lambda: propagate_tle(tle, start, minutes, step_s, **GS))
+
+    n = int(minutes * 60 / step_s) + 1
+    print(f"48 h @ {step_s} s ({n} points)")
+    print(f"  legacy loop       : {t_legacy * 1e3:9.1f} ms")
+    print(f"  propagate_arrays  : {t_arrays * 1e3:9.1f} ms  ({t_legacy / t_arrays:5.1f}x)")
+    print(f"  propagate_tle     : {t_dicts * 1e3:9.1f} ms  ({t_legacy / t_dicts:5.1f}x)")
+
+    # Pass prediction: grid scan vs. coarse scan + bisection/parabolic refinement.
+    hours = 48
+    ref = compute_passes(tle, start, hours, precision_s=1e-3, **GS)
+    print(f"\nPass prediction, {hours} h lookahead ({len(ref)} passes)")
+    for step in (30, 1):
+        t = _timeit(lambda: legacy_passes(tle, start, hours, step, **GS), repeat=1)
+        got = legacy_passes(tle, start, hours, step, **GS)
+        err = max((abs((g[0] - r["aos"]).total_seconds()) for g, r in zip(got, ref)), default=0.0)
+        print(f"  grid scan @ {step:2d} s  : {t * 1e3:9.1f} ms  max AOS error {err:6.2f} s")
+    t = _timeit(lambda: compute_passes(tle, start, hours, **GS))
+    got = compute_passes(tle, start, hours, **GS)
+    err = max((abs((g["aos"] - r["aos"]).total_seconds()) for g, r in zip(got, ref)), default=0.0)
+    print(f"  compute_passes    : {t * 1e3:9.1f} ms  max AOS error {err:6.2f} s")
+
+    # Tracking tick: cold objects per call vs. a long-lived SatelliteTracker.
+    ticks = 200
+    t = _timeit(lambda: [legacy_current_state(tle, datetime.utcnow(), **GS) for _ in range(ticks)], repeat=1)
+    tracker = SatelliteTracker(tle, GS["gs_lat"], GS["gs_lon"], GS["gs_alt_m"])
+    for _ in range(ticks):
+        tracker.state_at(datetime.utcnow())
+    stats = tracker.tick_stats()
+    print(f"\nTracking tick ({ticks} calls)")
+    print(f"  cold objects      : {t / ticks * 1e3:9.3f} ms/tick")
+    print(f"  SatelliteTracker  : {stats['mean_ms']:9.3f} ms/tick (max {stats['max_ms']:.3f} ms)")
+
+    # Station scheduling: 300 satellites (the launch file repeated) over 7 days.
+    launch = load_catalog(str(here / "08-15_02.01.26_TLE (1).txt"))
+    fleet = TLECatalog([launch[i % len(launch)] for i in range(300)])
+    t0 = time.perf_counter()
+    passes = compute_catalog_passes(fleet, start, 168, **GS)
+    t_pass = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    sched = build_schedule(passes, min_gap_s=60.0)
+    t_sched = time.perf_counter() - t0
+    print(f"\nScheduling {len(fleet)} satellites over 7 days")
+    print(f"  catalog passes    : {t_pass * 1e3:9.1f} ms  ({len(passes)} passes)")
+    print(f"  build_schedule    : {t_sched * 1e3:9.1f} ms  ({len(sched['schedule'])} scheduled)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Prefetch map tiles (and Leaflet) for offline use at a field station.
+
+Examples:
+    python scripts/prefetch_tiles.py --around 27.7 85.3 --radius-km 800 --zoom 0 8
+    python scripts/prefetch_tiles.py --bbox 26 80 31 89 --zoom 3 12 --url https://tiles.example.org/{z}/{x}/{y}.png
+"""
+import argparse
+import sys
+
+from nast_gs.config import load_config
+from nast_gs.tile_cache import (DEFAULT_TILE_URL, TileCache, bbox_around, check_tile_policy, count_tiles,
+                                default_cache_path, fetch_leaflet, prefetch)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    region = ap.add_mutually_exclusive_group()
+    region.add_argument("--bbox", nargs=4, type=float, metavar=("SOUTH", "WEST", "NORTH", "EAST"))
+    region.add_argument("--around", nargs=2, type=float, metavar=("LAT", "LON"),
+                        help="centre of the region (default: the saved ground station)")
+    ap.add_argument("--radius-km", type=float, default=1000.0)
+    ap.add_argument("--zoom", nargs=2, type=int, default=[0, 7], metavar=("MIN", "MAX"))
+    ap.add_argument("--cache", default=default_cache_path(), help="MBTiles file")
+    ap.add_argument("--url", default=DEFAULT_TILE_URL,
+                    help="tile URL template with {z}/{x}/{y}; the OSM default only allows small regions")
+    ap.add_argument("--max-tiles", type=int, default=20000)
+    ap.add_argument("--delay", type=float, default=0.05, help="seconds between downloads")
+    ap.add_argument("--leaflet", action="store_true", help="re-download the vendored Leaflet (after a version bump)")
+    ap.add_argument("--dry-run", action="store_true", help="only print the tile count")
+    args = ap.parse_args(argv)
+
+    if args.bbox:
+        bbox = tuple(args.bbox)
+    else:
+        if args.around:
+            lat, lon = args.around
+        else:
+            cfg = load_config() or {}
+            if "gs_lat" not in cfg:
+                ap.error("no ground station saved; use --bbox or --around")
+            lat, lon = cfg["gs_lat"], cfg["gs_lon"]
+        bbox = bbox_around(lat, lon, args.radius_km)
+
+    zmin, zmax = args.zoom
+    n = count_tiles(*bbox, zmin, zmax)
+    print(f"Region S{bbox[0]:.3f} W{bbox[1]:.3f} N{bbox[2]:.3f} E{bbox[3]:.3f}, zoom {zmin}-{zmax}: {n} tiles")
+    try:
+        check_tile_policy(args.url, bbox, zmin, zmax)
+    except ValueError as e:
+        ap.error(str(e))
+    if n > args.max_tiles:
+        ap.error(f"more than --max-tiles {args.max_tiles}; reduce the area or max zoom")
+    if args.dry_run:
+        return 0
+
+    if args.leaflet:
+        print(f"Leaflet -> {fetch_leaflet()}")
+
+    def progress(i, total):
+        if i % 50 == 0 or i == total:
+            print(f"\r{i}/{total}", end="", flush=True)
+
+    with TileCache(args.cache) as cache:
+        stats = prefetch(cache, bbox, zmin, zmax, url=args.url, max_tiles=args.max_tiles, delay_s=args.delay,
+                         progress=progress)
+        print(f"\nfetched {stats['fetched']}, already cached {stats['skipped']}, failed {stats['failed']}; "
+              f"{len(cache)} tiles in {args.cache}")
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,7 @@ from pathlib import Path
 
 from nast_gs.prop import load_tle, propagate_tle
 from nast_gs.gui import MapWindow
+from nast_gs.gui.map_view import register_map_scheme
 from PyQt6 import QtWidgets
 
 
@@ -19,6 +20,8 @@ def main():
 
     latlon = [(p["sublat"], p["sublon"]) for p in points]
 
+    # offline tiles + bundled Leaflet; the scheme must exist before the QApplication
+    register_map_scheme()
     app = QtWidgets.QApplication(sys.argv)
     win = MapWindow()
     win.set_track(latlon)
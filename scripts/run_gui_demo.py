@@ -2,12 +2,15 @@
 import sys
 from PyQt6 import QtWidgets, QtCore, QtGui
 from nast_gs.gui.main_window import MainWindow
+from nast_gs.gui.map_view import register_map_scheme
 
 
 def main():
     # Force English locale so numbers show as 0-9 (not Devanagari)
     QtCore.QLocale.setDefault(QtCore.QLocale(QtCore.QLocale.Language.English, QtCore.QLocale.Country.UnitedStates))
 
+    # offline tiles + bundled Leaflet; the scheme must exist before the QApplication
+    register_map_scheme()
     app = QtWidgets.QApplication(sys.argv)
 
     # Force a font that renders Latin digits consistently
@@ -1,6 +1,8 @@
 import numpy as np
 from scipy.signal import firwin, lfilter, decimate, resample_poly
 
+from nast_gs.processing.filters import Deemphasis, FIRDecimator, RationalResampler, lowpass_taps
+
 
 def fm_demod_to_audio(
     iq: np.ndarray,
@@ -50,20 +52,14 @@ def fm_demod_to_audio(
     fm = lfilter(af_taps, 1.0, fm)
 
     # -------------------------------------------------
-    # 5) De-emphasis
+    # 5) Resample to audio rate (48 kHz)
     # -------------------------------------------------
-    alpha = np.exp(-1.0 / (fs_if * deemph_tau))
-    y = np.empty_like(fm)
-    z = 0.0
-    for i, v in enumerate(fm):
-        z = alpha * z + (1.0 - alpha) * v
-        y[i] = z
-    fm = y
+    audio = resample_poly(fm, fs_audio, int(fs_if))
 
     # -------------------------------------------------
-    # 6) Resample to audio rate (48 kHz)
+    # 6) De-emphasis (one-pole IIR at the audio rate; 5x fewer samples than at IF)
     # -------------------------------------------------
-    audio = resample_poly(fm, fs_audio, int(fs_if))
+    audio = Deemphasis(fs_audio, deemph_tau).process(audio)
 
     # -------------------------------------------------
     # 7) Normalize
@@ -72,4 +68,186 @@ def fm_demod_to_audio(
     peak = np.max(np.abs(audio)) + 1e-12
     audio = audio / peak * 0.8
 
-    return audio.astype(np.float32)
\ No newline at end of file
+    return audio.astype(np.float32)
+
+def _discriminate(x: np.ndarray, prev) -> np.ndarray:
+    """Quadrature FM discriminator (rad/sample), continuing from ``prev``, the previous block's last sample."""
+    last = np.empty_like(x)
+    last[0] = prev
+    last[1:] = x[:-1]
+    return np.angle(x * np.conj(last)).astype(np.float32)
+
+
+def _split_decimation(total: int, fs_in: float, min_fs_if: float):
+    """Split an integer decimation into (rf, audio) stages with fs_in / rf >= min_fs_if."""
+    best = 1
+    for d in range(1, total + 1):
+        if total % d == 0 and fs_in / d >= min_fs_if:
+            best = d
+    return best, total // best
+
+
+class StreamingFMDemodulator:
+    """
+    Block-streaming FM demodulator with persistent state.
+
+    Filters are designed once; the RF and audio decimators, the discriminator's
+    previous sample and the de-emphasis filter all carry state between process()
+    calls, so consecutive blocks join without clicks. Output gain is fixed (full
+    deviation -> +/-``gain``) or, with ``agc=True``, follows a slow RMS-tracking AGC
+    whose gain is ramped across each block instead of stepping.
+
+    The integer decimation nearest fs_in / fs_audio runs first; when it does not land
+    on fs_audio (2.048 MS/s / 43 = 47 627.9 Hz) a stateful rational resampler closes
+    the gap, so ``fs_out`` is fs_audio for every usual tuner rate.
+    """
+
+    def __init__(
+        self,
+        fs_in: float,
+        fs_audio: int = 48000,
+        deviation: float = 75_000.0,
+        deemph_tau: float = 75e-6,
+        channel_bw_hz: float = 200_000.0,
+        audio_bw_hz: float = 15_000.0,
+        gain: float = 0.8,
+        agc: bool = False,
+        agc_target_rms: float = 0.25,
+        agc_rate: float = 0.1,
+    ):
+        self.fs_in = float(fs_in)
+        total = max(1, int(round(self.fs_in / fs_audio)))
+        d_rf, d_af = _split_decimation(total, self.fs_in, channel_bw_hz)
+        self.fs_if = self.fs_in / d_rf
+        self.fs_dec = fs_dec = self.fs_if / d_af  # before the final resampler
+        self.deviation = float(deviation)
+
+        # RF channel filter: pass +/- bw/2, stop where the decimated band folds back
+        rf_cut = min(channel_bw_hz / 2.0, 0.45 * self.fs_if)
+        rf_trans = max(self.fs_if - 2.0 * rf_cut, 0.1 * self.fs_if)
+        self.rf = FIRDecimator(lowpass_taps(self.fs_in, rf_cut, rf_trans), d_rf)
+
+        af_cut = min(audio_bw_hz, 0.45 * fs_dec)
+        af_trans = max(fs_dec - 2.0 * af_cut, 0.1 * fs_dec)
+        self.af = FIRDecimator(lowpass_taps(self.fs_if, af_cut, af_trans), d_af)
+
+        # one-pole de-emphasis at the decimated audio rate, then the exact fs_audio
+        self.deemph = Deemphasis(fs_dec, deemph_tau)
+        self.resampler = RationalResampler(fs_dec, fs_audio)
+        self.fs_out = self.resampler.fs_out
+
+        self._prev = np.complex64(0.0)
+        self.gain = float(gain)
+        self.agc = bool(agc)
+        self.agc_target_rms = float(agc_target_rms)
+        self.agc_rate = float(agc_rate)
+        self._agc_gain = float(gain)
+
+    def reset(self):
+        self.rf.reset()
+        self.af.reset()
+        self.deemph.reset()
+        self.resampler.reset()
+        self._prev = np.complex64(0.0)
+        self._agc_gain = self.gain
+
+    def process(self, iq: np.ndarray) -> np.ndarray:
+        """Demodulate one IQ block; returns float32 audio at ``fs_out``."""
+        x = self.rf.process(np.asarray(iq, dtype=np.complex64))
+        if x.shape[0] == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        fm = _discriminate(x, self._prev)
+        self._prev = x[-1]
+        fm *= self.fs_if / (2.0 * np.pi * self.deviation)
+
+        audio = self.resampler.process(self.deemph.process(self.af.process(fm)))
+
+        return self._apply_gain(audio)
+
+    def _apply_gain(self, audio: np.ndarray) -> np.ndarray:
+        if not self.agc or audio.shape[0] == 0:
+            return (audio * self.gain).astype(np.float32)
+        rms = float(np.sqrt(np.mean(audio * audio))) + 1e-9
+        target = self.agc_target_rms / rms
+        g0 = self._agc_gain
+        g1 = g0 + self.agc_rate * (target - g0)
+        self._agc_gain = g1
+        ramp = np.linspace(g0, g1, audio.shape[0], endpoint=False, dtype=np.float32)
+        return np.clip(audio * ramp, -1.0, 1.0).astype(np.float32)
+
+
+class NBFMReceiver:
+    """
+    Narrowband FM receiver for satellite downlinks (12.5 / 25 kHz channels).
+
+    A frequency-translating FIR decimator picks the channel at ``center_offset_hz``
+    and goes straight from the SDR rate to ~``fs_audio`` in one stage (2.4 MS/s ->
+    48 kS/s is /50), so the discriminator and audio filtering run at the audio rate.
+    If the integer decimation misses fs_audio, a rational resampler makes ``fs_out``
+    exactly fs_audio. Discriminator, audio lowpass, optional de-emphasis and the
+    resampler carry state across blocks; output gain is fixed (full ``deviation`` ->
+    +/-``gain``).
+    """
+
+    def __init__(
+        self,
+        fs_in: float,
+        center_offset_hz: float = 0.0,
+        channel_bw_hz: float = 25_000.0,
+        deviation: float = 5_000.0,
+        fs_audio: int = 48000,
+        audio_bw_hz: float = 4_000.0,
+        deemph_tau: float = 0.0,
+        gain: float = 0.8,
+    ):
+        from nast_gs.processing.channelizer import FreqXlatingFIRDecimator
+
+        self.fs_in = float(fs_in)
+        decim = max(1, int(round(self.fs_in / fs_audio)))
+        self.channel = FreqXlatingFIRDecimator(self.fs_in, decim, center_offset_hz, channel_bw_hz)
+        self.fs_dec = fs_dec = self.channel.fs_out
+        self.deviation = float(deviation)
+
+        af_cut = min(audio_bw_hz, 0.45 * fs_dec)
+        self.af = FIRDecimator(lowpass_taps(fs_dec, af_cut, 0.5 * af_cut), 1)
+        self.deemph = Deemphasis(fs_dec, deemph_tau)
+        self.resampler = RationalResampler(fs_dec, fs_audio)
+        self.fs_out = self.resampler.fs_out
+        self.gain = float(gain)
+        self._prev = np.complex64(0.0)
+
+    @property
+    def center_offset_hz(self) -> float:
+        return self.channel.center_offset_hz
+
+    def set_center_offset(self, offset_hz: float):
+        self.channel.set_center_offset(offset_hz)
+
+    def reset(self):
+        self.channel.reset()
+        self.af.reset()
+        self.deemph.reset()
+        self.resampler.reset()
+        self._prev = np.complex64(0.0)
+
+    def process(self, iq: np.ndarray) -> np.ndarray:
+        """Demodulate one IQ block; returns float32 audio at ``fs_out``."""
+        x = self.channel.process(iq)
+        if x.shape[0] == 0:
+            return np.zeros(0, dtype=np.float32)
+        fm = _discriminate(x, self._prev)
+        self._prev = x[-1]
+        fm *= self.fs_dec / (2.0 * np.pi * self.deviation)
+        audio = self.resampler.process(self.deemph.process(self.af.process(fm)))
+        return (audio * self.gain).astype(np.float32)
+
+
+def make_fm_demod(mode: str, fs_in: float, bandwidth_hz: float = 25e3, offset_hz: float = 0.0,
+                  fs_audio: int = 48000):
+    """Streaming FM demodulator for a UI mode: "WFM" (broadcast) or narrowband "FM" at offset_hz."""
+    if mode == "WFM":
+        return StreamingFMDemodulator(fs_in, fs_audio=fs_audio)
+    # narrowband: channelize straight from the SDR rate to audio rate
+    return NBFMReceiver(fs_in, center_offset_hz=float(offset_hz), channel_bw_hz=float(bandwidth_hz),
+                        fs_audio=fs_audio)
@@ -0,0 +1,185 @@
+"""DSP worker thread: spectrum and demodulation off the Qt GUI thread.
+
+The worker owns two cursors into the streamer's ring buffer. Demodulation
+consumes every block and writes audio straight into an ``AudioFifo`` that the
+sound-card callback drains, so audio never waits for the GUI. The spectrum of
+the newest block is computed at display rate and handed to the GUI through a
+queued signal; while the GUI has not picked up the previous frame no new one
+is emitted, so a busy GUI drops frames instead of building a backlog.
+
+numpy/scipy release the GIL inside the heavy loops, so a thread is enough to
+keep the GUI responsive at RTL-SDR rates.
+"""
+import logging
+import time
+from typing import Callable, Optional
+
+import numpy as np
+from PyQt6 import QtCore
+
+from nast_gs.demod.cw import cw_demod
+from nast_gs.demod.fm import NBFMReceiver, make_fm_demod
+from nast_gs.processing.audio import AudioFifo
+from nast_gs.processing.filters import RationalResampler
+from nast_gs.processing.spectrum import SpectrumPipeline
+
+logger = logging.getLogger(__name__)
+
+
+def resample_audio(audio: np.ndarray, fs_in: float, fs_out: int) -> np.ndarray:
+    audio = np.asarray(audio, dtype=np.float32)
+    if int(fs_in) == int(fs_out):
+        return audio
+    try:
+        from scipy.signal import resample_poly
+        return resample_poly(audio, fs_out, int(fs_in)).astype(np.float32)
+    except Exception:
+        decim = max(1, int(fs_in / fs_out))
+        return audio[::decim].astype(np.float32)
+
+
+class DSPWorker(QtCore.QThread):
+    # ({nfft: psd_db}, copy of the block, center_hz, sample_rate)
+    spectrum_ready = QtCore.pyqtSignal(object, object, float, float)
+    rtty_text = QtCore.pyqtSignal(str)
+
+    def __init__(self, ring, block_size: int, sample_rate: float, pipeline: SpectrumPipeline,
+                 audio: AudioFifo, center_fn: Callable[[], float], display_dt: float = 0.05, parent=None):
+        super().__init__(parent)
+        self.ring = ring
+        self.block_size = int(block_size)
+        self.sample_rate = float(sample_rate)
+        self.pipeline = pipeline
+        self.audio = audio
+        self.center_fn = center_fn
+        self.display_dt = float(display_dt)
+
+        # replaced as a whole by configure(); the worker reads one consistent snapshot per block
+        self._settings = {"mode": "FM", "bandwidth_hz": 12_000.0, "offset_hz": 0.0, "audio": False}
+        self._running = False
+        self._display_pending = False
+        self._fm_demod = None
+        self._fm_resampler = None  # demod fs_out -> audio.fs, when the demod cannot hit the FIFO rate
+        self._fm_key = None
+
+        self.blocks = 0
+        self.frames = 0
+        self.frames_skipped = 0
+        self.demod_errors = 0
+
+    # -------- GUI thread API --------
+
+    def configure(self, **settings):
+        """Update demod settings (mode, bandwidth_hz, offset_hz, audio); safe to call from the GUI thread."""
+        s = dict(self._settings)
+        s.update(settings)
+        self._settings = s
+
+    def ack_display(self):
+        """The GUI has consumed the last spectrum frame; the next one may be emitted."""
+        self._display_pending = False
+
+    def stop(self):
+        self._running = False
+        self.wait(1000)
+
+    def stats(self) -> dict:
+        return {
+            "blocks": self.blocks,
+            "frames": self.frames,
+            "frames_skipped": self.frames_skipped,
+            "demod_errors": self.demod_errors,
+            "audio_underruns": self.audio.underruns,
+            "audio_dropped": self.audio.dropped,
+        }
+
+    # -------- worker thread --------
+
+    def run(self):
+        self._running = True
+        demod_reader = self.ring.reader()
+        spec_reader = self.ring.reader()
+        next_display = 0.0
+
+        while self._running:
+            demod_reader.wait(self.block_size, timeout=self.display_dt)
+
+            settings = self._settings
+            if settings["audio"]:
+                # drain the backlog, but stop as soon as a display frame is due
+                while self._running and time.monotonic() < next_display:
+                    samples = demod_reader.read(self.block_size)
+                    if samples.shape[0] == 0:
+                        break
+                    self._demodulate_block(samples, settings)
+                    self.blocks += 1
+            else:
+                demod_reader.skip_to_latest()
+                self._fm_demod = None
+
+            now = time.monotonic()
+            if now >= next_display and spec_reader.available():
+                spec_reader.skip_to_latest()
+                if self._display_pending:
+                    self.frames_skipped += 1
+                else:
+                    self._emit_spectrum()
+                next_display = now + self.display_dt
+
+    def _emit_spectrum(self):
+        # newest block only; older unread samples are irrelevant for display
+        samples = self.ring.latest(self.block_size).copy()
+        try:
+            center = float(self.center_fn())
+        except Exception:
+            center = 0.0
+        psds = self.pipeline.compute(samples, self.pipeline.resolutions())
+        self._display_pending = True
+        self.frames += 1
+        self.spectrum_ready.emit(psds, samples, center, self.sample_rate)
+
+    def _demodulate_block(self, samples: np.ndarray, settings: dict):
+        dem = settings["mode"]
+        sr = self.sample_rate
+        try:
+            if dem in ("FM", "WFM"):
+                # one demodulator per stream so filter state carries across blocks
+                key = (dem, sr, int(settings["bandwidth_hz"]))
+                if self._fm_demod is None or self._fm_key != key:
+                    self._fm_demod = make_fm_demod(dem, sr, settings["bandwidth_hz"], settings["offset_hz"],
+                                                   self.audio.fs)
+                    fs_out = self._fm_demod.fs_out
+                    self._fm_resampler = RationalResampler(fs_out, self.audio.fs) if fs_out != self.audio.fs else None
+                    self._fm_key = key
+                demod = self._fm_demod
+                offset = float(settings["offset_hz"])
+                if isinstance(demod, NBFMReceiver) and demod.center_offset_hz != offset:
+                    demod.set_center_offset(offset)
+                audio = demod.process(samples)
+                if self._fm_resampler is not None:
+                    audio = self._fm_resampler.process(audio)
+                self._push_audio(audio, normalize=False)
+
+            elif dem == "AM":
+                from nast_gs.demod.am import am_demod
+                self._push_audio(resample_audio(am_demod(samples[:8192]), sr, self.audio.fs))
+
+            elif dem == "CW":
+                self._push_audio(resample_audio(cw_demod(samples[:8192]), sr, self.audio.fs))
+
+            elif dem == "RTTY":
+                from nast_gs.demod.rtty import rtty_demod
+                res = rtty_demod(samples[:8192])
+                self.rtty_text.emit(res.get("text", "") or f"Status: {res.get('status')}")
+        except Exception:
+            self.demod_errors += 1
+            if self.demod_errors == 1:
+                logger.exception("Demodulation failed (%s)", dem)
+
+    def _push_audio(self, audio: Optional[np.ndarray], normalize: bool = True):
+        if audio is None:
+            return
+        audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+        if normalize:
+            audio = audio / float(np.max(np.abs(audio)) + 1e-12)
+        self.audio.push(audio)
@@ -1,15 +1,20 @@
 from PyQt6 import QtWidgets, QtCore, QtGui
 from pathlib import Path
 import sys
+import threading
+
+import numpy as np
 
 from nast_gs.sdr.gqrx_launcher import ensure_gqrx_running
 
 from .map_view import MapWindow
 from .tle_panel import TLEPanel
 
-from nast_gs.prop.propagator import propagate_tle
+from nast_gs.prop.propagator import propagate_tle, SatelliteTracker
+from nast_gs.prop.catalog import fleet_states
+from nast_gs.prop.ephemeris import build_pass_ephemeris
 from nast_gs.sdr.device import SimulatedSDR
-from nast_gs.sdr.doppler import DopplerController
+from nast_gs.sdr.doppler import DopplerController, DopplerWorker, DigitalDopplerCorrector
 from nast_gs.rotor.controller import SimulatedRotor
 from nast_gs.config import load_config, save_config
 from nast_gs.ntp import get_ntp_time
@@ -279,6 +284,12 @@ class MainWindow(QtWidgets.QMainWindow):
         self._doppler_enabled = False
         self._current_tle = None
         self._current_gs = (25.0, -80.0)
+        self._tracker = None
+        self._ephemeris = None
+        self._ephemeris_thread = None
+        self._ephemeris_attempt = None
+        self._doppler_worker = None
+        self._doppler_corrector = None
         self._downlink_hz = 145_800_000.0
         self._ntp_time = None
 
@@ -296,8 +307,14 @@ class MainWindow(QtWidgets.QMainWindow):
         self.start_doppler_btn.setCheckable(True)
         self.start_doppler_btn.toggled.connect(self.on_toggle_doppler)
 
+        self.digital_doppler_chk = QtWidgets.QCheckBox("Digital Doppler (NCO in IQ stream)")
+        self.digital_doppler_chk.setToolTip("Shift the IQ stream instead of retuning the SDR; "
+                                            "the tuner is only moved when the signal nears the passband edge.")
+
         sd_layout.addWidget(self.sdr_freq_label)
         sd_layout.addWidget(self.start_doppler_btn)
+        self.digital_doppler_chk.toggled.connect(self._restart_doppler_if_active)
+        sd_layout.addWidget(self.digital_doppler_chk)
 
         from nast_gs.gui.sdr_panel import SDRPanel
         self.sdr_panel = SDRPanel()
@@ -344,6 +361,12 @@ class MainWindow(QtWidgets.QMainWindow):
         self._tracking_timer.setInterval(1000)
         self._tracking_timer.timeout.connect(self._on_tracking_tick)
 
+        # live subpoints of every satellite in the loaded catalog, one vectorized propagation per tick
+        self._fleet = None
+        self._fleet_timer = QtCore.QTimer(self)
+        self._fleet_timer.setInterval(1000)
+        self._fleet_timer.timeout.connect(self._on_fleet_tick)
+
         # Status bar + bottom-right credit
         self.statusBar().showMessage("Ready")
         self._credit_lbl = QtWidgets.QLabel("Developed By Er. Damodar Pokhrel")
@@ -431,11 +454,20 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self._current_tle = tle
         self._current_gs = (opts["gs_lat"], opts["gs_lon"])
+        self._tracker = SatelliteTracker(tle, opts["gs_lat"], opts["gs_lon"], opts.get("gs_alt", 0.0))
+        self._ephemeris = None
+        self._ephemeris_attempt = None
+        self._refresh_ephemeris(start)
+        self._set_fleet(opts.get("catalog"), opts["gs_lat"], opts["gs_lon"], opts.get("gs_alt", 0.0))
 
         try:
             self.doppler_ctrl.center = self._downlink_hz
         except Exception:
             self.doppler_ctrl = DopplerController(self.sdr, center_freq_hz=self._downlink_hz)
+        if self._doppler_worker is not None:
+            self._doppler_worker.set_center(self._downlink_hz)
+        if self._doppler_corrector is not None:
+            self._doppler_corrector.set_center(self._downlink_hz)
 
         self.sdr_freq_label.setText(f"SDR tuned: {self._downlink_hz/1e6:.6f} MHz")
 
@@ -468,35 +500,155 @@ class MainWindow(QtWidgets.QMainWindow):
             self.doppler_ctrl = DopplerController(self.sdr, center_freq_hz=self._downlink_hz)
 
             if self._current_tle is not None:
+                self._start_doppler_worker()
                 self._tracking_timer.start()
         else:
+            self._stop_doppler_worker()
             try:
                 self._tracking_timer.stop()
             except Exception:
                 pass
 
-    def _on_tracking_tick(self):
-        if not self._doppler_enabled or self._current_tle is None:
-            return
+    def _start_doppler_worker(self):
+        """(Re)start the background retune loop; the Qt tick then only updates the display.
 
+        With digital Doppler enabled and an IQ streamer running, the correction is instead
+        installed as an NCO on the streamer and hardware retunes become coarse steps.
+        """
+        self._stop_doppler_worker()
+        cfg = load_config() or {}
+        streamer = getattr(self.sdr_panel, "streamer", None)
+        if self.digital_doppler_chk.isChecked() and streamer is not None:
+            self._doppler_corrector = DigitalDopplerCorrector(
+                self.sdr,
+                self._downlink_hz,
+                streamer.sample_rate,
+                self._range_rate_at,
+                max_offset_hz=cfg.get("doppler_max_nco_offset_hz"),
+                clock=self._now,
+            )
+            streamer.corrector = self._doppler_corrector
+            return
+        self._doppler_worker = DopplerWorker(
+            self.sdr,
+            self._downlink_hz,
+            self._range_rate_at,
+            rate_hz=float(cfg.get("doppler_rate_hz", 10.0)),
+            min_step_hz=float(cfg.get("doppler_min_step_hz", 10.0)),
+            clock=self._now,
+        )
+        self._doppler_worker.start()
+
+    def _restart_doppler_if_active(self, *_):
+        """Re-bind the running Doppler path to the current SDR / streamer / mode."""
+        if self._doppler_worker is not None or self._doppler_corrector is not None:
+            self._start_doppler_worker()
+
+    def _stop_doppler_worker(self):
+        if self._doppler_worker is not None:
+            self._doppler_worker.stop()
+            self._doppler_worker = None
+        if self._doppler_corrector is not None:
+            streamer = getattr(self.sdr_panel, "streamer", None)
+            if streamer is not None and streamer.corrector is self._doppler_corrector:
+                streamer.corrector = None
+            self._doppler_corrector = None
+
+    def _now(self):
         from datetime import datetime
-        from nast_gs.prop.propagator import current_state
-
-        gs_lat, gs_lon = self._current_gs
 
-        now = datetime.utcnow()
         if self.use_ntp_chk.isChecked() and self._ntp_time is not None:
-            now = self._ntp_time
+            return self._ntp_time
+        return datetime.utcnow()
 
-        st = current_state(self._current_tle, now, gs_lat, gs_lon)
-        rr = st.get("range_rate_km_s", 0.0)
+    def _range_rate_at(self, now):
+        """
+        Range rate for the Doppler worker, interpolated from the pass ephemeris.
+
+        Runs on the worker thread, so it never falls back to the tracker (full SGP4, and
+        tick statistics the GUI thread owns): outside the ephemeris, i.e. between passes,
+        it returns None and no correction is applied.
+        """
+        eph = self._ephemeris
+        if eph is None or not eph.covers(now):
+            return None
+        return eph.range_rate_at(now)
+
+    def _refresh_ephemeris(self, now):
+        """Build the next pass ephemeris off the UI thread (no-op while a build is running)."""
+        if self._ephemeris_thread is not None and self._ephemeris_thread.is_alive():
+            return
+        if self._ephemeris_attempt is not None and abs((now - self._ephemeris_attempt).total_seconds()) < 60:
+            return
+        self._ephemeris_attempt = now
+        tracker = self._tracker
+
+        def _build():
+            try:
+                eph = build_pass_ephemeris(tracker, now)
+            except Exception:
+                return
+            if tracker is self._tracker:
+                self._ephemeris = eph
+
+        self._ephemeris_thread = threading.Thread(target=_build, daemon=True)
+        self._ephemeris_thread.start()
+
+    def _tracking_state(self, now):
+        """Interpolated state from the pass ephemeris, or direct propagation outside it."""
+        eph = self._ephemeris
+        if eph is not None and eph.covers(now):
+            return eph.state_at(now)
+        if eph is None or now > eph.end:
+            self._refresh_ephemeris(now)
+        return self._tracker.state_at(now)
+
+    def _set_fleet(self, catalog, gs_lat: float, gs_lon: float, gs_alt_m: float):
+        if catalog is None or len(catalog) < 2:
+            self._fleet = None
+            self._fleet_timer.stop()
+            self.map.clear_fleet()
+            return
+        self._fleet = (catalog, gs_lat, gs_lon, gs_alt_m)
+        self._on_fleet_tick()
+        self._fleet_timer.start()
 
+    def _on_fleet_tick(self):
+        if self._fleet is None:
+            return
+        catalog, gs_lat, gs_lon, gs_alt_m = self._fleet
         try:
-            self.doppler_ctrl.center = self._downlink_hz
-        except Exception:
-            self.doppler_ctrl = DopplerController(self.sdr, center_freq_hz=self._downlink_hz)
+            st = fleet_states(catalog, self._now(), 0.0, gs_lat, gs_lon, gs_alt_m)
+        except Exception as e:
+            self._fleet_timer.stop()
+            self.statusBar().showMessage(f"Fleet propagation failed: {e}")
+            return
+        bad = st["error"][:, 0] != 0
+        lat = np.where(bad, np.nan, st["sublat"][:, 0])
+        self.map.set_fleet(catalog.names, lat, st["sublon"][:, 0], st["eldeg"][:, 0] > 0.0)
+
+    def _on_tracking_tick(self):
+        if not self._doppler_enabled or self._current_tle is None:
+            return
+
+        now = self._now()
+        st = self._tracking_state(now)
+        rr = st.get("range_rate_km_s", 0.0)
 
-        tuned_hz = self.doppler_ctrl.apply_correction(rr)
+        worker = self._doppler_worker
+        if worker is not None and not worker.is_alive():
+            worker = None
+        if worker is None:
+            worker = self._doppler_corrector
+        if worker is not None:
+            # retuning happens on the worker / streamer thread; just show where it is
+            tuned_hz = worker.latest().get("tuned_hz", self._downlink_hz)
+        else:
+            try:
+                self.doppler_ctrl.center = self._downlink_hz
+            except Exception:
+                self.doppler_ctrl = DopplerController(self.sdr, center_freq_hz=self._downlink_hz)
+            tuned_hz = self.doppler_ctrl.apply_correction(rr)
         self.sdr_freq_label.setText(f"SDR tuned: {tuned_hz/1e6:.6f} MHz")
 
         az = st.get("azdeg", 0.0)
@@ -515,7 +667,10 @@ class MainWindow(QtWidgets.QMainWindow):
 
         try:
             if self.sdr_panel and getattr(self.sdr_panel, "sdr", None) is not None:
-                self.sdr_panel.apply_doppler(tuned_hz)
+                if worker is not None:
+                    self.sdr_panel.show_frequency(tuned_hz)
+                else:
+                    self.sdr_panel.apply_doppler(tuned_hz)
         except Exception:
             pass
 
@@ -546,12 +701,15 @@ class MainWindow(QtWidgets.QMainWindow):
 
             if not self.start_doppler_btn.isChecked():
                 self.start_doppler_btn.setChecked(True)
+            elif self._doppler_worker is None:
+                self._start_doppler_worker()
 
             self._tracking_timer.start()
             self.statusBar().showMessage("Tracking started")
             self.track_btn.setText("Stop Tracking")
         else:
             self._tracking_timer.stop()
+            self._stop_doppler_worker()
             self.statusBar().showMessage("Tracking stopped")
             self.track_btn.setText("Start Tracking")
             if self._rotor_enabled:
@@ -561,6 +719,7 @@ class MainWindow(QtWidgets.QMainWindow):
         try:
             self.sdr = sdr_device
             self.doppler_ctrl = DopplerController(self.sdr, center_freq_hz=self._downlink_hz)
+            self._restart_doppler_if_active()
         except Exception:
             pass
 
@@ -568,6 +727,7 @@ class MainWindow(QtWidgets.QMainWindow):
         try:
             self.sdr = SimulatedSDR()
             self.doppler_ctrl = DopplerController(self.sdr, center_freq_hz=self._downlink_hz)
+            self._restart_doppler_if_active()
         except Exception:
             pass
 
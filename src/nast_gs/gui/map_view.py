@@ -1,10 +1,126 @@
 """Simple PyQt6 map view using Leaflet in QWebEngineView."""
-from PyQt6 import QtWidgets, QtCore, QtWebEngineWidgets
-from typing import List, Tuple
+import json
+import logging
+import mimetypes
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PyQt6 import QtWidgets, QtCore, QtNetwork, QtWebEngineCore, QtWebEngineWidgets, sip
+
+from nast_gs.tile_cache import DEFAULT_TILE_URL, LEAFLET_CDN, USER_AGENT, TileCache, leaflet_dir
+
+logger = logging.getLogger(__name__)
+
+# map page, Leaflet and tiles are served from this scheme: nastmap:/leaflet/<file>, nastmap:/tiles/<z>/<x>/<y>.png
+MAP_SCHEME = b"nastmap"
+_scheme_registered = False
+
+
+def register_map_scheme():
+    """Register the offline map URL scheme. Must be called before the QApplication is created."""
+    global _scheme_registered
+    if _scheme_registered:
+        return
+    scheme = QtWebEngineCore.QWebEngineUrlScheme(MAP_SCHEME)
+    scheme.setSyntax(QtWebEngineCore.QWebEngineUrlScheme.Syntax.Path)
+    Flag = QtWebEngineCore.QWebEngineUrlScheme.Flag
+    scheme.setFlags(Flag.SecureScheme | Flag.LocalAccessAllowed | Flag.CorsEnabled)
+    QtWebEngineCore.QWebEngineUrlScheme.registerScheme(scheme)
+    _scheme_registered = True
+
+
+class MapSchemeHandler(QtWebEngineCore.QWebEngineUrlSchemeHandler):
+    """
+    Serves nastmap:/tiles/z/x/y.png from the MBTiles cache and nastmap:/leaflet/... from the
+    bundled assets. With ``online`` set, tile misses are downloaded once and stored (read-through
+    cache) and missing Leaflet files are redirected to the CDN; offline, misses simply fail and
+    Leaflet shows an empty tile.
+    """
+
+    def __init__(self, cache: TileCache, tile_url: str = DEFAULT_TILE_URL, online: bool = True, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.tile_url = tile_url
+        self.online = online
+        self._nam = QtNetwork.QNetworkAccessManager(self)
+        self._inflight = {}  # reply -> (job, (z, x, y))
+        self.hits = 0
+        self.misses = 0
+
+    def requestStarted(self, job):
+        parts = job.requestUrl().path().strip("/").split("/")
+        try:
+            if parts[0] == "tiles" and len(parts) == 4:
+                self._tile(job, int(parts[1]), int(parts[2]), int(parts[3].split(".")[0]))
+            elif parts[0] == "leaflet" and len(parts) > 1 and ".." not in parts:
+                self._leaflet(job, "/".join(parts[1:]))
+            else:
+                job.fail(QtWebEngineCore.QWebEngineUrlRequestJob.Error.UrlNotFound)
+        except ValueError:
+            job.fail(QtWebEngineCore.QWebEngineUrlRequestJob.Error.UrlInvalid)
+
+    def _reply(self, job, mime: str, data: bytes):
+        buf = QtCore.QBuffer(job)  # owned by the job, freed with it
+        buf.setData(data)
+        buf.open(QtCore.QIODevice.OpenModeFlag.ReadOnly)
+        job.reply(mime.encode(), buf)
+
+    def _tile(self, job, z: int, x: int, y: int):
+        data = self.cache.get(z, x, y)
+        if data is not None:
+            self.hits += 1
+            self._reply(job, "image/jpeg" if data[:2] == b"\xff\xd8" else "image/png", data)
+            return
+        self.misses += 1
+        if not self.online:
+            job.fail(QtWebEngineCore.QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        req = QtNetwork.QNetworkRequest(QtCore.QUrl(self.tile_url.format(z=z, x=x, y=y)))
+        req.setHeader(QtNetwork.QNetworkRequest.KnownHeaders.UserAgentHeader, USER_AGENT)
+        reply = self._nam.get(req)
+        self._inflight[reply] = (job, (z, x, y))
+        reply.finished.connect(lambda r=reply: self._on_tile_downloaded(r))
+
+    def _on_tile_downloaded(self, reply):
+        job, (z, x, y) = self._inflight.pop(reply)
+        reply.deleteLater()
+        ok = reply.error() == QtNetwork.QNetworkReply.NetworkError.NoError
+        data = bytes(reply.readAll()) if ok else b""
+        if data:
+            try:
+                self.cache.put(z, x, y, data)
+            except Exception:
+                logger.exception("Could not store tile %d/%d/%d", z, x, y)
+        if sip.isdeleted(job):  # page navigated away meanwhile
+            return
+        if data:
+            self._reply(job, "image/png", data)
+        else:
+            job.fail(QtWebEngineCore.QWebEngineUrlRequestJob.Error.RequestFailed)
+
+    def _leaflet(self, job, name: str):
+        path = leaflet_dir() / name
+        if path.is_file():
+            self._reply(job, mimetypes.guess_type(name)[0] or "application/octet-stream", path.read_bytes())
+        elif self.online:
+            job.redirect(QtCore.QUrl(LEAFLET_CDN + name))
+        else:
+            job.fail(QtWebEngineCore.QWebEngineUrlRequestJob.Error.UrlNotFound)
 
 
 class MapWindow(QtWidgets.QMainWindow):
-    """Map window built around a Leaflet HTML template. Provides methods to update track and ground station marker dynamically via JavaScript."""
+    """
+    Map window built around a Leaflet HTML template. Provides methods to update track and ground station
+    marker dynamically via JavaScript.
+
+    Updates are coalesced: each setter stores the newest value for its kind and a short single-shot timer
+    sends everything pending as one JSON ``applyUpdates`` call, which the page applies in place (setLatLng /
+    setLatLngs) on the next animation frame.
+
+    When register_map_scheme() ran before the QApplication was created, Leaflet and tiles are served
+    by a MapSchemeHandler from the bundled assets and the MBTiles cache (``tile_cache``, default
+    ~/.nast_gs_tiles.mbtiles), so the map loads from disk; otherwise the page uses the CDN and OSM directly.
+    """
 
     HTML_TEMPLATE = """
     <!DOCTYPE html>
@@ -12,101 +128,219 @@ class MapWindow(QtWidgets.QMainWindow):
     <head>
       <meta charset="utf-8" />
       <meta name="viewport" content="width=device-width, initial-scale=1.0">
-      <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css"/>
-      <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
+      <link rel="stylesheet" href="nastmap:/leaflet/leaflet.css"/>
+      <script src="nastmap:/leaflet/leaflet.js"></script>
       <style>html,body,#map{height:100%;margin:0}</style>
     </head>
     <body>
       <div id="map"></div>
       <script>
         var map = L.map('map').setView([0,0], 2);
-        L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {maxZoom: 19}).addTo(map);
+        L.tileLayer('nastmap:/tiles/{z}/{x}/{y}.png',
+                    {maxZoom: 19, attribution: '&copy; OpenStreetMap contributors'}).addTo(map);
+        // one multi-segment polyline and long-lived markers, updated in place
         var poly = L.polyline([], {color: 'red'}).addTo(map);
         var gs_marker = null;
         var sat_marker = null;
+        var pending = null;
+        // catalog fleet: one canvas for every marker, so moving hundreds costs one redraw per frame
+        var fleet_renderer = L.canvas({padding: 0.2});
+        var fleet_layer = L.layerGroup().addTo(map);
+        var fleet_markers = [];
 
         function setTrack(coords) {
           poly.setLatLngs(coords);
           if (coords.length) map.fitBounds(poly.getBounds());
         }
 
+        // segments of flat [lat0, lon0, lat1, lon1, ...] arrays (split at the dateline)
+        function setTrackFlat(segments) {
+          var latlngs = [];
+          for (var s = 0; s < segments.length; s++) {
+            var f = segments[s], seg = new Array(f.length / 2);
+            for (var i = 0; i < seg.length; i++) seg[i] = [f[2 * i], f[2 * i + 1]];
+            latlngs.push(seg);
+          }
+          setTrack(latlngs);
+        }
+
         function setGroundStation(lat, lon) {
-          if (gs_marker) map.removeLayer(gs_marker);
+          if (gs_marker) { gs_marker.setLatLng([lat, lon]); return; }
           gs_marker = L.circleMarker([lat, lon], {radius:6, color:'yellow', fillColor:'orange', fillOpacity:0.9}).addTo(map);
         }
 
         function setSatellite(lat, lon) {
-          if (sat_marker) map.removeLayer(sat_marker);
+          if (sat_marker) { sat_marker.setLatLng([lat, lon]); return; }
           sat_marker = L.circleMarker([lat, lon], {radius:5, color:'cyan', fillColor:'aqua', fillOpacity:0.9}).addTo(map);
         }
+
+        function setFleetNames(names) {
+          fleet_layer.clearLayers();
+          fleet_markers = new Array(names.length);
+          for (var i = 0; i < names.length; i++) {
+            var m = L.circleMarker([0, 0], {renderer: fleet_renderer, radius: 3, weight: 1,
+                                            color: '#555', fillColor: '#bbb', fillOpacity: 0.8});
+            m.bindTooltip(names[i]);
+            m.up = false;
+            fleet_markers[i] = m;
+          }
+        }
+
+        // pos: flat [lat0, lon0, lat1, lon1, ...] (null = no position), up: 1 if above the horizon
+        function setFleet(pos, up) {
+          for (var i = 0; i < fleet_markers.length; i++) {
+            var m = fleet_markers[i], lat = pos[2 * i];
+            if (lat === null) { fleet_layer.removeLayer(m); continue; }
+            m.setLatLng([lat, pos[2 * i + 1]]);
+            if (!!up[i] !== m.up) {
+              m.up = !!up[i];
+              m.setStyle(m.up ? {color: 'lime', fillColor: '#7f7'} : {color: '#555', fillColor: '#bbb'});
+            }
+            if (!fleet_layer.hasLayer(m)) fleet_layer.addLayer(m);
+          }
+        }
+
+        function applyPending() {
+          var u = pending;
+          pending = null;
+          if (u.track) setTrackFlat(u.track);
+          if (u.gs) setGroundStation(u.gs[0], u.gs[1]);
+          if (u.fleet_names) setFleetNames(u.fleet_names);
+          if (u.fleet) setFleet(u.fleet.pos, u.fleet.up);
+          if (u.sat) setSatellite(u.sat[0], u.sat[1]);
+        }
+
+        // batched updates from Python: newest value per kind wins, applied once per animation frame
+        function applyUpdates(u) {
+          if (pending === null) {
+            pending = {};
+            window.requestAnimationFrame(applyPending);
+          }
+          for (var k in u) pending[k] = u[k];
+        }
       </script>
     </body>
     </html>
     """
 
-    def __init__(self, title: str = "NAST Geo Suite - Map"):
+    # coalescing interval for map updates (one runJavaScript per flush)
+    FLUSH_MS = 50
+
+    def __init__(self, title: str = "NAST Geo Suite - Map", tile_cache: Optional[TileCache] = None,
+                 online: bool = True):
         super().__init__()
         self.setWindowTitle(title)
         self.resize(1200, 800)
         self.view = QtWebEngineWidgets.QWebEngineView()
         self.setCentralWidget(self.view)
         self._page_ready = False
-        self._pending_js = []
+        # latest state per kind ("track", "gs", "sat", "fleet_names", "fleet"); only the newest value is ever sent
+        self._pending = {}
+        self._fleet_names = None
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_MS)
+        self._flush_timer.timeout.connect(self._flush)
         self.view.page().loadFinished.connect(self._on_load_finished)
-        self.view.setHtml(self.HTML_TEMPLATE)
+
+        self.scheme_handler = None
+        if _scheme_registered:
+            self.scheme_handler = self._install_scheme_handler(tile_cache, online)
+        if self.scheme_handler is not None:
+            self.view.setHtml(self.HTML_TEMPLATE, QtCore.QUrl("nastmap:/"))
+        else:
+            self.view.setHtml(self.online_html())
+
+    def _install_scheme_handler(self, tile_cache: Optional[TileCache], online: bool):
+        # one handler per profile, shared by every map window using it
+        profile = self.view.page().profile()
+        handler = profile.urlSchemeHandler(MAP_SCHEME)
+        if handler is None:
+            try:
+                cache = tile_cache or TileCache()
+            except Exception:
+                logger.exception("Tile cache unavailable, map falls back to online tiles")
+                return None
+            handler = MapSchemeHandler(cache, online=online, parent=profile)
+            profile.installUrlSchemeHandler(MAP_SCHEME, handler)
+        return handler
+
+    @classmethod
+    def online_html(cls) -> str:
+        """The page with Leaflet from the CDN and tiles straight from OSM (no local scheme)."""
+        return (cls.HTML_TEMPLATE.replace("nastmap:/leaflet/", LEAFLET_CDN)
+                .replace("nastmap:/tiles/{z}/{x}/{y}.png", DEFAULT_TILE_URL))
 
     def _on_load_finished(self, ok: bool):
         self._page_ready = ok
-        # flush pending JS commands
-        while self._pending_js:
-            js = self._pending_js.pop(0)
-            self.view.page().runJavaScript(js)
+        if ok:
+            self._flush()
+
+    def _queue(self, kind: str, value):
+        self._pending[kind] = value
+        if self._page_ready and not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush(self):
+        if not self._pending or not self._page_ready:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            payload = json.dumps(pending, separators=(",", ":"), allow_nan=False)
+        except ValueError:
+            # a non-finite value slipped through; drop this batch rather than wedge the queue
+            logger.exception("Dropping map update %s", sorted(pending))
+            return
+        self.view.page().runJavaScript(f"applyUpdates({payload});")
+
+    @staticmethod
+    def _track_segments(points) -> list:
+        """Flat [lat, lon, ...] lists per segment, split where longitude jumps across the dateline."""
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        pts = pts[np.isfinite(pts).all(axis=1)]
+        if not len(pts):
+            return []
+        # 1e-5 deg (~1 m) is plenty on a map and keeps the JSON compact
+        pts = np.round(pts, 5)
+        breaks = np.flatnonzero(np.abs(np.diff(pts[:, 1])) > 180.0) + 1
+        return [seg.ravel().tolist() for seg in np.split(pts, breaks)]
 
     def set_track(self, points: List[Tuple[float, float]]):
-        """Points is a list of (lat, lon) tuples."""
-        # Split the track into segments when longitude jumps across the dateline to avoid long wrap-around lines
-        if not points:
+        """Points is a list (or (n, 2) array) of (lat, lon)."""
+        if points is None or not len(points):
             return
-        segs = []
-        cur = [points[0]]
-        for a, b in zip(points, points[1:]):
-            lon1 = a[1]
-            lon2 = b[1]
-            raw = lon2 - lon1
-            if raw > 180 or raw < -180:
-                # break segment
-                segs.append(cur)
-                cur = [b]
-            else:
-                cur.append(b)
-        if cur:
-            segs.append(cur)
-
-        # Build JS to clear existing polylines and add new ones per segment
-        js_segments = []
-        for seg in segs:
-            coords_js = ",".join([f"[{lat},{lon}]" for lat, lon in seg])
-            js_segments.append(f"L.polyline([{coords_js}], {{color:'red'}}).addTo(map);")
-        clear_and_add = (
-            "(function(){ if(window._lines) { for(var i=0;i<window._lines.length;i++){map.removeLayer(window._lines[i]);} } window._lines = [];"
-            + ";".join([f"var l = {s} window._lines.push(l)" for s in js_segments])
-            + "})()"
-        )
-        if self._page_ready:
-            self.view.page().runJavaScript(clear_and_add)
-        else:
-            self._pending_js.append(clear_and_add)
+        self._queue("track", self._track_segments(points))
 
     def set_ground_station(self, lat: float, lon: float):
-        js = f"setGroundStation({lat},{lon});"
-        if self._page_ready:
-            self.view.page().runJavaScript(js)
-        else:
-            self._pending_js.append(js)
+        if np.isfinite(lat) and np.isfinite(lon):
+            self._queue("gs", [float(lat), float(lon)])
 
     def set_satellite(self, lat: float, lon: float):
-        js = f"setSatellite({lat},{lon});"
-        if self._page_ready:
-            self.view.page().runJavaScript(js)
-        else:
-            self._pending_js.append(js)
+        # a decayed or bad TLE propagates to NaN: keep the last good position
+        if np.isfinite(lat) and np.isfinite(lon):
+            self._queue("sat", [round(float(lat), 5), round(float(lon), 5)])
+
+    @staticmethod
+    def _fleet_positions(lat, lon) -> list:
+        """Flat [lat, lon, ...] list for the fleet layer, None where the position is not finite."""
+        pos = np.round(np.column_stack([np.ravel(lat), np.ravel(lon)]).astype(np.float64), 3)
+        flat = pos.astype(object)
+        flat[~np.isfinite(pos).all(axis=1)] = None
+        return flat.ravel().tolist()
+
+    def set_fleet(self, names: List[str], lat, lon, up=None):
+        """
+        Live subpoints of a whole catalog, sent as one bulk update.
+
+        lat/lon are arrays in ``names`` order (NaN hides an entry); ``up`` flags the
+        satellites above the station horizon. Markers are only rebuilt when names change.
+        """
+        names = list(names)
+        if names != self._fleet_names:
+            self._fleet_names = names
+            self._queue("fleet_names", names)
+        up = np.zeros(len(names), dtype=np.int8) if up is None else np.asarray(up, dtype=np.int8).ravel()
+        self._queue("fleet", {"pos": self._fleet_positions(lat, lon), "up": up.tolist()})
+
+    def clear_fleet(self):
+        self.set_fleet([], [], [])
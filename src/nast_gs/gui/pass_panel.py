@@ -1,9 +1,41 @@
 from PyQt6 import QtWidgets, QtCore
 from nast_gs.prop.propagator import compute_passes
+from nast_gs.prop.scheduler import build_schedule, compute_catalog_passes
+
+
+# schedule workers still running; kept here so a closed panel never drops a live QThread
+_running_workers = set()
+
+
+class _ScheduleWorker(QtCore.QThread):
+    """Catalog pass search + schedule in a background thread (seconds for large catalogs)."""
+    schedule_ready = QtCore.pyqtSignal(int, object)
+    failed = QtCore.pyqtSignal(int, str)
+
+    def __init__(self, request: int, catalog, start, hours: int, gs_lat: float, gs_lon: float, gs_alt_m: float,
+                 min_el_deg: float, priorities=None):
+        super().__init__()
+        self.request = request
+        self._args = (catalog, start, hours, gs_lat, gs_lon, gs_alt_m, min_el_deg, priorities)
+
+    def run(self):
+        catalog, start, hours, gs_lat, gs_lon, gs_alt_m, min_el_deg, priorities = self._args
+        try:
+            passes = compute_catalog_passes(catalog, start, hours=hours, gs_lat=gs_lat, gs_lon=gs_lon,
+                                            gs_alt_m=gs_alt_m, min_el_deg=min_el_deg)
+            self.schedule_ready.emit(self.request, build_schedule(passes, priorities=priorities, policy="max_el"))
+        except Exception as e:
+            self.failed.emit(self.request, str(e))
 
 
 class PassPanel(QtWidgets.QWidget):
-    """Shows upcoming satellite passes for the selected TLE and ground station."""
+    """Shows upcoming satellite passes for the selected TLE and ground station.
+
+    With "Schedule all satellites" ticked and a multi-object TLE file loaded, the table
+    instead shows the conflict-resolved station schedule for every satellite in the file.
+    That search runs in a worker thread; ``schedule_ready`` fires when the table is filled.
+    """
+    schedule_ready = QtCore.pyqtSignal(object)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -20,36 +52,95 @@ class PassPanel(QtWidgets.QWidget):
         hl.addWidget(self.compute_btn)
         layout.addLayout(hl)
 
-        self.table = QtWidgets.QTableWidget(0, 5)
-        self.table.setHorizontalHeaderLabels(["AOS", "LOS", "TCA", "Max EL (°)", "Duration (s)"])
+        hl2 = QtWidgets.QHBoxLayout()
+        self.schedule_chk = QtWidgets.QCheckBox("Schedule all satellites")
+        self.min_el_spin = QtWidgets.QDoubleSpinBox()
+        self.min_el_spin.setRange(0.0, 90.0)
+        self.min_el_spin.setDecimals(1)
+        self.min_el_spin.setValue(0.0)
+        self.min_el_spin.setSuffix(" °")
+        hl2.addWidget(self.schedule_chk)
+        hl2.addWidget(QtWidgets.QLabel("Min EL:"))
+        hl2.addWidget(self.min_el_spin)
+        layout.addLayout(hl2)
+
+        self.table = QtWidgets.QTableWidget(0, 6)
+        self.table.setHorizontalHeaderLabels(["Satellite", "AOS", "LOS", "TCA", "Max EL (°)", "Duration (s)"])
         self.table.horizontalHeader().setStretchLastSection(True)
         layout.addWidget(self.table)
 
         self._last_args = None
+        self._catalog = None
+        self._request = 0  # bumped per computation; results of older requests are ignored
 
     def _on_compute(self):
         if self._last_args is None:
             QtWidgets.QMessageBox.information(self, "No TLE", "Please propagate a TLE first to compute passes")
             return
         tle, start, gs_lat, gs_lon, gs_alt = self._last_args
-        self.compute_and_update(tle, start, hours=self.hours_spin.value(), gs_lat=gs_lat, gs_lon=gs_lon, gs_alt_m=gs_alt)
+        self._compute(tle, start, gs_lat, gs_lon, gs_alt)
+
+    def _compute(self, tle, start, gs_lat, gs_lon, gs_alt_m):
+        hours = self.hours_spin.value()
+        if self.schedule_chk.isChecked() and self._catalog is not None and len(self._catalog) > 1:
+            self.compute_schedule(self._catalog, start, hours=hours, gs_lat=gs_lat, gs_lon=gs_lon, gs_alt_m=gs_alt_m)
+        else:
+            self.compute_and_update(tle, start, hours=hours, gs_lat=gs_lat, gs_lon=gs_lon, gs_alt_m=gs_alt_m)
 
     def compute_and_update(self, tle, start, hours: int, gs_lat: float, gs_lon: float, gs_alt_m: float = 0.0):
-        passes = compute_passes(tle, start, hours=hours, gs_lat=gs_lat, gs_lon=gs_lon, gs_alt_m=gs_alt_m)
+        self._request += 1
+        self._set_busy(False)
+        passes = compute_passes(tle, start, hours=hours, gs_lat=gs_lat, gs_lon=gs_lon, gs_alt_m=gs_alt_m,
+                                min_el_deg=self.min_el_spin.value())
+        for p in passes:
+            p.setdefault("name", tle[0])
         self.update_passes(passes)
 
+    def compute_schedule(self, catalog, start, hours: int, gs_lat: float, gs_lon: float, gs_alt_m: float = 0.0,
+                         priorities=None):
+        """Start the schedule search in the background; the table updates when it finishes."""
+        self._request += 1
+        worker = _ScheduleWorker(self._request, catalog, start, hours, gs_lat, gs_lon, gs_alt_m,
+                                 self.min_el_spin.value(), priorities)
+        worker.schedule_ready.connect(self._on_schedule_ready)
+        worker.failed.connect(self._on_schedule_failed)
+        worker.finished.connect(lambda w=worker: _running_workers.discard(w))
+        _running_workers.add(worker)
+        self._set_busy(True)
+        worker.start()
+        return worker
+
+    def _set_busy(self, busy: bool):
+        self.compute_btn.setEnabled(not busy)
+        self.compute_btn.setText("Scheduling..." if busy else "Compute Passes")
+
+    def _on_schedule_ready(self, request: int, sched: dict):
+        if request != self._request:
+            return
+        self._set_busy(False)
+        self.update_passes(sched["schedule"])
+        self.schedule_ready.emit(sched)
+
+    def _on_schedule_failed(self, request: int, msg: str):
+        if request != self._request:
+            return
+        self._set_busy(False)
+        QtWidgets.QMessageBox.warning(self, "Schedule failed", msg)
+
     def update_passes(self, passes):
         self.table.setRowCount(0)
         for p in passes:
             row = self.table.rowCount()
             self.table.insertRow(row)
-            self.table.setItem(row, 0, QtWidgets.QTableWidgetItem(p['aos'].isoformat()))
-            self.table.setItem(row, 1, QtWidgets.QTableWidgetItem(p['los'].isoformat()))
-            self.table.setItem(row, 2, QtWidgets.QTableWidgetItem(p['tca'].isoformat()))
-            self.table.setItem(row, 3, QtWidgets.QTableWidgetItem(f"{p['max_el_deg']:.2f}"))
-            self.table.setItem(row, 4, QtWidgets.QTableWidgetItem(str(p['duration_s'])))
+            self.table.setItem(row, 0, QtWidgets.QTableWidgetItem(p.get('name', '')))
+            self.table.setItem(row, 1, QtWidgets.QTableWidgetItem(p['aos'].isoformat()))
+            self.table.setItem(row, 2, QtWidgets.QTableWidgetItem(p['los'].isoformat()))
+            self.table.setItem(row, 3, QtWidgets.QTableWidgetItem(p['tca'].isoformat()))
+            self.table.setItem(row, 4, QtWidgets.QTableWidgetItem(f"{p['max_el_deg']:.2f}"))
+            self.table.setItem(row, 5, QtWidgets.QTableWidgetItem(str(p['duration_s'])))
 
-    def set_context(self, tle, start, gs_lat, gs_lon, gs_alt_m=0.0):
+    def set_context(self, tle, start, gs_lat, gs_lon, gs_alt_m=0.0, catalog=None):
         self._last_args = (tle, start, gs_lat, gs_lon, gs_alt_m)
+        self._catalog = catalog
         # compute automatically with current hours
-        self.compute_and_update(tle, start, hours=self.hours_spin.value(), gs_lat=gs_lat, gs_lon=gs_lon, gs_alt_m=gs_alt_m)
+        self._compute(tle, start, gs_lat, gs_lon, gs_alt_m)
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 from PyQt6 import QtWidgets, QtCore
-from typing import Optional, List
+from typing import Optional
 import numpy as np
 
 from nast_gs.sdr import list_soapy_devices, SoapyDevice, RtlSdrDevice, SimulatedSDR
 from nast_gs.sdr.doppler import DopplerController
 from nast_gs.sdr.streamer import SDRStreamer
 from nast_gs.gui.spectrum_widget import SpectrumWidget
+from nast_gs.gui.dsp_worker import DSPWorker, resample_audio
+from nast_gs.demod.fm import make_fm_demod
+from nast_gs.processing.audio import AudioFifo
+from nast_gs.processing.spectrum import SpectrumPipeline
 
-from nast_gs.demod.fm import fm_demod_to_audio
 from nast_gs.demod.cw import cw_demod
 
 
@@ -62,6 +65,13 @@ class SDRPanel(QtWidgets.QWidget):
         self.bandwidth_spin.setValue(12_000)
         self.bandwidth_spin.setSuffix(" Hz")
 
+        # IQ backends: where the downlink sits relative to the tuned centre
+        self.chan_offset_spin = QtWidgets.QSpinBox()
+        self.chan_offset_spin.setRange(-10_000_000, 10_000_000)
+        self.chan_offset_spin.setSingleStep(1000)
+        self.chan_offset_spin.setValue(0)
+        self.chan_offset_spin.setSuffix(" Hz")
+
         self.start_btn = QtWidgets.QPushButton("Start Device")
         self.start_btn.setCheckable(True)
         self.start_btn.toggled.connect(self._on_toggle)
@@ -72,7 +82,7 @@ class SDRPanel(QtWidgets.QWidget):
         self.play_audio_btn.toggled.connect(self._on_audio_toggle)
 
         self.demod_combo = QtWidgets.QComboBox()
-        self.demod_combo.addItems(["FM", "AM", "CW", "RTTY"])
+        self.demod_combo.addItems(["FM", "WFM", "AM", "CW", "RTTY"])
         self.demod_combo.currentTextChanged.connect(self._on_demod_changed)
 
         self.rtty_out = QtWidgets.QTextEdit()
@@ -97,6 +107,7 @@ class SDRPanel(QtWidgets.QWidget):
         layout.addRow("Gqrx host:", self.gqrx_host)
         layout.addRow("Gqrx port:", self.gqrx_port)
         layout.addRow("Bandwidth:", self.bandwidth_spin)
+        layout.addRow("Channel offset:", self.chan_offset_spin)
 
         layout.addRow(self.start_btn)
         layout.addRow(self.spectrum)
@@ -112,16 +123,23 @@ class SDRPanel(QtWidgets.QWidget):
         self.sdr = None
         self.doppler: Optional[DopplerController] = None
         self.streamer: Optional[SDRStreamer] = None
-        self._spec_timer: Optional[QtCore.QTimer] = None
+        self.dsp_worker: Optional[DSPWorker] = None
         self.last_samples: Optional[np.ndarray] = None
         self.spec_window = None
+        self._display_dt = 0.05  # spectrum frame period of the DSP worker (one waterfall line each)
+        # one PSD per displayed block, shared by the panel spectrum and the spectrum window/waterfall
+        self.spectrum_pipeline = SpectrumPipeline(nfft=self.spectrum.nfft)
+        self.spectrum_pipeline.subscribe(self.spectrum.update_from_psd)
 
         # audio runtime
         self._audio_stream = None
-        self._audio_q: List[np.ndarray] = []
         self._audio_fs = 48000
+        self._audio_fifo = AudioFifo(fs=self._audio_fs)
 
         self.device_combo.currentTextChanged.connect(self._on_backend_changed)
+        for sig in (self.bandwidth_spin.valueChanged, self.chan_offset_spin.valueChanged,
+                    self.play_audio_btn.toggled):
+            sig.connect(self._sync_dsp_settings)
 
         self._refresh()
         self._on_backend_changed(self.device_combo.currentText())
@@ -157,7 +175,7 @@ class SDRPanel(QtWidgets.QWidget):
         # Gqrx remote fields enabled only for Gqrx
         self.gqrx_host.setEnabled(is_gqrx)
         self.gqrx_port.setEnabled(is_gqrx)
-        self.bandwidth_spin.setEnabled(is_gqrx)
+        self.chan_offset_spin.setEnabled(not is_gqrx)
 
         # Mode dropdown is used for both:
         # - IQ backends: demod inside python
@@ -196,9 +214,10 @@ class SDRPanel(QtWidgets.QWidget):
 
                 self.doppler = DopplerController(self.sdr, center_freq_hz=cf)
 
-                self.streamer = SDRStreamer(self.sdr, sample_rate=sr, block_size=8192)
+                # whole-MTU blocks (fixed by start()) keep readStream calls full at high rates
+                self.streamer = SDRStreamer(self.sdr, sample_rate=sr, block_size=self.sdr.block_size)
                 self.streamer.start()
-                self._start_spec_timer()
+                self._start_dsp_worker()
 
             elif sel == "RTL-SDR":
                 # This will FAIL if Gqrx is already using the dongle (LIBUSB_BUSY).
@@ -214,7 +233,7 @@ class SDRPanel(QtWidgets.QWidget):
 
                 self.streamer = SDRStreamer(self.sdr, sample_rate=sr, block_size=8192)
                 self.streamer.start()
-                self._start_spec_timer()
+                self._start_dsp_worker()
 
             elif sel == "GQRX (external)":
                 if GqrxDevice is None:
@@ -242,7 +261,7 @@ class SDRPanel(QtWidgets.QWidget):
 
                 # CRITICAL: no IQ streamer for Gqrx, otherwise you go back to RTL busy/IQ logic.
                 self.streamer = None
-                self._stop_spec_timer()
+                self._stop_dsp_worker()
                 self.last_samples = None
 
             else:
@@ -258,7 +277,7 @@ class SDRPanel(QtWidgets.QWidget):
 
                 self.streamer = SDRStreamer(self.sdr, sample_rate=sr, block_size=8192)
                 self.streamer.start()
-                self._start_spec_timer()
+                self._start_dsp_worker()
 
             try:
                 self.device_started.emit(self.sdr)
@@ -273,7 +292,7 @@ class SDRPanel(QtWidgets.QWidget):
         self._stop_device_internal(emit=True)
 
     def _stop_device_internal(self, emit: bool):
-        self._stop_spec_timer()
+        self._stop_dsp_worker()
         self._stop_audio_stream()
 
         if self.streamer is not None:
@@ -299,19 +318,51 @@ class SDRPanel(QtWidgets.QWidget):
             except Exception:
                 pass
 
-    def _start_spec_timer(self):
-        self._spec_timer = QtCore.QTimer(self)
-        self._spec_timer.setInterval(10)
-        self._spec_timer.timeout.connect(self._on_spec_poll)
-        self._spec_timer.start()
+    def _start_dsp_worker(self):
+        if self.streamer is None:
+            return
+        self._stop_dsp_worker()
+        self.dsp_worker = DSPWorker(
+            self.streamer.ring,
+            self.streamer.block_size,
+            float(self.samplerate_spin.value()),
+            self.spectrum_pipeline,
+            self._audio_fifo,
+            center_fn=self._device_center,
+            display_dt=self._display_dt,
+        )
+        self.dsp_worker.spectrum_ready.connect(self._on_spectrum_ready)
+        self.dsp_worker.rtty_text.connect(self.rtty_out.setPlainText)
+        self._sync_dsp_settings()
+        self.dsp_worker.start()
+        # (re)starting the device closed the sound-card stream; reopen it if audio is still wanted
+        if self.play_audio_btn.isChecked():
+            self._ensure_audio_stream()
 
-    def _stop_spec_timer(self):
-        if self._spec_timer is not None:
+    def _stop_dsp_worker(self):
+        if self.dsp_worker is not None:
             try:
-                self._spec_timer.stop()
+                self.dsp_worker.stop()
             except Exception:
                 pass
-            self._spec_timer = None
+            self.dsp_worker = None
+
+    def _sync_dsp_settings(self, *_):
+        if self.dsp_worker is not None:
+            self.dsp_worker.configure(
+                mode=self.demod_combo.currentText(),
+                bandwidth_hz=float(self.bandwidth_spin.value()),
+                offset_hz=float(self.chan_offset_spin.value()),
+                audio=self.play_audio_btn.isChecked(),
+            )
+
+    def _device_center(self) -> float:
+        # called from the DSP worker thread; the spin box value is only a fallback
+        sdr = self.sdr
+        try:
+            return float(sdr.get_center_frequency())
+        except Exception:
+            return float(self.freq_spin.value())
 
     # ---------------- doppler integration ----------------
 
@@ -323,7 +374,10 @@ class SDRPanel(QtWidgets.QWidget):
             except Exception:
                 pass
 
-        # Update display
+        self.show_frequency(new_freq_hz)
+
+    def show_frequency(self, new_freq_hz: float):
+        """Display-only update, for when the tuner is driven elsewhere (e.g. a DopplerWorker)."""
         try:
             self.freq_spin.setValue(float(new_freq_hz))
         except Exception:
@@ -343,7 +397,7 @@ class SDRPanel(QtWidgets.QWidget):
         m = (mode or "FM").upper().strip()
         if m == "RTTY":
             return "USB"
-        if m in ("FM", "AM", "CW", "USB", "LSB"):
+        if m in ("FM", "WFM", "AM", "CW", "USB", "LSB"):
             return m
         return "FM"
 
@@ -370,80 +424,21 @@ class SDRPanel(QtWidgets.QWidget):
             pass
 
     def _on_demod_changed(self, _txt: str):
+        self._sync_dsp_settings()
         # If Gqrx backend is active, switching dropdown should command Gqrx mode immediately.
         if self.device_combo.currentText() == "GQRX (external)" and self.sdr is not None:
             self._apply_gqrx_mode_bw()
 
     # ---------------- spectrum + demod (IQ backends only) ----------------
 
-    def _on_spec_poll(self):
-        if not self.streamer:
-            return
-
-        try:
-            samples = self.streamer.out_q.get_nowait()
-        except Exception:
-            return
-
+    def _on_spectrum_ready(self, psds: dict, samples: np.ndarray, center: float, sr: float):
+        # GUI thread: the worker already computed the PSDs, only the views are updated here
         self.last_samples = samples
-
-        try:
-            center = float(self.sdr.get_center_frequency())
-        except Exception:
-            center = float(self.freq_spin.value())
-
-        sr = float(self.samplerate_spin.value())
-
-        self.spectrum.update_from_iq(samples, center_hz=center, sample_rate=sr)
-
         try:
-            if self.spec_window is not None:
-                self.spec_window.update_from_iq(samples, center_hz=center, sample_rate=sr)
-        except Exception:
-            pass
-
-        # Python demod only for IQ backends
-        if self.play_audio_btn.isChecked():
-            dem = self.demod_combo.currentText()
-
-            if dem == "FM":
-                try:
-                    audio = fm_demod_to_audio(
-                        samples,
-                        fs=sr,
-                        center_offset_hz=0.0,
-                        chan_bw_hz=2e3,
-                        audio_fs=self._audio_fs,
-                        deemph_tau=75e-6,
-                    )
-                    self._push_audio(audio)
-                except Exception:
-                    pass
-
-            elif dem == "AM":
-                from nast_gs.demod.am import am_demod
-                try:
-                    audio = am_demod(samples[:8192])
-                    audio = self._resample_audio(audio, sr, self._audio_fs)
-                    self._push_audio(audio)
-                except Exception:
-                    pass
-
-            elif dem == "CW":
-                try:
-                    audio = cw_demod(samples[:8192])
-                    audio = self._resample_audio(audio, sr, self._audio_fs)
-                    self._push_audio(audio)
-                except Exception:
-                    pass
-
-            elif dem == "RTTY":
-                from nast_gs.demod.rtty import rtty_demod
-                try:
-                    res = rtty_demod(samples[:8192])
-                    self.rtty_out.setPlainText(res.get("text", "") or f"Status: {res.get('status')}")
-                except Exception:
-                    pass
+            self.spectrum_pipeline.publish(psds, center, sr)
+        finally:
+            if self.dsp_worker is not None:
+                self.dsp_worker.ack_display()
 
     # ---------------- audio stream handling (IQ backends only) ----------------
 
@@ -461,19 +456,11 @@ class SDRPanel(QtWidgets.QWidget):
         except Exception:
             return
 
-        self._audio_q = []
+        self._audio_fifo.clear()
 
         def cb(outdata, frames, time_info, status):
-            if self._audio_q:
-                blk = self._audio_q.pop(0)
-                if blk.ndim == 1:
-                    blk = blk.reshape(-1, 1)
-                n = min(frames, blk.shape[0])
-                outdata[:n, 0] = blk[:n, 0]
-                if n < frames:
-                    outdata[n:, 0] = 0.0
-            else:
-                outdata[:, 0] = 0.0
+            # sound-card thread: drains whatever the DSP worker produced, independent of the GUI
+            self._audio_fifo.read_into(outdata[:, 0])
 
         self._audio_stream = sd.OutputStream(
             samplerate=self._audio_fs,
@@ -493,36 +480,7 @@ class SDRPanel(QtWidgets.QWidget):
         except Exception:
             pass
         self._audio_stream = None
-        self._audio_q = []
-
-    def _push_audio(self, audio: np.ndarray):
-        if audio is None:
-            return
-        self._ensure_audio_stream()
-        if self._audio_stream is None:
-            return
-
-        audio = np.asarray(audio, dtype=np.float32)
-        if audio.ndim != 1:
-            audio = audio.reshape(-1)
-
-        m = float(np.max(np.abs(audio)) + 1e-12)
-        audio = audio / m
-
-        self._audio_q.append(audio)
-        if len(self._audio_q) > 20:
-            self._audio_q = self._audio_q[-10:]
-
-    def _resample_audio(self, audio: np.ndarray, fs_in: float, fs_out: int) -> np.ndarray:
-        audio = np.asarray(audio, dtype=np.float32)
-        if int(fs_in) == int(fs_out):
-            return audio
-        try:
-            from scipy.signal import resample_poly
-            return resample_poly(audio, fs_out, int(fs_in)).astype(np.float32)
-        except Exception:
-            decim = max(1, int(fs_in / fs_out))
-            return audio[::decim].astype(np.float32)
+        self._audio_fifo.clear()
 
     # ---------------- save IQ/audio ----------------
 
@@ -552,26 +510,20 @@ class SDRPanel(QtWidgets.QWidget):
         sr_dev = float(self.samplerate_spin.value())
         dem = self.demod_combo.currentText()
 
-        if dem == "FM":
+        if dem in ("FM", "WFM"):
             try:
-                audio = fm_demod_to_audio(
-                    self.last_samples,
-                    fs=sr_dev,
-                    center_offset_hz=0.0,
-                    chan_bw_hz=15e3,
-                    audio_fs=self._audio_fs,
-                    deemph_tau=75e-6,
-                )
+                audio = make_fm_demod(dem, sr_dev, self.bandwidth_spin.value(), self.chan_offset_spin.value(),
+                                      self._audio_fs).process(self.last_samples)
             except Exception as e:
                 QtWidgets.QMessageBox.warning(self, "Save Audio", str(e))
                 return
         elif dem == "AM":
             from nast_gs.demod.am import am_demod
             audio = am_demod(self.last_samples[:8192])
-            audio = self._resample_audio(audio, sr_dev, self._audio_fs)
+            audio = resample_audio(audio, sr_dev, self._audio_fs)
         elif dem == "CW":
             audio = cw_demod(self.last_samples[:8192])
-            audio = self._resample_audio(audio, sr_dev, self._audio_fs)
+            audio = resample_audio(audio, sr_dev, self._audio_fs)
         else:
             QtWidgets.QMessageBox.information(self, "No audio", "RTTY does not output audio in this demo")
             return
@@ -586,5 +538,6 @@ class SDRPanel(QtWidgets.QWidget):
     def _open_spectrum_window(self):
         if self.spec_window is None:
             from nast_gs.gui.spectrum_window import SpectrumWindow
-            self.spec_window = SpectrumWindow()
+            self.spec_window = SpectrumWindow(display_dt=self._display_dt)
+            self.spectrum_pipeline.subscribe(self.spec_window.update_from_psd, nfft=self.spec_window.nfft)
         self.spec_window.show()
@@ -2,6 +2,8 @@ import numpy as np
 import pyqtgraph as pg
 from PyQt6 import QtWidgets
 
+from nast_gs.processing.spectrum import get_engine
+
 
 class SpectrumWidget(QtWidgets.QWidget):
     """
@@ -30,13 +32,16 @@ class SpectrumWidget(QtWidgets.QWidget):
         # Parameters similar to GNU Radio sinks
         self.nfft = 4096
         self.avg_alpha = 0.15
+        # Welch averaging over the whole block (0 = every segment that fits)
+        self.overlap = 0.5
+        self.max_segments = 0
 
         # GNU Radio typical ranges
         self.db_min = -140.0
         self.db_max = -20.0
 
         self._avg_psd = None
-        self._window = np.hanning(self.nfft).astype(np.float32)
+        self._engine = get_engine()
 
         self.plot.setYRange(self.db_min, self.db_max)
         self.plot.setLabel("left", "Amplitude", units="dB")
@@ -46,33 +51,12 @@ class SpectrumWidget(QtWidgets.QWidget):
         if iq is None or len(iq) < 64:
             return None
 
-        x = np.asarray(iq, dtype=np.complex64)
-
-        # pad or crop so we always compute PSD
-        if len(x) < self.nfft:
-            tmp = np.zeros(self.nfft, dtype=np.complex64)
-            tmp[: len(x)] = x
-            x = tmp
-        else:
-            x = x[: self.nfft]
-
-        # DC removal (important for RTL)
-        x = x - np.mean(x)
-
-        # window
-        x = x * self._window
-
-        # FFT (shifted)
-        X = np.fft.fftshift(np.fft.fft(x, self.nfft))
-
-        # PSD in dB (power)
-        p = (np.abs(X) ** 2).astype(np.float32)
-        psd = 10.0 * np.log10(p + 1e-20).astype(np.float32)
-
-        # reduce DC spike around center
-        mid = self.nfft // 2
-        psd[mid - 2 : mid + 2] = np.mean(psd)
+        # DC removal, Hann window, Welch-averaged shifted PSD in dB, DC spike softened
+        psd = self._engine.psd_db(iq, self.nfft, remove_dc=True, floor=1e-20, dc_bins=2,
+                                  overlap=self.overlap, max_segments=self.max_segments)
+        return self._average(psd)
 
+    def _average(self, psd: np.ndarray) -> np.ndarray:
         # EMA averaging
         if self._avg_psd is None:
             self._avg_psd = psd
@@ -86,7 +70,13 @@ class SpectrumWidget(QtWidgets.QWidget):
         psd = self._psd_db(iq)
         if psd is None:
             return
+        self._plot(psd, center_hz, sample_rate)
+
+    def update_from_psd(self, psd_db: np.ndarray, center_hz: float, sample_rate: float):
+        """SpectrumPipeline subscriber: plot an already computed PSD (dB, shifted)."""
+        self._plot(self._average(psd_db), center_hz, sample_rate)
 
+    def _plot(self, psd: np.ndarray, center_hz: float, sample_rate: float):
         center_hz = float(center_hz)
         sample_rate = float(sample_rate)
 
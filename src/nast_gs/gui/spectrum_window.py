@@ -7,37 +7,22 @@ except Exception:
     pg = None
 
 from nast_gs.gui.waterfall_widget import WaterfallWidget
+from nast_gs.processing.spectrum import get_engine
 
 
-def _psd_db(iq: np.ndarray, nfft: int) -> np.ndarray:
-    """Return PSD in dB (float32) for complex IQ."""
-    iq = np.asarray(iq)
-    if iq.size < nfft:
-        # pad if needed
-        pad = np.zeros(nfft - iq.size, dtype=iq.dtype)
-        x = np.concatenate([iq, pad])
-    else:
-        x = iq[:nfft]
-
-    # window
-    w = np.hanning(nfft).astype(np.float32)
-    x = x.astype(np.complex64) * w
-
-    # FFT
-    X = np.fft.fftshift(np.fft.fft(x, nfft))
-    p = (np.abs(X) ** 2).astype(np.float32)
-
-    # log
-    p_db = 10.0 * np.log10(p + 1e-12)
-    return p_db
+def _psd_db(iq: np.ndarray, nfft: int, overlap: float = 0.5, max_segments: int = 0) -> np.ndarray:
+    """Return Welch-averaged PSD in dB (float32) for complex IQ."""
+    return get_engine().psd_db(iq, nfft, remove_dc=False, floor=1e-12, dc_bins=0,
+                               overlap=overlap, max_segments=max_segments)
 
 
 class SpectrumWindow(QtWidgets.QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, display_dt: float = 0.05):
         super().__init__(parent)
         self.setWindowTitle("Spectrum & Waterfall")
 
-        self.update_dt = 0.2
+        # period at which PSDs arrive (the DSP worker's display_dt): one waterfall line each
+        self.update_dt = float(display_dt)
         self.nfft = 4096  # higher = smoother line
 
         self._manual_y = False
@@ -86,17 +71,19 @@ class SpectrumWindow(QtWidgets.QWidget):
         self._manual_y = True
 
     def update_from_iq(self, iq, center_hz: float, sample_rate: float):
-        # Waterfall always updates
-        self.waterfall.update_from_iq(iq, nfft=self.nfft)
-
-        if self.plot is None:
-            return
+        # PSD in dB (we do it ourselves so x-axis is never 0..1 MHz); one FFT feeds plot and waterfall
+        self.update_from_psd(_psd_db(iq, self.nfft), center_hz, sample_rate)
 
+    def update_from_psd(self, p_db: np.ndarray, center_hz: float, sample_rate: float):
+        """SpectrumPipeline subscriber: plot an already computed PSD (dB, shifted) and add a waterfall line."""
         cf = float(center_hz)
         sr = float(sample_rate)
 
-        # PSD in dB (we do it ourselves so x-axis is never 0..1 MHz)
-        p_db = _psd_db(iq, self.nfft)
+        # Waterfall always updates (and records the line with its tuning for review)
+        self.waterfall.update_from_psd(p_db, cf, sr)
+
+        if self.plot is None:
+            return
 
         # Frequency axis locked to SDR center +/- Fs/2
         f0 = cf - sr / 2.0
@@ -4,6 +4,7 @@ from datetime import datetime
 from pathlib import Path
 
 from nast_gs.gui.pass_panel import PassPanel
+from nast_gs.prop.catalog import parse_tle_text
 
 
 class TLEPanel(QtWidgets.QWidget):
@@ -32,9 +33,15 @@ class TLEPanel(QtWidgets.QWidget):
 
         # ---------- TLE ----------
         self.tle_text = QtWidgets.QPlainTextEdit()
+        self.tle_text.textChanged.connect(self._on_tle_text_changed)
         self.load_button = QtWidgets.QPushButton("Load TLE file…")
         self.load_button.clicked.connect(self._on_load_file)
 
+        # Multi-object files (3LE/2LE): choose which entry to track
+        self.catalog = None
+        self.sat_combo = QtWidgets.QComboBox()
+        self.sat_combo.setEnabled(False)
+
         # ---------- Satellite downlink frequency (CRITICAL) ----------
         self.downlink_freq = QtWidgets.QDoubleSpinBox()
         self.downlink_freq.setRange(100e3, 6e9)
@@ -78,6 +85,7 @@ class TLEPanel(QtWidgets.QWidget):
         # ---------- Layout ----------
         layout.addRow(self.load_button)
         layout.addRow("TLE (name + 2 lines):", self.tle_text)
+        layout.addRow("Satellite:", self.sat_combo)
 
         layout.addRow("Downlink frequency:", self.downlink_freq)
 
@@ -110,20 +118,35 @@ class TLEPanel(QtWidgets.QWidget):
                 text = f.read().strip()
             self.tle_text.setPlainText(text)
 
+    def _on_tle_text_changed(self):
+        try:
+            self.catalog = parse_tle_text(self.tle_text.toPlainText())
+        except Exception:
+            self.catalog = None
+
+        self.sat_combo.clear()
+        if self.catalog is not None:
+            for name, norad in zip(self.catalog.names, self.catalog.norad_ids):
+                self.sat_combo.addItem(f"{name} ({norad})")
+        self.sat_combo.setEnabled(self.catalog is not None and len(self.catalog) > 1)
+
     # ------------------------------------------------------------------
 
     def _on_propagate(self):
-        text = self.tle_text.toPlainText().strip().splitlines()
-        if len(text) < 3:
-            QtWidgets.QMessageBox.warning(
-                self,
-                "Invalid TLE",
-                "Please provide a TLE with 3 lines:\n"
-                "Satellite name\nLine 1\nLine 2",
-            )
-            return
-
-        tle = [text[0].strip(), text[1].strip(), text[2].strip()]
+        if self.catalog is not None and len(self.catalog):
+            tle = self.catalog[max(0, self.sat_combo.currentIndex())]
+        else:
+            text = self.tle_text.toPlainText().strip().splitlines()
+            if len(text) < 3:
+                QtWidgets.QMessageBox.warning(
+                    self,
+                    "Invalid TLE",
+                    "Please provide a TLE with 3 lines:\n"
+                    "Satellite name\nLine 1\nLine 2",
+                )
+                return
+
+            tle = [text[0].strip(), text[1].strip(), text[2].strip()]
 
         opts = {
             "tle": tle,
@@ -134,6 +157,7 @@ class TLEPanel(QtWidgets.QWidget):
             "gs_alt": float(self.gs_alt.value()),
             "downlink_hz": float(self.downlink_freq.value()),
             "start": datetime.utcnow(),
+            "catalog": self.catalog,
         }
 
         # Update local pass panel context
@@ -144,6 +168,7 @@ class TLEPanel(QtWidgets.QWidget):
                 opts["gs_lat"],
                 opts["gs_lon"],
                 opts["gs_alt"],
+                catalog=self.catalog,
             )
         except Exception:
             pass
@@ -1,7 +1,10 @@
+import time
+import weakref
+
 from PyQt6 import QtWidgets, QtGui, QtCore
 import numpy as np
-from collections import deque
 from nast_gs.processing.spectrum import compute_spectrum
+from nast_gs.processing.waterfall_history import WaterfallHistory
 
 
 def _make_sdrsharp_lut() -> np.ndarray:
@@ -41,23 +44,96 @@ def _make_sdrsharp_lut() -> np.ndarray:
     return lut
 
 
+class _RowRing:
+    """
+    Circular buffer of ARGB rows that is also the pixel memory of one QImage (zero-copy).
+
+    Each new row is written once, through the LUT, just above the previous one
+    (the head moves backwards), so old rows are never moved and the rows read
+    newest-first as at most two contiguous bands of the image.
+    """
+
+    def __init__(self, rows: int, width: int):
+        self.rows = np.zeros((int(rows), int(width)), dtype=np.uint32)
+        self.img = QtGui.QImage(self.rows.data, int(width), int(rows), int(width) * 4,
+                                QtGui.QImage.Format.Format_ARGB32)
+        self.head = 0
+        self.count = 0
+
+    def push(self, pix: np.ndarray, lut: np.ndarray):
+        n = self.rows.shape[0]
+        self.head = (self.head - 1) % n
+        np.take(lut, pix, out=self.rows[self.head])
+        self.count = min(self.count + 1, n)
+
+    def segments(self) -> list:
+        """(first image row, row count) bands, newest first."""
+        first = min(self.count, self.rows.shape[0] - self.head)
+        segs = [(self.head, first)]
+        if self.count > first:
+            segs.append((0, self.count - first))
+        return segs if self.count else []
+
+    def clear(self):
+        self.rows[:] = 0
+        self.head = 0
+        self.count = 0
+
+
 class _WaterfallImageView(QtWidgets.QWidget):
-    def __init__(self, img: QtGui.QImage, parent=None):
+    def __init__(self, ring: _RowRing, parent=None):
         super().__init__(parent)
-        self._img = img
+        self._ring = ring
+        # review mode: a full image rendered from the long history, plus a caption
+        self.review_img = None
+        self.overlay = ""
+        self.on_wheel = None  # callable(steps, zoom)
+        self.on_double_click = None
+
+    def wheelEvent(self, event):
+        if self.on_wheel is not None:
+            steps = event.angleDelta().y() / 120.0
+            zoom = bool(event.modifiers() & QtCore.Qt.KeyboardModifier.ControlModifier)
+            self.on_wheel(steps, zoom)
+            event.accept()
+
+    def mouseDoubleClickEvent(self, event):
+        if self.on_double_click is not None:
+            self.on_double_click()
 
     def paintEvent(self, event):
         qp = QtGui.QPainter(self)
-        qp.drawImage(self.rect(), self._img)
+        qp.fillRect(self.rect(), QtGui.QColor(0, 0, 0))
+        if self.review_img is not None:
+            qp.drawImage(QtCore.QRectF(self.rect()), self.review_img)
+            qp.setPen(QtGui.QColor(230, 230, 230))
+            qp.drawText(self.rect().adjusted(6, 4, -6, -4), QtCore.Qt.AlignmentFlag.AlignRight, self.overlay)
+            return
+
+        # live: newest row on top; the history is stretched to the full height by the painter
+        segs = self._ring.segments()
+        total = sum(n for _, n in segs)
+        if not total:
+            return
+        img = self._ring.img
+        w, h = float(self.width()), float(self.height())
+        y = 0.0
+        for start, n in segs:
+            dh = h * n / total
+            qp.drawImage(QtCore.QRectF(0.0, y, w, dh), img, QtCore.QRectF(0.0, start, img.width(), n))
+            y += dh
 
 
 class WaterfallWidget(QtWidgets.QWidget):
     """
     - Keeps last `history_seconds` of waterfall lines in RAM
     - Always stretches those lines to fill the whole widget height (no black after history)
+    - Every line is also appended to a memory-mapped WaterfallHistory (whole pass):
+      mouse wheel scrolls back in time, Ctrl+wheel zooms, double-click returns to live
     """
     def __init__(self, width: int = 900, height: int = 320, parent=None,
-                 history_seconds: float = 10.0, update_dt_seconds: float = 0.2):
+                 history_seconds: float = 10.0, update_dt_seconds: float = 0.2,
+                 history_dir: str | None = None):
         super().__init__(parent)
 
         self.width_px = int(width)
@@ -69,6 +145,8 @@ class WaterfallWidget(QtWidgets.QWidget):
 
         self.nfft_default = 2048
         self.avg_alpha = 0.18
+        self.overlap = 0.5
+        self.max_segments = 0  # Welch: average every segment of the block
 
         # color scale control (your "gain")
         self.range_db = 90.0
@@ -82,7 +160,18 @@ class WaterfallWidget(QtWidgets.QWidget):
         self._lut = _make_sdrsharp_lut()
         self._avg_psd = None
 
-        self._lines = deque(maxlen=self.max_lines)  # each line is uint8[width_px]
+        # last max_lines rows as ARGB, shared with the QImage that is painted
+        self._ring = _RowRing(self.max_lines, self.width_px)
+
+        # long history on disk; review view state (None = live)
+        self.history = WaterfallHistory(self.width_px, directory=history_dir)
+        weakref.finalize(self, self.history.close)
+        self._review_end = None
+        self._review_span = self.max_lines
+        self._history_dropped = 0
+        self._review = np.zeros((self.height_px, self.width_px), dtype=np.uint32)
+        self._review_img = QtGui.QImage(self._review.data, self.width_px, self.height_px, self.width_px * 4,
+                                        QtGui.QImage.Format.Format_ARGB32)
 
         root = QtWidgets.QHBoxLayout(self)
         root.setContentsMargins(0, 0, 0, 0)
@@ -107,10 +196,11 @@ class WaterfallWidget(QtWidgets.QWidget):
         left.addWidget(self.level_slider, 1)
         root.addLayout(left)
 
-        self.img = QtGui.QImage(self.width_px, self.height_px, QtGui.QImage.Format.Format_ARGB32)
-        self.img.fill(QtGui.QColor(0, 0, 0))
+        self.img = self._ring.img
 
-        self.image_widget = _WaterfallImageView(self.img)
+        self.image_widget = _WaterfallImageView(self._ring)
+        self.image_widget.on_wheel = self._on_wheel
+        self.image_widget.on_double_click = self.go_live
         self.image_widget.setMinimumSize(self.width_px, self.height_px)
         root.addWidget(self.image_widget, 1)
 
@@ -134,52 +224,68 @@ class WaterfallWidget(QtWidgets.QWidget):
         self._cal_count = 0
         self.level_slider.setValue(0)
         self.level_offset_db = 0.0
-        self._lines.clear()
-        self.img.fill(QtGui.QColor(0, 0, 0))
+        self._ring.clear()
+        # rows from before the clear may belong to another frequency; never review them again
+        self.history.clear()
+        self.go_live()
         self._update_label()
         self.image_widget.update()
 
     def _estimate_noise_floor(self, psd_db: np.ndarray) -> float:
         return float(np.percentile(psd_db, 20))
 
-    def _render_from_memory_scaled(self):
-        self.img.fill(QtGui.QColor(0, 0, 0))
-        if not self._lines:
-            self.image_widget.update()
-            return
+    def update_from_iq(self, iq, nfft: int | None = None):
+        nfft = int(nfft or self.nfft_default)
 
-        # newest at top
-        rows = list(self._lines)
-        rows = rows[::-1]
+        _, psd_db = compute_spectrum(iq, nfft=nfft, overlap=self.overlap, max_segments=self.max_segments)
+        self.update_from_psd(psd_db)
 
-        # stretch last N rows to full height
-        src_h = len(rows)
-        if src_h <= 1:
-            idx_map = np.zeros(self.height_px, dtype=np.int32)
-        else:
-            idx_map = np.linspace(0, src_h - 1, self.height_px).astype(np.int32)
-
-        painter = QtGui.QPainter(self.img)
-        for y in range(self.height_px):
-            pix = rows[idx_map[y]]
-            line_argb = self._lut[pix]
-            line_bytes = line_argb.tobytes()
-            line_img = QtGui.QImage(
-                line_bytes,
-                self.width_px,
-                1,
-                self.width_px * 4,
-                QtGui.QImage.Format.Format_ARGB32,
-            )
-            painter.drawImage(0, y, line_img)
-        painter.end()
+    # ---------------- long-history review ----------------
+
+    @property
+    def reviewing(self) -> bool:
+        return self._review_end is not None
+
+    def go_live(self):
+        self._review_end = None
+        self.image_widget.review_img = None
         self.image_widget.update()
 
-    def update_from_iq(self, iq, nfft: int | None = None):
-        nfft = int(nfft or self.nfft_default)
+    def review(self, end: int, span: int):
+        """Show history rows [end - span, end) (newest on top) instead of the live view."""
+        n = len(self.history)
+        if n == 0:
+            return
+        self._review_span = int(min(max(span, 8), n))
+        self._review_end = int(min(max(end, self._review_span), n))
+        rows, meta = self.history.render(self._review_end, self._review_span, self.height_px)
+        np.take(self._lut, rows, out=self._review)
+
+        t0, t1 = meta["t"][-1], meta["t"][0]
+        self.image_widget.overlay = (f"{time.strftime('%H:%M:%S', time.localtime(t0))} - "
+                                     f"{time.strftime('%H:%M:%S', time.localtime(t1))}  "
+                                     f"({self._review_span} lines, double-click: live)")
+        self.image_widget.review_img = self._review_img
+        self.image_widget.update()
 
-        _, psd_db = compute_spectrum(iq, nfft=nfft)
-        psd_db = psd_db.astype(np.float32)
+    def _on_wheel(self, steps: float, zoom: bool):
+        n = len(self.history)
+        if n == 0:
+            return
+        end = self._review_end if self.reviewing else n
+        span = self._review_span if self.reviewing else min(self.max_lines, n)
+        if zoom:
+            span = int(span * (0.5 if steps > 0 else 2.0))
+        else:
+            end = int(end - steps * max(1, span // 4))  # wheel up = back in time
+        if end >= n and not zoom:
+            self.go_live()
+            return
+        self.review(end, span)
+
+    def update_from_psd(self, psd_db: np.ndarray, center_hz: float = 0.0, sample_rate: float = 0.0):
+        """Add one line from an already computed PSD (dB, shifted), e.g. from a SpectrumPipeline."""
+        psd_db = np.asarray(psd_db, dtype=np.float32)
 
         # averaging
         if self._avg_psd is None or len(self._avg_psd) != len(psd_db):
@@ -190,13 +296,12 @@ class WaterfallWidget(QtWidgets.QWidget):
 
         row_db = self._avg_psd
 
-        # noise floor calibration
-        nf = self._estimate_noise_floor(row_db)
+        # noise floor calibration (first _cal_target lines only)
         if self._noise_floor_db is None:
-            self._noise_floor_db = nf
+            self._noise_floor_db = self._estimate_noise_floor(row_db)
             self._cal_count = 1
         elif self._cal_count < self._cal_target:
-            self._noise_floor_db = 0.85 * self._noise_floor_db + 0.15 * nf
+            self._noise_floor_db = 0.85 * self._noise_floor_db + 0.15 * self._estimate_noise_floor(row_db)
             self._cal_count += 1
 
         self._update_label()
@@ -213,5 +318,13 @@ class WaterfallWidget(QtWidgets.QWidget):
         norm = (row_db - db_min) / (db_max - db_min + 1e-9)
         pix = (norm * 255.0).astype(np.uint8)
 
-        self._lines.append(pix)
-        self._render_from_memory_scaled()
+        # O(width): one LUT gather into the ring; the repaint only reads it
+        self._ring.push(pix, self._lut)
+        self.history.append(pix, time.time(), center_hz, sample_rate)
+        if self.history.dropped != self._history_dropped:
+            # the history rolled over: keep the reviewed window on the same rows
+            if self.reviewing:
+                self._review_end = max(1, self._review_end - (self.history.dropped - self._history_dropped))
+            self._history_dropped = self.history.dropped
+        if not self.reviewing:
+            self.image_widget.update()
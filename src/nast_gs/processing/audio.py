@@ -0,0 +1,70 @@
+import threading
+from collections import deque
+
+import numpy as np
+
+
+class AudioFifo:
+    """
+    Thread-safe audio sample FIFO between a DSP producer and a sound-card callback.
+
+    Blocks of any length go in with ``push``; ``read_into`` fills exactly the
+    callback's frame count, splitting blocks as needed and zero-filling (and
+    counting an underrun) when starved. Past ``max_seconds`` the oldest audio is
+    dropped so latency stays bounded. The lock is held only for deque bookkeeping,
+    never while the producer computes, so the audio callback cannot be stalled by
+    DSP or GUI work.
+    """
+
+    def __init__(self, fs: int = 48000, max_seconds: float = 0.5):
+        self.fs = int(fs)
+        self.max_samples = int(max_seconds * self.fs)
+        self._blocks = deque()
+        self._head = 0  # samples of _blocks[0] already consumed
+        self._size = 0
+        self._lock = threading.Lock()
+        self.underruns = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, audio: np.ndarray):
+        x = np.asarray(audio, dtype=np.float32).reshape(-1)
+        if not x.shape[0]:
+            return
+        with self._lock:
+            self._blocks.append(x)
+            self._size += x.shape[0]
+            while self._size > self.max_samples and len(self._blocks) > 1:
+                old = self._blocks.popleft()
+                n = old.shape[0] - self._head
+                self._head = 0
+                self._size -= n
+                self.dropped += n
+
+    def read_into(self, out: np.ndarray) -> int:
+        """Fill ``out`` (1-D float32 view) from the FIFO; returns the number of real samples copied."""
+        frames = out.shape[0]
+        n = 0
+        with self._lock:
+            while n < frames and self._blocks:
+                blk = self._blocks[0]
+                take = min(frames - n, blk.shape[0] - self._head)
+                out[n:n + take] = blk[self._head:self._head + take]
+                n += take
+                self._head += take
+                if self._head >= blk.shape[0]:
+                    self._blocks.popleft()
+                    self._head = 0
+            self._size -= n
+        if n < frames:
+            out[n:] = 0.0
+            self.underruns += 1
+        return n
+
+    def clear(self):
+        with self._lock:
+            self._blocks.clear()
+            self._head = 0
+            self._size = 0
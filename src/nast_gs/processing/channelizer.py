@@ -0,0 +1,167 @@
+import numpy as np
+
+from nast_gs.processing.filters import FIRDecimator, lowpass_taps
+from nast_gs.processing.nco import NCO
+
+
+class FreqXlatingFIRDecimator:
+    """
+    Frequency-translating FIR decimator (single channel), for block streams.
+
+    Selects the channel at ``center_offset_hz`` from baseband, filters it to
+    ``channel_bw_hz`` and decimates by ``decim`` in one stage. The lowpass taps are
+    rotated to a bandpass at the channel offset, so only the decimated outputs are
+    ever computed (polyphase), and the output rate rotator runs at fs / decim
+    instead of mixing the full-rate input. State is carried across blocks.
+    """
+
+    def __init__(self, fs: float, decim: int, center_offset_hz: float = 0.0, channel_bw_hz: float = 25_000.0,
+                 atten_db: float = 60.0):
+        self.fs = float(fs)
+        self.decim = int(decim)
+        self.fs_out = self.fs / self.decim
+        self.channel_bw_hz = float(channel_bw_hz)
+
+        cutoff = min(self.channel_bw_hz / 2.0, 0.45 * self.fs_out)
+        # everything that would alias into the channel after decimation must be stopped
+        transition = max(self.fs_out - 2.0 * cutoff, 0.05 * self.fs_out)
+        self._lowpass = lowpass_taps(self.fs, cutoff, transition, atten_db)
+        self._fir = FIRDecimator(self._xlate_taps(center_offset_hz), self.decim)
+        self._rot = NCO(self.fs_out)
+        self.center_offset_hz = float(center_offset_hz)
+
+    @property
+    def taps(self) -> np.ndarray:
+        return self._fir.taps
+
+    def _xlate_taps(self, offset_hz: float) -> np.ndarray:
+        n = np.arange(len(self._lowpass))
+        return (self._lowpass * np.exp(2j * np.pi * offset_hz * n / self.fs)).astype(np.complex64)
+
+    def set_center_offset(self, offset_hz: float):
+        """Move the channel; filter history is kept so the stream continues without a restart."""
+        self.center_offset_hz = float(offset_hz)
+        self._fir.taps = self._xlate_taps(offset_hz)
+
+    def reset(self):
+        self._fir.reset()
+        self._rot.reset()
+
+    def process(self, iq: np.ndarray) -> np.ndarray:
+        y = self._fir.process(np.asarray(iq, dtype=np.complex64))
+        # outputs sit on a fixed grid of every decim-th input sample, so the rotator that
+        # brings the channel to 0 Hz is a plain NCO at the output rate
+        return self._rot.mix(y, -self.center_offset_hz)
+
+
+class ChannelizerChannel:
+    """One output of a ``PolyphaseChannelizer``: a filter-bank bin plus a residual-offset NCO."""
+
+    def __init__(self, name: str, offset_hz: float, spacing_hz: float, num_bins: int, fs_out: float):
+        self.name = name
+        self._spacing = spacing_hz
+        self._num_bins = num_bins
+        self._nco = NCO(fs_out)
+        self.sinks = []  # callables fed with each output block (demodulators, recorders)
+        self.set_offset(offset_hz)
+
+    def set_offset(self, offset_hz: float):
+        """Retarget the channel (e.g. per-tick Doppler); hops bins when the residual gets too large."""
+        self.offset_hz = float(offset_hz)
+        k = int(round(self.offset_hz / self._spacing))
+        self.bin = k % self._num_bins
+        self.residual_hz = self.offset_hz - k * self._spacing
+
+
+class PolyphaseChannelizer:
+    """
+    2x-oversampled polyphase filter-bank channelizer.
+
+    Splits the input into ``num_bins`` bins spaced fs / num_bins apart, each decimated
+    to fs_out = 2 * fs / num_bins, with one windowed-presum + batched FFT per block
+    (a bank of frequency-translating FIR decimators that share all the filtering).
+    Each requested channel takes the nearest bin and removes the remaining offset
+    (up to half a bin) with its own NCO at the output rate, so channels may sit
+    anywhere and follow their own Doppler. Usable bandwidth per channel is about
+    half the bin spacing; narrower filtering is left to the demodulator, e.g.
+    ``NBFMReceiver(channelizer.fs_out, channel_bw_hz=...)``.
+    """
+
+    def __init__(self, fs: float, num_bins: int = 50, atten_db: float = 60.0):
+        if num_bins % 2:
+            raise ValueError("num_bins must be even for 2x oversampling")
+        self.fs = float(fs)
+        self.num_bins = int(num_bins)
+        self.decim = self.num_bins // 2
+        self.spacing = self.fs / self.num_bins
+        self.fs_out = self.fs / self.decim
+
+        # pass +/- 0.75 bin (any offset within half a bin plus a half-bin-wide channel),
+        # stop by 1.25 bins so nothing aliases into that band after decimation
+        taps = lowpass_taps(self.fs, 0.75 * self.spacing, 0.5 * self.spacing, atten_db)
+        m = self.num_bins
+        taps_len = -(-len(taps) // m) * m
+        proto = np.zeros(taps_len, dtype=np.float32)
+        proto[:len(taps)] = taps
+        self.taps = proto
+        self._taps_rev = proto[::-1].copy()
+
+        r = np.arange(m)
+        # derotation e^{-j 2 pi bin n / M} depends only on n mod M
+        self._twiddle = np.exp(-2j * np.pi * np.outer(r, r) / m).astype(np.complex64)
+
+        self._hist_len = -(-(taps_len - 1) // self.decim) * self.decim
+        self._hist = np.zeros(self._hist_len, dtype=np.complex64)
+        self._phase = 0
+        self._consumed = 0  # absolute input index of the current block's first sample
+        self.channels = {}
+
+    def add_channel(self, name: str, offset_hz: float) -> ChannelizerChannel:
+        ch = ChannelizerChannel(name, offset_hz, self.spacing, self.num_bins, self.fs_out)
+        self.channels[name] = ch
+        return ch
+
+    def remove_channel(self, name: str):
+        self.channels.pop(name, None)
+
+    def set_offset(self, name: str, offset_hz: float):
+        self.channels[name].set_offset(offset_hz)
+
+    def analyze(self, iq: np.ndarray) -> np.ndarray:
+        """All bins for one block: (n_out, num_bins) complex64 at fs_out, bin k at k * spacing."""
+        x = np.asarray(iq, dtype=np.complex64)
+        buf = np.concatenate([self._hist, x])
+        m, d, taps_len = self.num_bins, self.decim, len(self.taps)
+
+        first = self._hist_len + self._phase  # buffer index of the first output sample
+        n_out = max(0, (len(buf) - 1 - first) // d + 1)
+        if n_out:
+            # rows are the taps_len input samples ending at each output position
+            seg = np.lib.stride_tricks.as_strided(
+                buf[first - taps_len + 1:], shape=(n_out, taps_len), strides=(d * buf.strides[0], buf.strides[0])
+            )
+            # u[k, i] = h[L-1-i] x[n_k-(L-1-i)]; presum over the L/M polyphase branches, then
+            # flip so folded[k, r] = sum_p h[r + pM] x[n_k - r - pM]
+            u = seg * self._taps_rev
+            folded = u.reshape(n_out, taps_len // m, m).sum(axis=1)[:, ::-1]
+            bins = np.fft.ifft(folded, axis=1).astype(np.complex64) * m
+            n_abs = self._consumed + self._phase + d * np.arange(n_out)
+            bins *= self._twiddle[:, n_abs % m].T
+        else:
+            bins = np.zeros((0, m), dtype=np.complex64)
+
+        self._consumed += len(x)
+        self._phase = first + n_out * d - len(buf)
+        self._hist = buf[len(buf) - self._hist_len:]
+        return bins
+
+    def process(self, iq: np.ndarray) -> dict:
+        """Channelize one block; returns {name: baseband complex64 at fs_out} and feeds each channel's sinks."""
+        bins = self.analyze(iq)
+        out = {}
+        for name, ch in self.channels.items():
+            y = ch._nco.mix(bins[:, ch.bin], -ch.residual_hz)
+            out[name] = y
+            for sink in ch.sinks:
+                sink(y)
+        return out
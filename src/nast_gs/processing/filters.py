@@ -0,0 +1,131 @@
+from fractions import Fraction
+
+import numpy as np
+from scipy.signal import firwin, kaiserord, lfilter, upfirdn
+
+
+def lowpass_taps(fs: float, cutoff_hz: float, transition_hz: float, atten_db: float = 60.0) -> np.ndarray:
+    """Kaiser-window lowpass FIR sized for the given transition width and stopband attenuation."""
+    numtaps, beta = kaiserord(atten_db, transition_hz / (0.5 * fs))
+    numtaps |= 1  # odd length: integer group delay
+    return firwin(numtaps, cutoff_hz, window=("kaiser", beta), fs=fs).astype(np.float32)
+
+
+class FIRDecimator:
+    """
+    Stateful FIR filter + integer decimator for block streams.
+
+    Only every ``decim``-th output is computed (scipy's polyphase ``upfirdn``), and
+    the input history and output phase are carried across calls, so feeding a signal
+    in arbitrary block sizes gives exactly the same samples as filtering it in one go
+    and there are no transients at block boundaries.
+    """
+
+    def __init__(self, taps, decim: int):
+        self.taps = np.asarray(taps)
+        self.decim = int(decim)
+        d = self.decim
+        # history long enough for the first output of a block to see a full tap window,
+        # rounded to whole decimation periods so output phases line up with upfirdn's grid
+        self._m = -(-(len(self.taps) - 1) // d)
+        self._hist_len = self._m * d
+        self._hist = None
+        self._phase = 0  # index in the next block of the next output sample (0..decim-1)
+
+    def reset(self):
+        self._hist = None
+        self._phase = 0
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x)
+        if self._hist is None:
+            dtype = np.result_type(x.dtype, self.taps.dtype)
+            self._hist = np.zeros(self._hist_len, dtype=dtype)
+        buf = np.concatenate([self._hist, x])
+        seg = buf[self._phase:]
+
+        y = upfirdn(self.taps, seg, down=self.decim)
+        n_out = (len(seg) - 1) // self.decim + 1  # outputs whose newest input sample is inside seg
+        y = y[self._m:n_out]
+
+        self._phase = self._phase + n_out * self.decim - len(buf)
+        self._hist = buf[len(buf) - self._hist_len:] if self._hist_len else buf[:0]
+        return y
+
+
+class RationalResampler:
+    """
+    Stateful polyphase resampler from ``fs_in`` to ``fs_out`` by a rational factor up/down.
+
+    The ratio is the closest fraction with a denominator of at most ``max_factor``
+    (exact for the usual tuner rates, e.g. 2.048 MS/s / 43 -> 48 kHz is 129/128), and
+    ``fs_out`` is the rate actually produced. Each output sample is one dot product with
+    its polyphase branch of the lowpass; input history and output phase carry across
+    calls, so any block split gives the same samples as ``upfirdn(taps, x, up, down)``.
+    """
+
+    def __init__(self, fs_in: float, fs_out: float, max_factor: int = 1000):
+        ratio = Fraction(float(fs_out) / float(fs_in)).limit_denominator(int(max_factor))
+        self.up, self.down = ratio.numerator, ratio.denominator
+        self.fs_in = float(fs_in)
+        self.fs_out = self.fs_in * self.up / self.down
+        if abs(self.fs_out - fs_out) < 1e-9 * fs_out:
+            self.fs_out = float(fs_out)  # exact ratio; drop the float rounding of fs_in * up / down
+
+        # lowpass at the upsampled rate, band edge below the lower of the two Nyquist rates
+        edge = 0.5 * min(self.fs_in, self.fs_out)
+        self.taps = lowpass_taps(self.fs_in * self.up, 0.8 * edge, 0.2 * edge) * np.float32(self.up)
+        self._width = -(-len(self.taps) // self.up)  # input samples per output
+        h = np.zeros(self._width * self.up, dtype=self.taps.dtype)
+        h[:len(self.taps)] = self.taps
+        # _branches[p, j] = h[(width - 1 - j) * up + p]: branch p, ordered oldest input first
+        self._branches = np.ascontiguousarray(h.reshape(self._width, self.up).T[:, ::-1])
+        self._hist = None
+        self._t = 0  # upsampled index of the next output, relative to the next block's first sample
+
+    def reset(self):
+        self._hist = None
+        self._t = 0
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x)
+        if self.up == self.down:
+            return x
+        if self._hist is None:
+            self._hist = np.zeros(self._width - 1, dtype=np.result_type(x.dtype, self.taps.dtype))
+        buf = np.concatenate([self._hist, x])
+        span = x.shape[0] * self.up
+        n = np.arange(self._t, span, self.down)
+        if n.shape[0]:
+            windows = np.lib.stride_tricks.sliding_window_view(buf, self._width)
+            y = np.einsum("ij,ij->i", windows[n // self.up], self._branches[n % self.up])
+            self._t = int(n[-1]) + self.down - span
+        else:
+            y = np.zeros(0, dtype=buf.dtype)
+            self._t -= span
+        self._hist = buf[len(buf) - (self._width - 1):]
+        return y
+
+
+class Deemphasis:
+    """
+    One-pole FM de-emphasis (time constant ``tau``) as a stateful IIR.
+
+    y[n] = a*y[n-1] + (1-a)*x[n] with a = exp(-1/(fs*tau)), run by ``lfilter`` with
+    its ``zi`` carried between blocks. tau=0 disables it.
+    """
+
+    def __init__(self, fs: float, tau: float = 75e-6):
+        self.a = float(np.exp(-1.0 / (fs * tau))) if tau else 0.0
+        self._b = np.array([1.0 - self.a])
+        self._den = np.array([1.0, -self.a])
+        self.zi = np.zeros(1, dtype=np.float64)
+
+    def reset(self):
+        self.zi[:] = 0.0
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        if not self.a:
+            return np.asarray(x)
+        y, self.zi = lfilter(self._b, self._den, x, zi=self.zi)
+        return y
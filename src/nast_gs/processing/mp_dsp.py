@@ -0,0 +1,261 @@
+"""Process-pool DSP backend with shared-memory IQ slots.
+
+The parent copies each IQ block once into a slot of a ``SharedBlockPool`` and
+sends the worker processes only ``(seq, slot, n, jobs)``; workers write their
+results (PSD rows, audio) into shared output pools and answer with indices, so
+no sample array is ever pickled. Every channel is pinned to one worker, which
+keeps its streaming demodulator state; channels spread round-robin over the
+workers, and spectra go to whichever worker has the fewest jobs in flight.
+
+Workers are started with the "spawn" context, so the backend is safe to use
+from a Qt application.
+"""
+import logging
+import multiprocessing as mp
+import queue
+import sys
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PSD_JOB = "__psd__"
+
+
+class SharedBlockPool:
+    """(n_slots, slot_len) array in named shared memory, attachable from other processes by ``spec``."""
+
+    def __init__(self, n_slots: int, slot_len: int, dtype=np.complex64, name: str = None):
+        self.n_slots = int(n_slots)
+        self.slot_len = int(slot_len)
+        self.dtype = np.dtype(dtype)
+        nbytes = self.n_slots * self.slot_len * self.dtype.itemsize
+        self._owner = name is None
+        if self._owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+        elif sys.version_info >= (3, 13):
+            self._shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            # spawned workers share the parent's resource tracker, so this registration is a no-op
+            # and the segment is unlinked once, by the owner
+            self._shm = shared_memory.SharedMemory(name=name)
+        self.array = np.ndarray((self.n_slots, self.slot_len), dtype=self.dtype, buffer=self._shm.buf)
+
+    @property
+    def spec(self) -> dict:
+        return {"name": self._shm.name, "n_slots": self.n_slots, "slot_len": self.slot_len, "dtype": self.dtype.str}
+
+    @classmethod
+    def attach(cls, spec: dict) -> "SharedBlockPool":
+        return cls(spec["n_slots"], spec["slot_len"], spec["dtype"], name=spec["name"])
+
+    def close(self):
+        self.array = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _worker_main(worker: int, cfg: dict, tasks, results):
+    """Worker process loop: stateful demodulators for its pinned channels plus a local SpectrumEngine."""
+    from nast_gs.demod.fm import make_fm_demod
+    from nast_gs.processing.spectrum import SpectrumEngine
+
+    iq = SharedBlockPool.attach(cfg["iq"])
+    psd = SharedBlockPool.attach(cfg["psd"])
+    audio = SharedBlockPool.attach(cfg["audio"])
+    engine = SpectrumEngine(backend="scipy", workers=1)
+    nfft, max_ch = cfg["nfft"], cfg["max_channels"]
+    demods = {}  # channel index -> demodulator
+
+    while True:
+        msg = tasks.get()
+        if msg is None:
+            break
+        if msg[0] == "channel":
+            _, idx, ch = msg
+            if ch is None:
+                demods.pop(idx, None)
+            else:
+                demods[idx] = make_fm_demod(ch["mode"], cfg["sample_rate"], ch["bandwidth_hz"], ch["offset_hz"],
+                                            cfg["fs_audio"])
+            continue
+        if msg[0] == "offset":
+            _, idx, offset_hz = msg
+            d = demods.get(idx)
+            if d is not None and hasattr(d, "set_center_offset"):
+                d.set_center_offset(offset_hz)
+            continue
+
+        _, seq, slot, n, jobs = msg
+        x = iq.array[slot, :n]
+        for job in jobs:
+            try:
+                if job == PSD_JOB:
+                    psd.array[slot] = engine.psd_db(x, nfft, remove_dc=True, floor=1e-20, dc_bins=2,
+                                                    overlap=0.5, max_segments=0)
+                    results.put(("psd", worker, seq, slot, nfft))
+                else:
+                    y = demods[job].process(x)
+                    m = min(len(y), audio.slot_len)
+                    audio.array[slot * max_ch + job, :m] = y[:m]
+                    results.put(("audio", worker, seq, slot, job, m))
+            except Exception as e:
+                results.put(("error", worker, seq, slot, job, repr(e)))
+
+    for pool in (iq, psd, audio):
+        pool.close()
+
+
+class ProcessDSPBackend:
+    """
+    Optional multi-core DSP: spectrum and per-channel FM demodulation in worker processes.
+
+    submit(iq, spectrum=True) queues one block for the PSD and every channel and
+    returns its sequence number (None if all slots are busy: the block is dropped
+    and counted). poll() returns finished results, in submission order per channel:
+    {"kind": "psd"|"audio"|"error", "seq", "channel", "data"}; call it regularly, as a
+    slot is reused only once every job on it has been collected.
+    """
+
+    def __init__(self, sample_rate: float, block_size: int, num_workers: int = None, n_slots: int = 16,
+                 nfft: int = 4096, fs_audio: int = 48000, max_channels: int = 8):
+        self.sample_rate = float(sample_rate)
+        self.block_size = int(block_size)
+        self.nfft = int(nfft)
+        self.fs_audio = int(fs_audio)
+        self.max_channels = int(max_channels)
+        self.num_workers = int(num_workers or max(1, min(4, (mp.cpu_count() or 2) - 1)))
+
+        audio_len = int(np.ceil(self.block_size * self.fs_audio / self.sample_rate)) + 64
+        self.iq = SharedBlockPool(n_slots, self.block_size, np.complex64)
+        self.psd = SharedBlockPool(n_slots, self.nfft, np.float32)
+        self.audio = SharedBlockPool(n_slots * self.max_channels, audio_len, np.float32)
+
+        self._free = list(range(n_slots))
+        self._pending = {}  # slot -> outstanding job count
+        self._load = [0] * self.num_workers
+        self._channels = {}  # name -> (index, worker)
+        self._names = {}  # index -> name
+        self._next_worker = 0
+        self._seq = 0
+        self.dropped = 0
+        self.errors = 0
+
+        ctx = mp.get_context("spawn")
+        self._results = ctx.Queue()
+        cfg = {
+            "iq": self.iq.spec, "psd": self.psd.spec, "audio": self.audio.spec, "nfft": self.nfft,
+            "max_channels": self.max_channels, "sample_rate": self.sample_rate, "fs_audio": self.fs_audio,
+        }
+        self._tasks = [ctx.Queue() for _ in range(self.num_workers)]
+        self._procs = [
+            ctx.Process(target=_worker_main, args=(i, cfg, q, self._results), daemon=True, name=f"nast-dsp-{i}")
+            for i, q in enumerate(self._tasks)
+        ]
+        for p in self._procs:
+            p.start()
+
+    # -------- channels --------
+
+    def add_channel(self, name: str, mode: str = "FM", offset_hz: float = 0.0, bandwidth_hz: float = 25e3):
+        if name in self._channels:
+            self.remove_channel(name)
+        free = sorted(set(range(self.max_channels)) - set(self._names))
+        if not free:
+            raise RuntimeError(f"At most {self.max_channels} channels")
+        idx, w = free[0], self._next_worker
+        self._next_worker = (self._next_worker + 1) % self.num_workers
+        self._channels[name] = (idx, w)
+        self._names[idx] = name
+        cfg = {"mode": mode, "offset_hz": float(offset_hz), "bandwidth_hz": float(bandwidth_hz)}
+        self._tasks[w].put(("channel", idx, cfg))
+
+    def set_offset(self, name: str, offset_hz: float):
+        idx, w = self._channels[name]
+        self._tasks[w].put(("offset", idx, float(offset_hz)))
+
+    def remove_channel(self, name: str):
+        idx, w = self._channels.pop(name)
+        self._names.pop(idx, None)
+        self._tasks[w].put(("channel", idx, None))
+
+    # -------- data path --------
+
+    @property
+    def free_slots(self) -> int:
+        return len(self._free)
+
+    def submit(self, iq: np.ndarray, spectrum: bool = True) -> Optional[int]:
+        jobs = {}
+        for idx, w in self._channels.values():
+            jobs.setdefault(w, []).append(idx)
+        if spectrum:
+            w = min(range(self.num_workers), key=self._load.__getitem__)
+            jobs.setdefault(w, []).append(PSD_JOB)
+        if not jobs:
+            return None
+        if not self._free:
+            self.dropped += 1
+            return None
+
+        x = np.asarray(iq, dtype=np.complex64).reshape(-1)[:self.block_size]
+        slot = self._free.pop()
+        self.iq.array[slot, :x.shape[0]] = x
+        seq = self._seq
+        self._seq += 1
+        self._pending[slot] = sum(len(j) for j in jobs.values())
+        for w, job in jobs.items():
+            self._load[w] += len(job)
+            self._tasks[w].put(("block", seq, slot, x.shape[0], job))
+        return seq
+
+    def poll(self, timeout: float = 0.0) -> list:
+        """Collect finished results (blocking up to ``timeout`` for the first one)."""
+        out = []
+        block = timeout > 0
+        while True:
+            try:
+                msg = self._results.get(block, timeout) if block else self._results.get_nowait()
+            except queue.Empty:
+                break
+            block = False
+            out.append(self._result(msg))
+        return out
+
+    def _result(self, msg) -> dict:
+        kind, worker, seq, slot, job = msg[:5]
+        if kind == "psd":
+            res = {"kind": kind, "seq": seq, "channel": None, "data": self.psd.array[slot, :job].copy()}
+        elif kind == "audio":
+            data = self.audio.array[slot * self.max_channels + job, :msg[5]].copy()
+            res = {"kind": kind, "seq": seq, "channel": self._names.get(job), "data": data}
+        else:
+            self.errors += 1
+            logger.warning("DSP worker job %r failed: %s", job, msg[5])
+            res = {"kind": kind, "seq": seq, "channel": self._names.get(job), "data": msg[5]}
+
+        self._load[worker] -= 1
+        self._pending[slot] -= 1
+        if self._pending[slot] <= 0:
+            del self._pending[slot]
+            self._free.append(slot)
+        return res
+
+    def close(self):
+        for q in self._tasks:
+            q.put(None)
+        for p in self._procs:
+            p.join(timeout=2.0)
+            if p.is_alive():
+                p.terminate()
+        for pool in (self.iq, self.psd, self.audio):
+            pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
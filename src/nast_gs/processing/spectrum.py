@@ -1,50 +1,257 @@
+import logging
+import os
+import threading
+
 import numpy as np
+import scipy.fft
+
+try:
+    import pyfftw
+    import pyfftw.builders
+except Exception:
+    pyfftw = None
+
+logger = logging.getLogger(__name__)
+
+
+class SpectrumEngine:
+    """
+    Shared PSD engine: caches windows and FFT plans per nfft and reuses preallocated
+    buffers, so repeated spectra at a fixed nfft allocate (almost) nothing.
+
+    backend: "pyfftw" (FFTW plans built once per nfft, if pyFFTW is installed),
+    "scipy" (pocketfft with ``workers`` threads; it keeps its own plan cache) or
+    "numpy". "auto" picks pyfftw when available, else scipy.
+    """
+
+    def __init__(self, backend: str = "auto", workers: int = None):
+        if backend == "auto":
+            backend = "pyfftw" if pyfftw is not None else "scipy"
+        if backend == "pyfftw" and pyfftw is None:
+            raise RuntimeError("pyFFTW not installed. Install with: pip install pyfftw")
+        if backend not in ("pyfftw", "scipy", "numpy"):
+            raise ValueError(f"Unknown FFT backend {backend!r}")
+        self.backend = backend
+        self.workers = int(workers or min(4, os.cpu_count() or 1))
+
+        self._lock = threading.Lock()
+        self._windows = {}
+        self._plans = {}
+        self._inbuf = {}
+        self._power = {}
+
+    def window(self, nfft: int) -> np.ndarray:
+        """Hann window (float32), cached per nfft."""
+        w = self._windows.get(nfft)
+        if w is None:
+            w = self._windows[nfft] = np.hanning(nfft).astype(np.float32)
+        return w
+
+    def _fft(self, nfft: int, x: np.ndarray) -> np.ndarray:
+        if self.backend == "pyfftw":
+            plan = self._plans.get(nfft)
+            if plan is None:
+                a = pyfftw.empty_aligned(nfft, dtype="complex64")
+                plan = self._plans[nfft] = pyfftw.builders.fft(a, threads=self.workers, planner_effort="FFTW_MEASURE")
+            return plan(x)
+        if self.backend == "scipy":
+            return scipy.fft.fft(x, workers=self.workers, overwrite_x=True)
+        return np.fft.fft(x)
+
+    def _segments(self, x: np.ndarray, nfft: int, overlap: float, max_segments: int) -> np.ndarray:
+        """(k, nfft) view of overlapping segments covering as much of x as fits."""
+        hop = max(1, int(round(nfft * (1.0 - overlap))))
+        k = (x.shape[0] - nfft) // hop + 1
+        if max_segments:
+            k = min(k, int(max_segments))
+        return np.lib.stride_tricks.as_strided(x, shape=(k, nfft), strides=(hop * x.strides[0], x.strides[0]))
+
+    def _fft2(self, buf: np.ndarray) -> np.ndarray:
+        """Batched FFT over the rows of buf."""
+        if self.backend == "pyfftw":
+            plan = self._plans.get(buf.shape)
+            if plan is None:
+                a = pyfftw.empty_aligned(buf.shape, dtype="complex64")
+                plan = self._plans[buf.shape] = pyfftw.builders.fft(a, axis=1, threads=self.workers,
+                                                                     planner_effort="FFTW_MEASURE")
+            return plan(buf)
+        if self.backend == "scipy":
+            return scipy.fft.fft(buf, axis=1, workers=self.workers, overwrite_x=True)
+        return np.fft.fft(buf, axis=1)
+
+    def psd_db(self, iq: np.ndarray, nfft: int, remove_dc: bool = True, floor: float = 1e-20,
+               dc_bins: int = 2, overlap: float = 0.5, max_segments: int = 1) -> np.ndarray:
+        """
+        Shifted PSD in dB (float32, length nfft).
+
+        With max_segments=1 this is the periodogram of the first nfft samples
+        (zero-padded). Otherwise it is a Welch estimate: the block is cut into
+        Hann-windowed segments overlapping by ``overlap``, transformed with one
+        batched FFT and the powers averaged. max_segments=0 uses every segment
+        that fits, giving a lower-variance trace from the same block.
+
+        remove_dc subtracts the block mean first (RTL DC spike); dc_bins > 0 replaces
+        the 2*dc_bins centre bins by the mean level. The returned array is a fresh copy.
+        """
+        nfft = int(nfft)
+        x = np.asarray(iq, dtype=np.complex64)
+        if max_segments != 1 and x.shape[0] >= 2 * nfft:
+            return self._welch_db(x, nfft, remove_dc, floor, dc_bins, overlap, max_segments)
 
+        with self._lock:
+            buf = self._inbuf.get(nfft)
+            if buf is None:
+                buf = self._inbuf[nfft] = np.zeros(nfft, dtype=np.complex64)
+                self._power[nfft] = np.zeros(nfft, dtype=np.float32)
+            n = min(x.shape[0], nfft)
+            buf[:n] = x[:n]
+            buf[n:] = 0.0
+            if remove_dc and n:
+                buf[:n] -= buf[:n].mean()
+            buf *= self.window(nfft)
 
-def compute_spectrum(iq: np.ndarray, nfft: int = 1024):
+            X = self._fft(nfft, buf)
+            p = self._power[nfft]
+            np.multiply(X.real, X.real, out=p, casting="unsafe")
+            p += X.imag * X.imag
+            p += floor
+            psd = np.fft.fftshift(10.0 * np.log10(p)).astype(np.float32)
+
+        return self._soften_dc(psd, dc_bins)
+
+    def _welch_db(self, x, nfft, remove_dc, floor, dc_bins, overlap, max_segments) -> np.ndarray:
+        seg = self._segments(x, nfft, overlap, max_segments)
+        with self._lock:
+            key = (seg.shape[0], nfft)
+            buf = self._inbuf.get(key)
+            if buf is None:
+                buf = self._inbuf[key] = np.empty(seg.shape, dtype=np.complex64)
+            np.multiply(seg, self.window(nfft), out=buf)
+            if remove_dc:
+                buf -= x.mean() * self.window(nfft)
+
+            X = self._fft2(buf)
+            p = (X.real * X.real + X.imag * X.imag).mean(axis=0)
+            p += floor
+            psd = np.fft.fftshift(10.0 * np.log10(p)).astype(np.float32)
+
+        return self._soften_dc(psd, dc_bins)
+
+    @staticmethod
+    def _soften_dc(psd: np.ndarray, dc_bins: int) -> np.ndarray:
+        if dc_bins:
+            mid = psd.shape[0] // 2
+            psd[mid - dc_bins: mid + dc_bins] = np.mean(psd)
+        return psd
+
+
+_default_engine = None
+
+
+def get_engine() -> SpectrumEngine:
+    """Process-wide SpectrumEngine shared by all spectrum views."""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = SpectrumEngine()
+    return _default_engine
+
+
+def compute_spectrum(iq: np.ndarray, nfft: int = 1024, overlap: float = 0.5, max_segments: int = 1):
     """
     GNU Radio-like spectrum computation:
     - DC removal
     - Hann window
     - FFT shift
     - PSD in dB: 10*log10(|X|^2)
+    - max_segments != 1: Welch averaging over the whole block (0 = all segments)
     Returns:
         bins: normalized frequency bins from -0.5..+0.5 (like GNURadio baseband)
         psd_db: PSD in dB (float32)
     """
+    bins = np.linspace(-0.5, 0.5, nfft, endpoint=False)
     if iq is None or len(iq) < 16:
-        bins = np.linspace(-0.5, 0.5, nfft, endpoint=False)
         return bins, np.full(nfft, -200.0, dtype=np.float32)
 
-    x = np.asarray(iq, dtype=np.complex64)
+    # DC removal + Hann + shift, then soften the remaining DC bin area
+    return bins, get_engine().psd_db(iq, nfft, remove_dc=True, floor=1e-20, dc_bins=2,
+                                     overlap=overlap, max_segments=max_segments)
+
 
-    # pad/crop to nfft
-    if len(x) < nfft:
-        tmp = np.zeros(nfft, dtype=np.complex64)
-        tmp[: len(x)] = x
-        x = tmp
-    else:
-        x = x[:nfft]
+class SpectrumPipeline:
+    """
+    Compute the PSD of each IQ block once and publish it to every subscribed view.
+
+    Subscribers are callables ``cb(psd_db, center_hz, sample_rate)``. Each may ask
+    for its own nfft (multi-resolution): only the finest resolution is transformed,
+    coarser ones are derived by averaging, in linear power, the group of adjacent fine
+    bins centred on each coarse bin's frequency (the first group wraps around from the
+    top edge, as the FFT bins do), so a tone lands in the same bin as with a native
+    FFT of that size. Published arrays are shared between subscribers and read-only.
+    """
 
-    # DC remove (RTL-SDR center spike reduction)
-    x = x - np.mean(x)
+    def __init__(self, nfft: int = 4096, overlap: float = 0.5, max_segments: int = 0,
+                 engine: SpectrumEngine = None):
+        self.nfft = int(nfft)
+        self.overlap = float(overlap)
+        self.max_segments = int(max_segments)
+        self.engine = engine or get_engine()
+        self._subs = []  # (callback, nfft)
+        self.blocks = 0
 
-    # Hann window (same default as GNU Radio sinks)
-    w = np.hanning(nfft).astype(np.float32)
-    x = x * w
+    def subscribe(self, callback, nfft: int = None):
+        """Register a view; nfft must divide the pipeline nfft (defaults to it)."""
+        nfft = int(nfft or self.nfft)
+        if nfft > self.nfft or self.nfft % nfft:
+            raise ValueError(f"nfft {nfft} must divide the pipeline nfft {self.nfft}")
+        self.unsubscribe(callback)
+        self._subs.append((callback, nfft))
 
-    # FFT shift
-    X = np.fft.fftshift(np.fft.fft(x, nfft))
+    def unsubscribe(self, callback):
+        self._subs = [(cb, n) for cb, n in self._subs if cb != callback]
 
-    # PSD power in dB (GNU Radio style)
-    p = (np.abs(X) ** 2).astype(np.float32)
-    psd_db = (10.0 * np.log10(p + 1e-20)).astype(np.float32)
+    def compute(self, iq: np.ndarray, resolutions=None) -> dict:
+        """{nfft: psd_db} for the given resolutions (default: those subscribed, or the base one)."""
+        wanted = set(resolutions or [n for _, n in self._subs] or [self.nfft])
+        base = self.engine.psd_db(iq, self.nfft, remove_dc=True, floor=1e-20, dc_bins=2,
+                                  overlap=self.overlap, max_segments=self.max_segments)
+        out = {}
+        lin = None
+        for n in wanted:
+            if n == self.nfft:
+                psd = base
+            else:
+                if lin is None:
+                    lin = np.power(10.0, base / 10.0, dtype=np.float32)
+                r = self.nfft // n
+                # fine bin r*k is coarse bin k's frequency; centre its group there
+                group = np.roll(lin, r // 2).reshape(n, r)
+                psd = (10.0 * np.log10(group.mean(axis=1))).astype(np.float32)
+            psd.flags.writeable = False
+            out[n] = psd
+        return out
 
-    # bins are normalized baseband bins
-    bins = np.linspace(-0.5, 0.5, nfft, endpoint=False)
+    def resolutions(self) -> list:
+        return sorted({n for _, n in self._subs} or {self.nfft})
 
-    # soften the remaining DC bin area
-    mid = nfft // 2
-    psd_db[mid - 2: mid + 2] = np.mean(psd_db)
+    def push(self, iq: np.ndarray, center_hz: float, sample_rate: float) -> dict:
+        """Compute once for this block and deliver to all subscribers."""
+        if iq is None or len(iq) < 64:
+            return {}
+        psds = self.compute(iq, self.resolutions())
+        self.publish(psds, center_hz, sample_rate)
+        return psds
 
-    return bins, psd_db
+    def publish(self, psds: dict, center_hz: float, sample_rate: float):
+        """
+        Deliver PSDs from ``compute`` (possibly run on a worker thread) to the subscribers;
+        a failing view is logged and skipped.
+        """
+        self.blocks += 1
+        for cb, n in list(self._subs):
+            psd = psds.get(n)
+            if psd is None:  # subscribed after this block was computed
+                continue
+            try:
+                cb(psd, center_hz, sample_rate)
+            except Exception:
+                logger.exception("Spectrum subscriber %r failed", cb)
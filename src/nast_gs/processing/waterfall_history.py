@@ -0,0 +1,211 @@
+"""Disk-backed waterfall history with a min/max pyramid for zoomed-out review.
+
+Rows are quantized uint8 (already mapped to the colour scale) and appended to a
+memory-mapped file together with per-row metadata (timestamp, centre frequency,
+span). Each pyramid level k halves the row count of level k-1, keeping the
+per-column max and min of every row pair, so any span of the history (a whole
+10-minute pass included) is rendered from about as many rows as the display has,
+and peaks do not vanish when zoomed out. Only the OS page cache holds rows in
+RAM, so resident memory stays bounded however long the history grows. Disk use
+is bounded too: past ``max_rows`` rows the oldest half is dropped and the
+pyramid rebuilt, so the files never exceed about 3 * width * max_rows bytes.
+"""
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+import numpy as np
+
+META_DTYPE = np.dtype([("t", "f8"), ("center_hz", "f8"), ("span_hz", "f8")])
+
+_CHUNK = 4096  # rows moved per step when rolling over, to keep the temporary copies small
+
+
+class _GrowingArray:
+    """Append-only 2-D (or structured 1-D) memmap that doubles its backing file when full."""
+
+    def __init__(self, path: str, row_shape: tuple, dtype, capacity: int = 1024, max_capacity: int = None):
+        self.path = path
+        self.max_capacity = max_capacity
+        if max_capacity:
+            capacity = min(capacity, max_capacity)
+        self.row_shape = tuple(row_shape)
+        self.dtype = np.dtype(dtype)
+        self.n = 0
+        self.capacity = 0
+        self.data = None
+        open(path, "wb").close()
+        self._resize(capacity)
+
+    def _resize(self, capacity: int):
+        if self.data is not None:
+            self.data.flush()
+        row_bytes = int(np.prod(self.row_shape, dtype=np.int64)) * self.dtype.itemsize
+        with open(self.path, "r+b") as f:
+            f.truncate(capacity * row_bytes)
+        self.data = np.memmap(self.path, dtype=self.dtype, mode="r+", shape=(capacity,) + self.row_shape)
+        self.capacity = capacity
+
+    def append(self, row):
+        if self.n == self.capacity:
+            cap = self.capacity * 2
+            if self.max_capacity:
+                if self.n >= self.max_capacity:
+                    raise IndexError("array is full")
+                cap = min(cap, self.max_capacity)
+            self._resize(cap)
+        self.data[self.n] = row
+        self.n += 1
+
+    def drop_head(self, count: int):
+        """Discard the first ``count`` rows, moving the rest to the front of the file."""
+        keep = self.n - int(count)
+        for a in range(0, keep, _CHUNK):
+            b = min(keep, a + _CHUNK)
+            self.data[a:b] = self.data[count + a:count + b]
+        self.n = keep
+
+    def __getitem__(self, idx):
+        return self.data[:self.n][idx]
+
+    def clear(self):
+        """Forget every row and shrink the file back to its initial size."""
+        self.n = 0
+        self._resize(min(1024, self.max_capacity or 1024))
+
+    def close(self):
+        if self.data is not None:
+            self.data.flush()
+            self.data = None
+
+
+class WaterfallHistory:
+    """
+    Unbounded waterfall history: uint8 rows of ``width`` columns plus META_DTYPE metadata.
+
+    With ``directory=None`` the files live in a private temp dir removed by close().
+    At ``max_rows`` rows the oldest half is discarded; ``dropped`` counts the rows
+    discarded so far, so row indices held by a caller can be shifted by the difference.
+    """
+
+    def __init__(self, width: int, directory: Optional[str] = None, max_levels: int = 16,
+                 max_rows: int = 1 << 17):
+        self.width = int(width)
+        self.max_levels = int(max_levels)
+        self.max_rows = max(2, int(max_rows))
+        self.dropped = 0
+        self._tmpdir = None
+        if directory is None:
+            directory = self._tmpdir = tempfile.mkdtemp(prefix="nast_waterfall_")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+
+        self.meta = _GrowingArray(os.path.join(directory, "meta.bin"), (), META_DTYPE, max_capacity=self.max_rows)
+        # levels[0] = (rows, rows); levels[k] = (max rows, min rows) for k >= 1
+        rows0 = _GrowingArray(os.path.join(directory, "rows_0.bin"), (self.width,), np.uint8,
+                              max_capacity=self.max_rows)
+        self.levels = [(rows0, rows0)]
+
+    def __len__(self) -> int:
+        return self.levels[0][0].n
+
+    def append(self, row: np.ndarray, t: float, center_hz: float = 0.0, span_hz: float = 0.0):
+        row = np.asarray(row, dtype=np.uint8)
+        if len(self) >= self.max_rows:
+            self._rollover()
+        self.levels[0][0].append(row)
+        self.meta.append((t, center_hz, span_hz))
+
+        # propagate complete row pairs up the pyramid
+        k = 1
+        while k < self.max_levels:
+            mx_prev, mn_prev = self.levels[k - 1]
+            if mx_prev.n % 2:
+                break
+            if k == len(self.levels):
+                d = self.directory
+                self.levels.append((_GrowingArray(os.path.join(d, f"rows_{k}_max.bin"), (self.width,), np.uint8),
+                                    _GrowingArray(os.path.join(d, f"rows_{k}_min.bin"), (self.width,), np.uint8)))
+            mx, mn = self.levels[k]
+            mx.append(np.maximum(mx_prev[-2], mx_prev[-1]))
+            mn.append(np.minimum(mn_prev[-2], mn_prev[-1]))
+            k += 1
+
+    def _rollover(self):
+        """Drop the oldest half of the history and rebuild the pyramid from what is left."""
+        drop = len(self) - self.max_rows // 2
+        self.levels[0][0].drop_head(drop)
+        self.meta.drop_head(drop)
+        for k in range(1, len(self.levels)):
+            mx_prev, mn_prev = self.levels[k - 1]
+            mx, mn = self.levels[k]
+            m = mx_prev.n // 2
+            for a in range(0, m, _CHUNK):
+                b = min(m, a + _CHUNK)
+                # level k is never longer than it was before, so it already has the capacity
+                mx.data[a:b] = np.maximum(mx_prev.data[2 * a:2 * b:2], mx_prev.data[2 * a + 1:2 * b:2])
+                mn.data[a:b] = np.minimum(mn_prev.data[2 * a:2 * b:2], mn_prev.data[2 * a + 1:2 * b:2])
+            mx.n = mn.n = m
+        self.dropped += drop
+
+    def clear(self):
+        """Drop the whole history (e.g. after a retune), keeping the files open for new rows."""
+        for k, (mx, mn) in enumerate(self.levels):
+            mx.clear()
+            if k:
+                mn.clear()
+        self.meta.clear()
+
+    def level_for(self, span_rows: int, out_rows: int) -> int:
+        """Coarsest level that still has at least out_rows rows for span_rows of level 0."""
+        ratio = max(1, int(span_rows) // max(1, int(out_rows)))
+        return min(int(np.log2(ratio)), len(self.levels) - 1)
+
+    def render(self, end: int, span: int, out_rows: int, use_min: bool = False):
+        """
+        Rows ``[end - span, end)`` of the history resampled to ``out_rows`` rows, newest first.
+
+        Returns (rows uint8 (out_rows, width), metadata of the row shown on each line).
+        Reads only the pyramid level whose resolution matches the output, so the cost
+        is O(out_rows * width) regardless of span.
+        """
+        n = len(self)
+        end = int(min(max(end, 1), n))
+        span = int(max(1, min(span, end)))
+        if n == 0:
+            return np.zeros((out_rows, self.width), np.uint8), np.zeros(out_rows, META_DTYPE)
+
+        k = self.level_for(span, out_rows)
+        mx, mn = self.levels[k]
+        src = mn if use_min else mx
+        # level-k rows covering [end - span, end)
+        lo = (end - span) >> k
+        hi = max(lo + 1, min(src.n, -(-end >> k)))
+        block = src[lo:hi]
+        if hi - lo > out_rows:
+            # up to 2x more rows than lines: pool the remainder too, so no row is skipped
+            edges = np.linspace(0, hi - lo, out_rows + 1).astype(np.int64)
+            reduce = np.minimum if use_min else np.maximum
+            rows = reduce.reduceat(block, edges[:-1], axis=0)[::-1]
+            idx = lo + edges[1:][::-1] - 1  # newest level-k row of each line
+        else:
+            idx = np.linspace(hi - 1, lo, out_rows).round().astype(np.int64)
+            rows = block[idx - lo]
+        meta = self.meta[np.minimum((idx << k) + (1 << k) - 1, n - 1)]
+        return np.ascontiguousarray(rows), meta
+
+    def flush(self):
+        for mx, mn in self.levels:
+            mx.data.flush()
+            mn.data.flush()
+        self.meta.data.flush()
+
+    def close(self):
+        for mx, mn in self.levels:
+            mx.close()
+            mn.close()
+        self.meta.close()
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
@@ -1,5 +1,14 @@
 """Propagation utilities"""
 
-from .propagator import propagate_tle, load_tle
+from .propagator import propagate_tle, propagate_arrays, load_tle
+from .catalog import TLECatalog, load_catalog, parse_tle_text, propagate_catalog
 
-__all__ = ["propagate_tle", "load_tle"]
+__all__ = [
+    "propagate_tle",
+    "propagate_arrays",
+    "load_tle",
+    "TLECatalog",
+    "load_catalog",
+    "parse_tle_text",
+    "propagate_catalog",
+]
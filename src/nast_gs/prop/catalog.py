@@ -0,0 +1,229 @@
+"""Multi-satellite TLE catalogs and vectorized fleet propagation.
+
+A catalog holds every entry of a 3LE (name + two lines) or 2LE file, indexed by
+name and NORAD ID. ``propagate_catalog`` evaluates all satellites over one shared
+time grid with ``sgp4``'s ``SatrecArray`` and does the Earth-fixed geometry in NumPy,
+so a whole deployment batch costs about as much as a single Skyfield propagation.
+"""
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+from sgp4.api import Satrec, SatrecArray, jday
+from skyfield.api import wgs84
+from skyfield.sgp4lib import theta_GMST1982
+
+from .propagator import _timescale, _utc_times
+
+DAY_S = 86400.0
+WGS84_A_KM = 6378.137
+WGS84_F = 1.0 / 298.257223563
+WGS84_E2 = WGS84_F * (2.0 - WGS84_F)
+
+
+def _split_entries(lines: List[str]) -> List[List[str]]:
+    entries = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line.startswith("1 ") and i + 1 < len(lines) and lines[i + 1].startswith("2 "):
+            # 2LE: synthesize a name from the catalog number
+            entries.append([f"NORAD {line[2:7].strip()}", line, lines[i + 1]])
+            i += 2
+        elif i + 2 < len(lines) and lines[i + 1].startswith("1 ") and lines[i + 2].startswith("2 "):
+            name = line[2:] if line.startswith("0 ") else line
+            entries.append([name.strip(), lines[i + 1], lines[i + 2]])
+            i += 3
+        else:
+            i += 1
+    return entries
+
+
+class TLECatalog:
+    """Indexed collection of TLE entries.
+
+    Entries are kept as parallel lists (``names``, ``line1``, ``line2``) plus a
+    ``norad_ids`` int array and the parsed ``Satrec`` objects. Items are returned in
+    the ``[name, line1, line2]`` form the rest of the package uses.
+    """
+
+    def __init__(self, entries: List[List[str]]):
+        self.names = [e[0] for e in entries]
+        self.line1 = [e[1] for e in entries]
+        self.line2 = [e[2] for e in entries]
+        self.satrecs = [Satrec.twoline2rv(l1, l2) for l1, l2 in zip(self.line1, self.line2)]
+        self.norad_ids = np.array([s.satnum for s in self.satrecs], dtype=np.int64)
+
+        self._by_name = {n.upper(): i for i, n in enumerate(self.names)}
+        self._by_norad = {int(n): i for i, n in enumerate(self.norad_ids)}
+        self._array = SatrecArray(self.satrecs) if self.satrecs else None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, i: int) -> List[str]:
+        return [self.names[i], self.line1[i], self.line2[i]]
+
+    def index(self, key: Union[int, str]) -> int:
+        """Position of an entry given its NORAD ID or (case-insensitive) name."""
+        if isinstance(key, (int, np.integer)):
+            if int(key) in self._by_norad:
+                return self._by_norad[int(key)]
+        elif str(key).strip().upper() in self._by_name:
+            return self._by_name[str(key).strip().upper()]
+        raise KeyError(f"No catalog entry for {key!r}")
+
+    def get(self, key: Union[int, str]) -> List[str]:
+        """TLE ``[name, line1, line2]`` by NORAD ID or name."""
+        return self[self.index(key)]
+
+    def subset(self, keys) -> "TLECatalog":
+        """New catalog holding only the given NORAD IDs / names, in that order."""
+        return TLECatalog([self.get(k) for k in keys])
+
+
+def parse_tle_text(text: str) -> TLECatalog:
+    """Parse every 3LE/2LE entry in ``text`` (blank lines and junk lines are skipped)."""
+    lines = [l.strip() for l in text.splitlines() if l.strip()]
+    return TLECatalog(_split_entries(lines))
+
+
+def load_catalog(path: str) -> TLECatalog:
+    """Load every TLE entry from a file."""
+    with open(path, "r", encoding="utf-8") as f:
+        cat = parse_tle_text(f.read())
+    if not len(cat):
+        raise ValueError(f"No TLE entries found in {path}")
+    return cat
+
+
+def _geodetic(r: np.ndarray):
+    """WGS84 latitude/longitude (deg) and height (m) for ITRF positions ``r[..., 3]`` in km."""
+    x, y, z = r[..., 0], r[..., 1], r[..., 2]
+    p = np.hypot(x, y)
+    lat = np.arctan2(z, p)
+    for _ in range(3):
+        s = np.sin(lat)
+        n = WGS84_A_KM / np.sqrt(1.0 - WGS84_E2 * s * s)
+        lat = np.arctan2(z + n * WGS84_E2 * s, p)
+    s = np.sin(lat)
+    h = p * np.cos(lat) + z * s - WGS84_A_KM * np.sqrt(1.0 - WGS84_E2 * s * s)
+    return np.degrees(lat), np.degrees(np.arctan2(y, x)), h * 1e3
+
+
+@lru_cache(maxsize=16)
+def _station_frame(gs_lat: float, gs_lon: float, gs_alt_m: float):
+    """Station ITRF position (km) and ITRF->ENU rotation matrix."""
+    obs = wgs84.latlon(gs_lat, gs_lon, elevation_m=gs_alt_m).itrs_xyz.km
+    lat, lon = np.radians(gs_lat), np.radians(gs_lon)
+    sl, cl, so, co = np.sin(lat), np.cos(lat), np.sin(lon), np.cos(lon)
+    enu = np.array([
+        [-so, co, 0.0],
+        [-sl * co, -sl * so, cl],
+        [cl * co, cl * so, sl],
+    ])
+    return obs, enu
+
+
+def _topocentric(r: np.ndarray, v: np.ndarray, gs_lat: float, gs_lon: float, gs_alt_m: float):
+    """Az/el (deg), range (km) and range-rate (km/s) of ITRF states as seen from the station."""
+    obs, enu = _station_frame(float(gs_lat), float(gs_lon), float(gs_alt_m))
+    d = r - obs
+    e, n, u = np.moveaxis(d @ enu.T, -1, 0)
+    rng = np.sqrt(np.sum(d * d, axis=-1))
+    el = np.degrees(np.arctan2(u, np.hypot(e, n)))
+    az = np.degrees(np.arctan2(e, n)) % 360.0
+    rr = np.sum(d * v, axis=-1) / np.where(rng > 0.0, rng, 1.0)
+    return az, el, rng, rr
+
+
+def _elevation(r: np.ndarray, gs_lat: float, gs_lon: float, gs_alt_m: float) -> np.ndarray:
+    """Elevation only (deg) of ITRF positions; the cheap path for pass searches."""
+    obs, enu = _station_frame(float(gs_lat), float(gs_lon), float(gs_alt_m))
+    d = r - obs
+    return np.degrees(np.arcsin((d @ enu[2]) / np.sqrt(np.sum(d * d, axis=-1))))
+
+
+def _dut1_s(dt: datetime) -> float:
+    """UT1-UTC (s) at ``dt``; it drifts ~1 ms/day, so one value serves a multi-day window."""
+    return float(_utc_times(_timescale(), dt, 0.0).dut1)
+
+
+def _itrf_states(satrecs, start_dt: datetime, offsets_s, dut1_s: Optional[float] = None):
+    """Propagate ``satrecs`` (a SatrecArray or one Satrec) at ``start_dt`` + ``offsets_s``.
+
+    Returns (error, r, v) with r/v Earth-fixed in km and km/s, shaped (nsat, ntimes, 3)
+    for a SatrecArray and (ntimes, 3) for a single Satrec. ``None`` (an empty catalog)
+    gives nsat = 0.
+    """
+    offsets_s = np.atleast_1d(np.asarray(offsets_s, dtype=np.float64))
+    if satrecs is None:
+        empty = np.zeros((0, offsets_s.shape[0], 3))
+        return np.zeros((0, offsets_s.shape[0]), dtype=np.uint8), empty, empty.copy()
+    jd0, fr0 = jday(start_dt.year, start_dt.month, start_dt.day, start_dt.hour, start_dt.minute,
+                    start_dt.second + start_dt.microsecond / 1e6)
+    jd = np.full(offsets_s.shape, jd0)
+    fr = fr0 + offsets_s / DAY_S
+    if isinstance(satrecs, Satrec):
+        err, r, v = satrecs.sgp4_array(jd, fr)
+    else:
+        err, r, v = satrecs.sgp4(jd, fr)
+
+    # TEME -> pseudo Earth-fixed (polar motion ignored, as in Skyfield's default)
+    if dut1_s is None:
+        dut1_s = _dut1_s(start_dt)
+    theta, theta_dot = theta_GMST1982(jd, fr + dut1_s / DAY_S)
+    c, s = np.cos(theta), np.sin(theta)
+    x = c * r[..., 0] + s * r[..., 1]
+    y = -s * r[..., 0] + c * r[..., 1]
+    vx = c * v[..., 0] + s * v[..., 1]
+    vy = -s * v[..., 0] + c * v[..., 1]
+    w = theta_dot / DAY_S
+    r_ef = np.stack([x, y, r[..., 2]], axis=-1)
+    v_ef = np.stack([vx + w * y, vy - w * x, v[..., 2]], axis=-1)
+    return err, r_ef, v_ef
+
+
+def fleet_states(catalog: TLECatalog, start_dt: datetime, offsets_s, gs_lat: float, gs_lon: float,
+                 gs_alt_m: float = 0.0, satrecs: Optional[SatrecArray] = None) -> Dict[str, np.ndarray]:
+    """Columnar (nsat, ntimes) state of every catalog entry at ``start_dt`` + ``offsets_s``.
+
+    Keys match ``propagate_arrays``: sublat, sublon, subalt_m, azdeg, eldeg, range_km,
+    range_rate_km_s, plus ``error`` (nonzero SGP4 error codes, e.g. decayed objects).
+    An empty catalog gives (0, ntimes) columns.
+    """
+    err, r, v = _itrf_states(satrecs if satrecs is not None else catalog._array, start_dt, offsets_s)
+    sublat, sublon, subalt = _geodetic(r)
+    az, el, rng, rr = _topocentric(r, v, gs_lat, gs_lon, gs_alt_m)
+    return {
+        "sublat": sublat,
+        "sublon": sublon,
+        "subalt_m": subalt,
+        "azdeg": az,
+        "eldeg": el,
+        "range_km": rng,
+        "range_rate_km_s": rr,
+        "error": err,
+    }
+
+
+def propagate_catalog(catalog: TLECatalog, start_dt: datetime, minutes: int, step_s: int, gs_lat: float,
+                      gs_lon: float, gs_alt_m: float = 0.0) -> Dict[str, np.ndarray]:
+    """Propagate every satellite of ``catalog`` over one shared time grid.
+
+    Same grid and keys as ``propagate_arrays`` but every column is (nsat, ntimes);
+    ``names`` and ``norad_ids`` give the row order.
+    """
+    steps = int((minutes * 60) / step_s)
+    offsets = np.arange(steps + 1, dtype=np.float64) * step_s
+    cols = fleet_states(catalog, start_dt, offsets, gs_lat, gs_lon, gs_alt_m)
+    cols["t_s"] = offsets
+    cols["time"] = [start_dt + timedelta(seconds=float(o)) for o in offsets]
+    cols["names"] = list(catalog.names)
+    cols["norad_ids"] = catalog.norad_ids.copy()
+    return cols
@@ -0,0 +1,103 @@
+"""Pass-scoped ephemeris tables for real-time tracking.
+
+A ``PassEphemeris`` propagates a tracking window once at a coarse step and then
+serves any instant inside it by cubic-spline interpolation (Hermite for range, whose
+derivative is the propagated range-rate), so per-tick cost is a few polynomial
+evaluations instead of SGP4 + topocentric math. The interpolation
+error is measured at build time against true propagation at the midpoints between
+knots (where spline error peaks) and reported in ``max_error``.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+from scipy.interpolate import CubicHermiteSpline, CubicSpline
+
+from .propagator import SatelliteTracker, _find_pass_windows
+
+COLUMNS = ("sublat", "sublon", "subalt_m", "azdeg", "eldeg", "range_km", "range_rate_km_s")
+_ANGLE_COLUMNS = ("sublon", "azdeg")
+
+
+def _wrap_diff(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (a - b + 180.0) % 360.0 - 180.0
+
+
+class PassEphemeris:
+    """Interpolated state table covering [start_dt, start_dt + duration_s]."""
+
+    def __init__(self, tracker: SatelliteTracker, start_dt: datetime, duration_s: float, step_s: float = 10.0,
+                 validate: bool = True):
+        self.start = start_dt
+        self.duration_s = float(duration_s)
+        self.step_s = float(step_s)
+        self.end = start_dt + timedelta(seconds=self.duration_s)
+
+        n = max(4, int(np.ceil(self.duration_s / self.step_s)) + 1)
+        knots = np.arange(n, dtype=np.float64) * self.step_s
+        cols = tracker.states(start_dt, knots)
+
+        self._splines = {}
+        for k in COLUMNS:
+            y = cols[k]
+            if k in _ANGLE_COLUMNS:
+                # interpolate the continuous angle; wrapped back on output
+                y = np.degrees(np.unwrap(np.radians(y)))
+            if k == "range_km":
+                self._splines[k] = CubicHermiteSpline(knots, y, cols["range_rate_km_s"])
+            else:
+                self._splines[k] = CubicSpline(knots, y)
+
+        self.max_error: Dict[str, float] = {}
+        if validate:
+            mids = knots[:-1] + 0.5 * self.step_s
+            truth = tracker.states(start_dt, mids)
+            approx = self.sample(mids)
+            for k in COLUMNS:
+                diff = _wrap_diff(approx[k], truth[k]) if k in _ANGLE_COLUMNS else approx[k] - truth[k]
+                self.max_error[k] = float(np.max(np.abs(diff)))
+
+    def covers(self, dt: datetime) -> bool:
+        return self.start <= dt <= self.end
+
+    def sample(self, offsets_s) -> Dict[str, np.ndarray]:
+        """Columnar state at ``start`` + ``offsets_s`` seconds (same keys as ``propagate_arrays``)."""
+        x = np.asarray(offsets_s, dtype=np.float64)
+        out = {k: self._splines[k](x) for k in COLUMNS}
+        out["sublon"] = (out["sublon"] + 180.0) % 360.0 - 180.0
+        out["azdeg"] = out["azdeg"] % 360.0
+        return out
+
+    def state_at(self, dt: datetime) -> Dict:
+        """Interpolated state dict, same keys as ``current_state``."""
+        st = {"time": dt}
+        st.update((k, float(v)) for k, v in self.sample((dt - self.start).total_seconds()).items())
+        return st
+
+    def range_rate_at(self, dt: datetime) -> float:
+        return float(self._splines["range_rate_km_s"]((dt - self.start).total_seconds()))
+
+
+def build_pass_ephemeris(
+    tracker: SatelliteTracker,
+    now: datetime,
+    lead_s: float = 300.0,
+    margin_s: float = 60.0,
+    step_s: float = 10.0,
+    search_hours: float = 24.0,
+    min_el_deg: float = 0.0,
+) -> Optional[PassEphemeris]:
+    """Ephemeris for the current or next pass, from AOS - ``lead_s`` to LOS + ``margin_s``.
+
+    If a pass is already in progress the table starts at ``now``. Returns None when no
+    pass rises above ``min_el_deg`` within ``search_hours``.
+    """
+    def elev_fn(offsets):
+        return tracker.elevation(now, offsets)
+
+    windows = _find_pass_windows(elev_fn, search_hours * 3600.0, 30.0, min_el_deg, precision_s=1.0)
+    if not windows:
+        return None
+    aos_s, los_s, _, _ = windows[0]
+    start_s = max(0.0, aos_s - lead_s)
+    return PassEphemeris(tracker, now + timedelta(seconds=start_s), (los_s + margin_s) - start_s, step_s)
@@ -1,7 +1,12 @@
 """Basic TLE import and propagation using skyfield."""
 from skyfield.api import EarthSatellite, load, wgs84
+from skyfield.nutationlib import iau2000b_radians
 from datetime import datetime, timedelta
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Optional
+import time
+
+import numpy as np
 
 
 def load_tle(path: str) -> List[str]:
@@ -13,91 +18,147 @@ def load_tle(path: str) -> List[str]:
     raise ValueError("TLE file must contain at least 3 non-empty lines (name, line1, line2)")
 
 
-def propagate_tle(tle: List[str], start_dt: datetime, minutes: int, step_s: int, gs_lat: float, gs_lon: float, gs_alt_m: float = 0.0) -> List[Dict]:
-    """Propagate TLE for a time range and return positions and az/el for a ground station.
+@lru_cache(maxsize=1)
+def _timescale():
+    """Process-wide Skyfield timescale (loading it parses the bundled leap-second/delta-T tables)."""
+    return load.timescale()
 
-    Returns a list of dicts with keys: time (datetime), sublat, sublon, subalt_m, azdeg, eldeg, range_km
-    """
-    ts = load.timescale()
-    name, line1, line2 = tle
-    sat = EarthSatellite(line1, line2, name, ts)
 
-    results = []
-    steps = int((minutes * 60) / step_s)
-    for i in range(steps + 1):
-        t = start_dt + timedelta(seconds=i * step_s)
-        tt = ts.utc(t.year, t.month, t.day, t.hour, t.minute, t.second + t.microsecond / 1e6)
-        geocentric = sat.at(tt)
-        subpoint = wgs84.subpoint(geocentric)
-        # compute az/el from ground station and also range-rate (radial velocity)
-        observer = wgs84.latlon(gs_lat, gs_lon, elevation_m=gs_alt_m)
-        observer_at = observer.at(tt)
-        topocentric = geocentric - observer_at
-        alt, az, distance = topocentric.altaz()
-
-        # position and velocity vectors relative to observer (km, km/s)
-        pos = topocentric.position.km
-        vel = topocentric.velocity.km_per_s
-        # radial velocity (range rate) = (pos . vel) / |pos|
-        from math import sqrt
-
-        pos_norm = sqrt(pos[0] ** 2 + pos[1] ** 2 + pos[2] ** 2)
-        range_rate_km_s = 0.0
-        if pos_norm != 0.0:
-            range_rate_km_s = (pos[0] * vel[0] + pos[1] * vel[1] + pos[2] * vel[2]) / pos_norm
-
-        results.append({
-            "time": t,
-            "sublat": subpoint.latitude.degrees,
-            "sublon": subpoint.longitude.degrees,
-            "subalt_m": subpoint.elevation.m,
-            "azdeg": az.degrees,
-            "eldeg": alt.degrees,
-            "range_km": distance.km,
-            "range_rate_km_s": range_rate_km_s,
-        })
+def _utc_times(ts, start_dt: datetime, offsets_s):
+    """Build a single Skyfield Time (scalar or array) for ``start_dt`` plus ``offsets_s`` seconds."""
+    seconds = start_dt.second + start_dt.microsecond / 1e6 + np.asarray(offsets_s, dtype=np.float64)
+    tt = ts.utc(start_dt.year, start_dt.month, start_dt.day, start_dt.hour, start_dt.minute, seconds)
+    # Everything we report is Earth-fixed, so the GCRS round trip cancels nutation;
+    # the truncated IAU2000B series is ~10x cheaper than the default IAU2000A.
+    tt._nutation_angles_radians = iau2000b_radians(tt)
+    return tt
 
-    return results
 
+def _range_rate_km_s(pos: np.ndarray, vel: np.ndarray) -> np.ndarray:
+    """Radial velocity (pos . vel) / |pos| for (3,) or (3, N) position/velocity arrays."""
+    pos_norm = np.sqrt(np.sum(pos * pos, axis=0))
+    dot = np.sum(pos * vel, axis=0)
+    safe = np.where(pos_norm != 0.0, pos_norm, 1.0)
+    return np.where(pos_norm != 0.0, dot / safe, 0.0)
 
-def current_state(tle: List[str], dt: datetime, gs_lat: float, gs_lon: float, gs_alt_m: float = 0.0) -> Dict:
-    """Compute instantaneous satellite state relative to a ground station at a given datetime.
 
-    Returns dict with keys: time, sublat, sublon, subalt_m, azdeg, eldeg, range_km, range_rate_km_s
-    """
-    ts = load.timescale()
-    name, line1, line2 = tle
-    sat = EarthSatellite(line1, line2, name, ts)
-    tt = ts.utc(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second + dt.microsecond / 1e6)
+def _state_arrays(sat: EarthSatellite, observer, tt) -> Dict[str, np.ndarray]:
+    """Evaluate subpoint, az/el, range and range-rate for every instant of ``tt`` in one pass."""
     geocentric = sat.at(tt)
     subpoint = wgs84.subpoint(geocentric)
-
-    observer = wgs84.latlon(gs_lat, gs_lon, elevation_m=gs_alt_m)
-    observer_at = observer.at(tt)
-    topocentric = geocentric - observer_at
+    topocentric = geocentric - observer.at(tt)
     alt, az, distance = topocentric.altaz()
 
-    pos = topocentric.position.km
-    vel = topocentric.velocity.km_per_s
-    from math import sqrt
-
-    pos_norm = sqrt(pos[0] ** 2 + pos[1] ** 2 + pos[2] ** 2)
-    range_rate_km_s = 0.0
-    if pos_norm != 0.0:
-        range_rate_km_s = (pos[0] * vel[0] + pos[1] * vel[1] + pos[2] * vel[2]) / pos_norm
-
     return {
-        "time": dt,
         "sublat": subpoint.latitude.degrees,
         "sublon": subpoint.longitude.degrees,
         "subalt_m": subpoint.elevation.m,
         "azdeg": az.degrees,
         "eldeg": alt.degrees,
         "range_km": distance.km,
-        "range_rate_km_s": range_rate_km_s,
+        "range_rate_km_s": _range_rate_km_s(topocentric.position.km, topocentric.velocity.km_per_s),
     }
 
 
+class SatelliteTracker:
+    """Long-lived tracking context for one TLE and one ground station.
+
+    Parses the TLE into an ``EarthSatellite`` and builds the observer topos once, so
+    each tick only pays for the propagation itself. Per-call latency is recorded in
+    ``last_tick_s`` / ``max_tick_s`` / ``total_tick_s`` / ``ticks``.
+    """
+
+    def __init__(self, tle: List[str], gs_lat: float, gs_lon: float, gs_alt_m: float = 0.0):
+        self.tle = list(tle)
+        self.gs = (float(gs_lat), float(gs_lon), float(gs_alt_m))
+        self.ts = _timescale()
+        name, line1, line2 = self.tle
+        self.sat = EarthSatellite(line1, line2, name, self.ts)
+        self.observer = wgs84.latlon(gs_lat, gs_lon, elevation_m=gs_alt_m)
+        self._relative = self.sat - self.observer
+
+        self.ticks = 0
+        self.last_tick_s = 0.0
+        self.max_tick_s = 0.0
+        self.total_tick_s = 0.0
+
+    def states(self, start_dt: datetime, offsets_s) -> Dict[str, np.ndarray]:
+        """Columnar state at ``start_dt`` + each of ``offsets_s`` seconds."""
+        return _state_arrays(self.sat, self.observer, _utc_times(self.ts, start_dt, offsets_s))
+
+    def elevation(self, start_dt: datetime, offsets_s) -> np.ndarray:
+        """Elevation only (deg); skips the subpoint computation."""
+        alt, _, _ = self._relative.at(_utc_times(self.ts, start_dt, offsets_s)).altaz()
+        return alt.degrees
+
+    def state_at(self, dt: datetime) -> Dict:
+        """Instantaneous state dict, same keys as ``current_state``."""
+        t0 = time.perf_counter()
+        st = {"time": dt}
+        st.update((k, float(v)) for k, v in self.states(dt, 0.0).items())
+
+        dt_s = time.perf_counter() - t0
+        self.ticks += 1
+        self.last_tick_s = dt_s
+        self.total_tick_s += dt_s
+        self.max_tick_s = max(self.max_tick_s, dt_s)
+        return st
+
+    def tick_stats(self) -> Dict:
+        """Latency summary of ``state_at`` calls in milliseconds."""
+        mean = self.total_tick_s / self.ticks if self.ticks else 0.0
+        return {
+            "ticks": self.ticks,
+            "last_ms": self.last_tick_s * 1e3,
+            "mean_ms": mean * 1e3,
+            "max_ms": self.max_tick_s * 1e3,
+        }
+
+
+@lru_cache(maxsize=8)
+def _cached_tracker(tle: tuple, gs_lat: float, gs_lon: float, gs_alt_m: float) -> SatelliteTracker:
+    return SatelliteTracker(list(tle), gs_lat, gs_lon, gs_alt_m)
+
+
+def propagate_arrays(tle: List[str], start_dt: datetime, minutes: int, step_s: int, gs_lat: float, gs_lon: float, gs_alt_m: float = 0.0) -> Dict[str, np.ndarray]:
+    """Propagate TLE over a time grid and return a columnar result.
+
+    Builds one Skyfield time array and calls ``sat.at()`` once for the whole grid.
+    Returns a dict with keys: t_s (seconds since start_dt), time (list of datetime),
+    and float64 arrays sublat, sublon, subalt_m, azdeg, eldeg, range_km, range_rate_km_s.
+    """
+    tracker = _cached_tracker(tuple(tle), float(gs_lat), float(gs_lon), float(gs_alt_m))
+
+    steps = int((minutes * 60) / step_s)
+    offsets = np.arange(steps + 1, dtype=np.float64) * step_s
+    cols = tracker.states(start_dt, offsets)
+    cols["t_s"] = offsets
+    cols["time"] = [start_dt + timedelta(seconds=float(o)) for o in offsets]
+    return cols
+
+
+def propagate_tle(tle: List[str], start_dt: datetime, minutes: int, step_s: int, gs_lat: float, gs_lon: float, gs_alt_m: float = 0.0) -> List[Dict]:
+    """Propagate TLE for a time range and return positions and az/el for a ground station.
+
+    Returns a list of dicts with keys: time (datetime), sublat, sublon, subalt_m, azdeg, eldeg, range_km, range_rate_km_s
+    """
+    cols = propagate_arrays(tle, start_dt, minutes, step_s, gs_lat, gs_lon, gs_alt_m)
+    keys = ("sublat", "sublon", "subalt_m", "azdeg", "eldeg", "range_km", "range_rate_km_s")
+    rows = zip(*(cols[k].tolist() for k in keys))
+    return [dict(zip(keys, row), time=t) for t, row in zip(cols["time"], rows)]
+
+
+def current_state(tle: List[str], dt: datetime, gs_lat: float, gs_lon: float, gs_alt_m: float = 0.0) -> Dict:
+    """Compute instantaneous satellite state relative to a ground station at a given datetime.
+
+    Returns dict with keys: time, sublat, sublon, subalt_m, azdeg, eldeg, range_km, range_rate_km_s
+
+    Parsed satellites and observers are cached per (TLE, ground station); callers on a
+    hot path should hold a ``SatelliteTracker`` directly.
+    """
+    return _cached_tracker(tuple(tle), float(gs_lat), float(gs_lon), float(gs_alt_m)).state_at(dt)
+
+
 from datetime import timezone, timedelta
 
 NEPAL_TZ = timezone(timedelta(hours=5, minutes=45), name="NPT")
@@ -107,6 +168,68 @@ def to_npt(dt):
         dt = dt.replace(tzinfo=timezone.utc)
     return dt.astimezone(NEPAL_TZ)
 
+def _find_pass_windows(elev_fn, span_s: float, step_s: float, min_el_deg: float = 0.0, precision_s: float = 0.01,
+                       grid_el: Optional[np.ndarray] = None) -> List[tuple]:
+    """Locate intervals where ``elev_fn`` is above ``min_el_deg`` within [0, span_s].
+
+    ``elev_fn`` maps an array of offsets (s) to elevations (deg). A coarse grid at
+    ``step_s`` brackets every horizon crossing, all brackets are then bisected together
+    (one ``elev_fn`` call per iteration) to ``precision_s``, and the culmination is
+    refined by successive parabolic interpolation. Passes shorter than ``step_s`` can
+    fall between grid points and be missed. ``grid_el`` supplies the coarse-grid
+    elevations when the caller already has them (e.g. from a fleet-wide scan).
+
+    Returns a list of (aos_s, los_s, tca_s, max_el_deg) tuples.
+    """
+    steps = int(span_s / step_s)
+    grid = np.arange(steps + 1, dtype=np.float64) * step_s
+    el = elev_fn(grid) if grid_el is None else grid_el
+    above = el > min_el_deg
+    if not above.any():
+        return []
+
+    edges = np.flatnonzero(above[1:] != above[:-1])
+    starts = [0] if above[0] else []
+    ends = []
+    for i in edges:
+        if above[i + 1]:
+            starts.append(i + 1)
+        else:
+            ends.append(i)
+    if above[-1]:
+        ends.append(steps)
+
+    # Bisect every horizon crossing at once.
+    lo = grid[edges]
+    hi = grid[edges + 1]
+    lo_above = above[edges]
+    width = float(step_s)
+    while lo.size and width > precision_s:
+        mid = 0.5 * (lo + hi)
+        same = (elev_fn(mid) > min_el_deg) == lo_above
+        lo = np.where(same, mid, lo)
+        hi = np.where(same, hi, mid)
+        width *= 0.5
+    crossing = dict(zip(edges.tolist(), (0.5 * (lo + hi)).tolist()))
+
+    aos = np.array([crossing.get(i - 1, grid[i]) for i in starts])
+    los = np.array([crossing.get(i, grid[i]) for i in ends])
+
+    # Parabolic refinement of the culmination, all passes together.
+    tca = np.array([grid[a + int(np.argmax(el[a:b + 1]))] for a, b in zip(starts, ends)])
+    h = float(step_s)
+    while h > precision_s:
+        e = elev_fn(np.concatenate([tca - h, tca, tca + h])).reshape(3, -1)
+        denom = e[0] - 2.0 * e[1] + e[2]
+        safe = np.where(denom < 0.0, denom, -1.0)
+        shift = np.where(denom < 0.0, 0.5 * h * (e[0] - e[2]) / safe, 0.0)
+        tca = np.clip(tca + np.clip(shift, -h, h), aos, los)
+        h *= 0.25
+    max_el = elev_fn(tca)
+
+    return list(zip(aos.tolist(), los.tolist(), tca.tolist(), max_el.tolist()))
+
+
 def compute_passes(
     tle: List[str],
     start_dt: datetime,
@@ -114,30 +237,26 @@ def compute_passes(
     gs_lat: float,
     gs_lon: float,
     gs_alt_m: float = 0.0,
-    step_s: int = 30
+    step_s: int = 30,
+    min_el_deg: float = 0.0,
+    precision_s: float = 0.01,
 ):
     """
     Compute passes in UTC. Also attach Nepal-time display fields (NPT).
-    """
-    minutes = hours * 60
-    pts = propagate_tle(
-        tle, start_dt,
-        minutes=minutes, step_s=step_s,
-        gs_lat=gs_lat, gs_lon=gs_lon, gs_alt_m=gs_alt_m
-    )
 
-    passes = []
-    in_pass = False
-    current_pass_pts = []
+    ``step_s`` is only the coarse scan spacing; AOS/LOS are root-found to ``precision_s``
+    against the ``min_el_deg`` mask and TCA is the refined elevation maximum.
+    """
+    tracker = _cached_tracker(tuple(tle), float(gs_lat), float(gs_lon), float(gs_alt_m))
 
-    def _append_pass(pass_pts):
-        aos = pass_pts[0]["time"]
-        los = pass_pts[-1]["time"]
-        max_pt = max(pass_pts, key=lambda x: x.get("eldeg", 0.0))
-        tca = max_pt["time"]
-        max_el = float(max_pt.get("eldeg", 0.0))
-        duration_s = int((los - aos).total_seconds())
+    def elev_fn(offsets):
+        return tracker.elevation(start_dt, offsets)
 
+    passes = []
+    for aos_s, los_s, tca_s, max_el in _find_pass_windows(elev_fn, hours * 3600.0, step_s, min_el_deg, precision_s):
+        aos = start_dt + timedelta(seconds=aos_s)
+        los = start_dt + timedelta(seconds=los_s)
+        tca = start_dt + timedelta(seconds=tca_s)
         passes.append({
             # UTC (for logic / export)
             "aos": aos,
@@ -149,22 +268,8 @@ def compute_passes(
             "los_npt": to_npt(los),
             "tca_npt": to_npt(tca),
 
-            "max_el_deg": max_el,
-            "duration_s": duration_s,
+            "max_el_deg": float(max_el),
+            "duration_s": int(los_s - aos_s),
         })
 
-    for p in pts:
-        el = float(p.get("eldeg", 0.0))
-        if el > 0.0:
-            in_pass = True
-            current_pass_pts.append(p)
-        else:
-            if in_pass and current_pass_pts:
-                _append_pass(current_pass_pts)
-                current_pass_pts = []
-            in_pass = False
-
-    if current_pass_pts:
-        _append_pass(current_pass_pts)
-
     return passes
@@ -0,0 +1,201 @@
+"""Multi-satellite pass prediction and station scheduling.
+
+``compute_catalog_passes`` finds passes for every entry of a ``TLECatalog`` using the
+same coarse-scan + root-finding search as ``compute_passes``, but on the raw SGP4 /
+NumPy fleet engine: one sparse ``SatrecArray`` propagation of the whole fleet rules out
+the stretches of time where a satellite cannot be above the horizon, so the coarse
+grid is only evaluated (and refined) where a pass is possible. ``build_schedule`` then turns the merged pass list into a
+conflict-free station timeline with a sweep line over AOS-sorted passes.
+"""
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+from sgp4.api import SatrecArray
+
+from .catalog import TLECatalog, _dut1_s, _elevation, _itrf_states, _station_frame
+from .propagator import _find_pass_windows, to_npt
+
+POLICIES = ("priority", "max_el")
+
+# satellites x samples per sparse-scan batch; bounds the (n, t, 3) state arrays to ~25 MB each
+_SCAN_ELEMENTS = 1 << 20
+# the sparse scan samples every _SPARSE-th point of the coarse grid
+_SPARSE = 8
+_EARTH_RATE = 7.292115e-5  # rad/s
+_CONE_MARGIN = np.radians(1.0)  # geodetic vs geocentric horizon, ellipsoid
+
+
+def _candidate_mask(satrecs, r: np.ndarray, obs: np.ndarray, n_grid: int, step_s: float,
+                    min_el_deg: float) -> np.ndarray:
+    """
+    (nsat, n_grid) mask of coarse-grid points where a satellite may be above ``min_el_deg``.
+
+    ``r`` holds Earth-fixed positions at every _SPARSE-th grid point. A satellite is only
+    visible inside the cone of central angle lam_max around the station; the central
+    angle changes no faster than the orbital angular rate at perigee plus Earth
+    rotation, so a sample lying a margin m outside the cone rules out every point
+    within m / rate of it. The test is conservative: no pass is lost.
+    """
+    rn = np.linalg.norm(r, axis=-1)
+    rs = float(np.linalg.norm(obs))
+    cos_lam = (r @ obs) / (rn * rs)
+    lam = np.arccos(np.clip(cos_lam, -1.0, 1.0))
+    el_min = np.radians(min_el_deg)
+    r_max = 1.01 * np.nanmax(rn, axis=1, initial=rs)
+    lam_max = np.arccos(np.clip(rs * np.cos(el_min) / r_max, -1.0, 1.0)) - el_min + _CONE_MARGIN
+    margin = lam - lam_max[:, None]  # rad outside the cone (NaN for failed propagation: never excluded)
+
+    n = np.array([s.no_kozai for s in satrecs]) / 60.0  # rad/s
+    e = np.clip(np.array([s.ecco for s in satrecs]), 0.0, 0.99)
+    rate = 1.1 * n * (1.0 + e) ** 2 / (1.0 - e * e) ** 1.5 + _EARTH_RATE
+
+    i = np.arange(n_grid)
+    c0 = i // _SPARSE
+    c1 = np.minimum(c0 + 1, r.shape[1] - 1)
+    d0 = (i % _SPARSE) * step_s
+    d1 = np.where(c1 > c0, (c1 * _SPARSE - i) * step_s, np.inf)
+    with np.errstate(invalid="ignore"):
+        excluded = (margin[:, c0] > rate[:, None] * d0) | (margin[:, c1] > rate[:, None] * d1)
+    return ~excluded
+
+
+def compute_catalog_passes(
+    catalog: TLECatalog,
+    start_dt: datetime,
+    hours: float,
+    gs_lat: float,
+    gs_lon: float,
+    gs_alt_m: float = 0.0,
+    step_s: int = 30,
+    min_el_deg: float = 0.0,
+    precision_s: float = 0.1,
+) -> List[Dict]:
+    """Passes of every catalog entry, merged and sorted by AOS.
+
+    Each dict carries the ``compute_passes`` keys plus ``name`` and ``norad_id``.
+    """
+    dut1 = _dut1_s(start_dt)
+    span_s = hours * 3600.0
+    grid = np.arange(int(span_s / step_s) + 1, dtype=np.float64) * step_s
+    # every _SPARSE-th grid point, padded so the last one is bracketed too
+    sparse = np.arange(-(-(grid.size - 1) // _SPARSE) + 1, dtype=np.float64) * (_SPARSE * step_s)
+    obs = _station_frame(float(gs_lat), float(gs_lon), float(gs_alt_m))[0]
+    batch = max(1, _SCAN_ELEMENTS // sparse.size)
+    passes = []
+    for first in range(0, len(catalog), batch):
+        satrecs = catalog.satrecs[first:first + batch]
+        # sparse scan of the whole batch in one vectorized propagation
+        _, r, _ = _itrf_states(SatrecArray(satrecs), start_dt, sparse, dut1_s=dut1)
+        candidates = _candidate_mask(satrecs, r, obs, grid.size, step_s, min_el_deg)
+        for j in np.flatnonzero(candidates.any(axis=1)):
+            # coarse grid only where the satellite can be up; elsewhere it is known to be below the mask
+            elev_fn = _elevation_fn(satrecs[j], start_dt, dut1, gs_lat, gs_lon, gs_alt_m)
+            grid_el = np.full(grid.size, -90.0)
+            grid_el[candidates[j]] = elev_fn(grid[candidates[j]])
+            if not (grid_el > min_el_deg).any():
+                continue
+            windows = _find_pass_windows(elev_fn, span_s, step_s, min_el_deg, precision_s, grid_el=grid_el)
+            passes.extend(_pass_dicts(catalog, first + int(j), start_dt, windows))
+
+    passes.sort(key=lambda p: p["aos"])
+    return passes
+
+
+def _elevation_fn(satrec, start_dt: datetime, dut1: float, gs_lat: float, gs_lon: float, gs_alt_m: float):
+    def elev_fn(offsets):
+        _, r, _ = _itrf_states(satrec, start_dt, offsets, dut1_s=dut1)
+        return _elevation(r, gs_lat, gs_lon, gs_alt_m)
+    return elev_fn
+
+
+def _pass_dicts(catalog: TLECatalog, i: int, start_dt: datetime, windows) -> List[Dict]:
+    passes = []
+    for aos_s, los_s, tca_s, max_el in windows:
+        aos = start_dt + timedelta(seconds=aos_s)
+        los = start_dt + timedelta(seconds=los_s)
+        tca = start_dt + timedelta(seconds=tca_s)
+        passes.append({
+            "name": catalog.names[i],
+            "norad_id": int(catalog.norad_ids[i]),
+            "aos": aos,
+            "los": los,
+            "tca": tca,
+            "aos_npt": to_npt(aos),
+            "los_npt": to_npt(los),
+            "tca_npt": to_npt(tca),
+            "max_el_deg": float(max_el),
+            "duration_s": int(los_s - aos_s),
+        })
+    return passes
+
+
+def build_schedule(
+    passes: List[Dict],
+    priorities: Optional[Dict] = None,
+    policy: str = "priority",
+    min_gap_s: float = 0.0,
+) -> Dict[str, List[Dict]]:
+    """Resolve overlapping passes into a single-antenna station schedule.
+
+    ``priorities`` maps satellite name or NORAD ID to a number (higher wins, default 0).
+    ``policy`` orders competing passes: "priority" (priority, then max elevation) or
+    "max_el" (max elevation, then priority). ``min_gap_s`` is the turnaround the rotor
+    needs between two scheduled passes.
+
+    A sweep line over AOS-sorted passes splits the timeline into conflict groups (runs
+    of passes that overlap, gap included); only passes inside one group are compared,
+    so the cost is O(n log n) rather than pairwise.
+
+    Returns {"schedule": [...], "rejected": [...]} of pass dict copies, both sorted by
+    AOS, with ``priority`` filled in and ``conflicts_with`` naming the pass that won.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown schedule policy {policy!r}; expected one of {POLICIES}")
+    priorities = priorities or {}
+    gap = timedelta(seconds=float(min_gap_s))
+
+    def _priority(p):
+        if p.get("norad_id") in priorities:
+            return float(priorities[p["norad_id"]])
+        return float(priorities.get(p.get("name"), 0.0))
+
+    def _rank(p):
+        if policy == "max_el":
+            return (-p["max_el_deg"], -p["priority"], p["aos"])
+        return (-p["priority"], -p["max_el_deg"], p["aos"])
+
+    items = sorted((dict(p, priority=_priority(p)) for p in passes), key=lambda p: p["aos"])
+
+    schedule, rejected = [], []
+    group = []
+    group_end = None
+    for p in items + [None]:
+        if p is not None and (group_end is None or p["aos"] < group_end + gap):
+            group.append(p)
+            group_end = p["los"] if group_end is None else max(group_end, p["los"])
+            continue
+
+        # Close the conflict group: accept greedily in rank order.
+        starts, taken = [], []
+        for cand in sorted(group, key=_rank):
+            k = bisect_left(starts, cand["aos"])
+            clash = None
+            if k > 0 and taken[k - 1]["los"] + gap > cand["aos"]:
+                clash = taken[k - 1]
+            elif k < len(taken) and cand["los"] + gap > taken[k]["aos"]:
+                clash = taken[k]
+            if clash is None:
+                starts.insert(k, cand["aos"])
+                taken.insert(k, cand)
+            else:
+                cand["conflicts_with"] = clash.get("name")
+                rejected.append(cand)
+        schedule.extend(taken)
+
+        group = [p] if p is not None else []
+        group_end = p["los"] if p is not None else None
+
+    rejected.sort(key=lambda p: p["aos"])
+    return {"schedule": schedule, "rejected": rejected}
@@ -1,5 +1,12 @@
 """Doppler calculation utilities and a simple controller to apply corrections to an SDR device."""
-from typing import List
+from datetime import datetime
+from typing import Callable, List, Optional
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
 
 
 SPEED_OF_LIGHT = 299792458.0  # m/s
@@ -40,3 +47,171 @@ class DopplerController:
         new_freq = self.center + delta
         self.sdr.set_center_frequency(new_freq)
         return new_freq
+
+
+class DopplerWorker(threading.Thread):
+    """Retunes an SDR from a range-rate source at a fixed rate, off the GUI thread.
+
+    ``range_rate_fn(dt)`` returns the range rate (km/s) at UTC ``dt`` (e.g. a
+    ``PassEphemeris.range_rate_at``) or None when unknown. The tuner is only touched
+    when the target moves at least ``min_step_hz`` from the last applied frequency.
+    ``latest()`` is a snapshot for display; ``stats()`` reports loop timing.
+    """
+
+    def __init__(self, sdr_device, center_freq_hz: float, range_rate_fn: Callable[[datetime], Optional[float]],
+                 rate_hz: float = 10.0, min_step_hz: float = 10.0,
+                 clock: Optional[Callable[[], datetime]] = None):
+        super().__init__(daemon=True)
+        self.sdr = sdr_device
+        self.center = float(center_freq_hz)
+        self.range_rate_fn = range_rate_fn
+        self.rate_hz = float(rate_hz)
+        self.min_step_hz = float(min_step_hz)
+        self.clock = clock or datetime.utcnow
+        self._stop_evt = threading.Event()
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._applied_hz = None
+
+        self.updates = 0
+        self.retunes = 0
+        self.late = 0
+        self.last_update_s = 0.0
+        self.max_update_s = 0.0
+        self.total_update_s = 0.0
+
+    def step(self) -> Optional[float]:
+        """One correction cycle; returns the applied frequency (Hz) or None if nothing was known."""
+        now = self.clock()
+        rr = self.range_rate_fn(now)
+        if rr is None:
+            return None
+        target = self.center + freq_correction_hz(self.center, rr)
+        if self._applied_hz is None or abs(target - self._applied_hz) >= self.min_step_hz:
+            self.sdr.set_center_frequency(target)
+            self._applied_hz = target
+            self.retunes += 1
+        with self._lock:
+            self._latest = {"time": now, "range_rate_km_s": float(rr), "target_hz": target,
+                            "tuned_hz": self._applied_hz}
+        return self._applied_hz
+
+    def run(self):
+        period = 1.0 / self.rate_hz
+        deadline = time.perf_counter()
+        while not self._stop_evt.is_set():
+            t0 = time.perf_counter()
+            try:
+                self.step()
+            except Exception:
+                logger.exception("DopplerWorker: correction failed")
+            dt = time.perf_counter() - t0
+            self.updates += 1
+            self.last_update_s = dt
+            self.total_update_s += dt
+            self.max_update_s = max(self.max_update_s, dt)
+
+            deadline += period
+            wait = deadline - time.perf_counter()
+            if wait < 0.0:
+                # overran the period: count it and re-anchor instead of bursting to catch up
+                self.late += 1
+                deadline = time.perf_counter()
+                wait = 0.0
+            self._stop_evt.wait(wait)
+
+    def stop(self):
+        self._stop_evt.set()
+
+    def set_center(self, center_freq_hz: float):
+        """Change the nominal downlink; the next cycle retunes unconditionally."""
+        self.center = float(center_freq_hz)
+        self._applied_hz = None
+
+    def latest(self) -> dict:
+        with self._lock:
+            return dict(self._latest)
+
+    def stats(self) -> dict:
+        n = self.updates
+        return {
+            "updates": n,
+            "retunes": self.retunes,
+            "late": self.late,
+            "last_ms": self.last_update_s * 1e3,
+            "mean_ms": (self.total_update_s / n * 1e3) if n else 0.0,
+            "max_ms": self.max_update_s * 1e3,
+        }
+
+
+class DigitalDopplerCorrector:
+    """Doppler correction by NCO mixing inside the IQ stream.
+
+    Called on every block from ``SDRStreamer``. The downlink is shifted back to 0 Hz
+    baseband with a phase-continuous NCO; the hardware is only retuned (to the current
+    Doppler-shifted frequency) when the residual offset exceeds ``max_offset_hz``, i.e.
+    when the signal would drift toward the edge of the captured passband.
+    """
+
+    def __init__(self, sdr_device, center_freq_hz: float, sample_rate: float,
+                 range_rate_fn: Callable[[datetime], Optional[float]], max_offset_hz: Optional[float] = None,
+                 clock: Optional[Callable[[], datetime]] = None):
+        from nast_gs.processing.nco import NCO
+
+        self.sdr = sdr_device
+        self.center = float(center_freq_hz)
+        self.sample_rate = float(sample_rate)
+        self.range_rate_fn = range_rate_fn
+        self.max_offset_hz = float(max_offset_hz) if max_offset_hz is not None else 0.25 * self.sample_rate
+        self.clock = clock or datetime.utcnow
+        self.nco = NCO(self.sample_rate)
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._offset_hz = None
+
+        try:
+            self.hw_freq_hz = float(self.sdr.get_center_frequency())
+        except Exception:
+            self.hw_freq_hz = self.center
+
+        self.blocks = 0
+        self.retunes = 0
+
+    def __call__(self, iq):
+        return self.process(iq)
+
+    def process(self, iq):
+        """Correct one IQ block; returns the shifted block (the input if range rate is unknown)."""
+        rr = self.range_rate_fn(self.clock())
+        if rr is None:
+            return iq
+        observed = self.center + freq_correction_hz(self.center, rr)
+        offset = observed - self.hw_freq_hz
+
+        # this block was captured at the current hardware frequency; shift it (ramping from the
+        # previous block's offset), then retune for the next one if needed
+        start = offset if self._offset_hz is None else self._offset_hz
+        out = self.nco.mix(iq, -start, -offset)
+        self._offset_hz = offset
+        self.blocks += 1
+
+        if abs(offset) > self.max_offset_hz:
+            self.sdr.set_center_frequency(observed)
+            self.hw_freq_hz = observed
+            self._offset_hz = 0.0
+            self.retunes += 1
+
+        with self._lock:
+            self._latest = {"range_rate_km_s": float(rr), "target_hz": observed, "tuned_hz": observed,
+                            "hw_freq_hz": self.hw_freq_hz, "nco_offset_hz": self._offset_hz}
+        return out
+
+    def set_center(self, center_freq_hz: float):
+        self.center = float(center_freq_hz)
+
+    def latest(self) -> dict:
+        with self._lock:
+            return dict(self._latest)
+
+    def stats(self) -> dict:
+        return {"blocks": self.blocks, "retunes": self.retunes}
@@ -0,0 +1,136 @@
+"""Preallocated single-producer / multi-consumer IQ ring buffer.
+
+The streamer thread writes blocks into one fixed complex64 array; each consumer
+(spectrum, demod, recording) owns a ``RingReader`` with its own cursor and gets
+zero-copy views of the samples. The producer never blocks or waits for readers:
+a reader that falls more than ``capacity`` samples behind skips forward to the
+oldest retained sample and counts the overrun.
+
+The first ``max_block`` samples are mirrored past the end of the array, so any
+read of up to ``max_block`` samples is one contiguous view even across the wrap.
+Only the producer mutates state and the write counter is published after the
+copy, so no lock is taken on the data path (a Condition is used only to wake
+readers that choose to wait).
+"""
+import threading
+from typing import Optional
+
+import numpy as np
+
+
+class IQRingBuffer:
+    def __init__(self, capacity: int, max_block: int = 65536, dtype=np.complex64):
+        if max_block > capacity:
+            raise ValueError("max_block must not exceed capacity")
+        self.capacity = int(capacity)
+        self.max_block = int(max_block)
+        self._buf = np.zeros(self.capacity + self.max_block, dtype=dtype)
+        self._written = 0  # total samples ever written (monotonic)
+        self._cond = threading.Condition()
+
+    @property
+    def written(self) -> int:
+        return self._written
+
+    def write(self, samples) -> int:
+        """Append a block (copied into the ring); returns the new total sample count."""
+        x = np.asarray(samples, dtype=self._buf.dtype).reshape(-1)
+        n = x.shape[0]
+        if n > self.capacity:
+            x = x[-self.capacity:]
+            self._written += n - self.capacity
+            n = self.capacity
+
+        cap, m = self.capacity, self.max_block
+        pos = self._written % cap
+        first = min(n, cap - pos)
+        self._buf[pos:pos + first] = x[:first]
+        if first < n:
+            self._buf[:n - first] = x[first:]
+
+        # keep the mirror of [0, max_block) at [cap, cap + max_block) current
+        if pos < m:
+            hi = min(pos + first, m)
+            self._buf[cap + pos:cap + hi] = x[:hi - pos]
+        if first < n:
+            hi = min(n - first, m)
+            self._buf[cap:cap + hi] = x[first:first + hi]
+
+        self._written += n
+        with self._cond:
+            self._cond.notify_all()
+        return self._written
+
+    def latest(self, n: int) -> np.ndarray:
+        """Zero-copy view of the newest ``n`` (<= max_block) samples."""
+        n = min(int(n), self.max_block, self._written)
+        start = (self._written - n) % self.capacity
+        return self._buf[start:start + n]
+
+    def view(self, start: int, n: int) -> np.ndarray:
+        """Zero-copy view of ``n`` (<= max_block) samples starting at absolute index ``start``."""
+        s = start % self.capacity
+        return self._buf[s:s + n]
+
+    def reader(self, from_start: bool = False) -> "RingReader":
+        """New consumer cursor, positioned at the current write position (or the oldest sample)."""
+        return RingReader(self, from_start=from_start)
+
+    def wait(self, target: int, timeout: Optional[float] = None) -> bool:
+        """Block until ``written`` reaches ``target``; returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._written >= target, timeout)
+
+
+class RingReader:
+    """One consumer's cursor into an ``IQRingBuffer``."""
+
+    def __init__(self, ring: IQRingBuffer, from_start: bool = False):
+        self.ring = ring
+        self.cursor = max(0, ring.written - ring.capacity) if from_start else ring.written
+        self.overruns = 0       # number of times this reader was lapped
+        self.dropped = 0        # samples skipped because of overruns
+        self.samples_read = 0
+
+    def available(self) -> int:
+        self._check_overrun()
+        return self.ring.written - self.cursor
+
+    def _check_overrun(self):
+        lag = self.ring.written - self.cursor
+        if lag > self.ring.capacity:
+            skip = lag - self.ring.capacity
+            self.cursor += skip
+            self.dropped += skip
+            self.overruns += 1
+
+    def read(self, n: Optional[int] = None) -> np.ndarray:
+        """
+        Zero-copy view of up to ``n`` (default/max ``max_block``) unread samples; empty if none.
+
+        The view aliases the ring and is only valid until the producer laps it, so
+        consumers that keep samples around (e.g. recording) should copy.
+        """
+        avail = self.available()
+        n = self.ring.max_block if n is None else min(int(n), self.ring.max_block)
+        n = min(n, avail)
+        out = self.ring.view(self.cursor, n)
+        self.cursor += n
+        self.samples_read += n
+        return out
+
+    def wait(self, n: int, timeout: Optional[float] = None) -> bool:
+        """Block until at least ``n`` unread samples are available."""
+        return self.ring.wait(self.cursor + n, timeout)
+
+    def skip_to_latest(self, keep: int = 0):
+        """Drop everything but the newest ``keep`` samples (for consumers that only want fresh data)."""
+        self.cursor = max(self.cursor, self.ring.written - int(keep))
+
+    def stats(self) -> dict:
+        return {
+            "lag": self.ring.written - self.cursor,
+            "samples_read": self.samples_read,
+            "overruns": self.overruns,
+            "dropped": self.dropped,
+        }
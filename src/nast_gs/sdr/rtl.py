@@ -1,7 +1,9 @@
 """RTL-SDR device wrapper using pyrtlsdr."""
 
 import logging
-from typing import Optional
+import threading
+import time
+from typing import Callable, Optional
 
 import numpy as np
 
@@ -16,6 +18,21 @@ except Exception:
     RtlSdr = None
     LibUSBError = Exception
 
+# uint8 I/Q byte -> float32 in [-1, 1]; indexing with the raw bytes converts a whole
+# buffer in one vectorized pass (interleaved I/Q lands directly in complex64 layout)
+_U8_TO_F32 = ((np.arange(256, dtype=np.float32) - 127.5) / 127.5).astype(np.float32)
+
+
+def bytes_to_iq(raw, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Convert interleaved uint8 I/Q bytes to complex64, into ``out`` when given."""
+    raw = np.frombuffer(raw, dtype=np.uint8) if not isinstance(raw, np.ndarray) else raw.view(np.uint8)
+    n = raw.shape[0] // 2
+    if out is None or out.shape[0] < n:
+        out = np.empty(n, dtype=np.complex64)
+    out = out[:n]
+    np.take(_U8_TO_F32, raw[:2 * n], out=out.view(np.float32))
+    return out
+
 
 class RtlSdrDevice(SDRDevice):
     def __init__(
@@ -60,6 +77,17 @@ class RtlSdrDevice(SDRDevice):
 
         self._running = False
 
+        # async streaming state
+        self._stream_thread: Optional[threading.Thread] = None
+        self._stream_cb: Optional[Callable[[np.ndarray], None]] = None
+        self._stream_buf = np.zeros(0, dtype=np.complex64)
+        self._stream_t_last = 0.0
+        self.stream_blocks = 0
+        self.stream_samples = 0
+        self.dropped_samples = 0
+        self.late_blocks = 0
+        self.callback_max_s = 0.0
+
     def set_sample_rate(self, rate: float):
         self._sr = float(rate)
         self.sdr.sample_rate = self._sr
@@ -83,8 +111,8 @@ class RtlSdrDevice(SDRDevice):
             self.start()
 
         try:
-            iq = self.sdr.read_samples(int(num_samples))
-            return np.asarray(iq, dtype=np.complex64)
+            raw = self.sdr.read_bytes(2 * int(num_samples))
+            return bytes_to_iq(raw)
 
         except LibUSBError as e:
             self._running = False
@@ -94,7 +122,86 @@ class RtlSdrDevice(SDRDevice):
             self._running = False
             raise
 
+    # ---------------- async streaming ----------------
+
+    def start_stream(self, callback: Callable[[np.ndarray], None], block_size: int = 16384):
+        """
+        Stream with librtlsdr's async API on a background thread.
+
+        ``callback(iq)`` gets each block as complex64; the array is a reused buffer,
+        so copy (or write it into a ring) before returning. The USB transfer queue
+        keeps running between callbacks, so there are no gaps as long as the callback
+        keeps up. Gaps that do occur are estimated from callback timing and counted
+        in ``dropped_samples`` / ``late_blocks``.
+        """
+        if self._stream_thread is not None:
+            raise RuntimeError("RTL-SDR stream already running")
+        if not self._running:
+            self.start()
+        # librtlsdr wants transfers in multiples of 512 bytes
+        nbytes = max(512, (2 * int(block_size) // 512) * 512)
+        self._stream_cb = callback
+        self._stream_buf = np.empty(nbytes // 2, dtype=np.complex64)
+        self._stream_t_last = 0.0
+        self.stream_blocks = self.stream_samples = self.dropped_samples = self.late_blocks = 0
+        self.callback_max_s = 0.0
+
+        def _run():
+            try:
+                self.sdr.read_bytes_async(self._on_async_bytes, nbytes)
+            except Exception as e:
+                logger.error("RTL-SDR async stream ended: %s", e)
+            finally:
+                self._stream_thread = None
+
+        self._stream_thread = threading.Thread(target=_run, daemon=True)
+        self._stream_thread.start()
+        logger.info("RtlSdrDevice: async stream started (%d bytes/transfer)", nbytes)
+
+    def _on_async_bytes(self, raw, context=None):
+        t0 = time.perf_counter()
+        iq = bytes_to_iq(raw, self._stream_buf)
+        n = iq.shape[0]
+
+        if self._stream_t_last:
+            # a gap well beyond one block's duration means transfers were lost
+            expected = (t0 - self._stream_t_last) * self._sr
+            if expected > 2.0 * n:
+                self.late_blocks += 1
+                self.dropped_samples += int(expected - n)
+        self._stream_t_last = t0
+
+        self.stream_blocks += 1
+        self.stream_samples += n
+        cb = self._stream_cb
+        if cb is not None:
+            cb(iq)
+        self.callback_max_s = max(self.callback_max_s, time.perf_counter() - t0)
+
+    def stop_stream(self):
+        th = self._stream_thread
+        if th is None:
+            return
+        self._stream_cb = None
+        try:
+            self.sdr.cancel_read_async()
+        except Exception:
+            pass
+        th.join(timeout=2.0)
+        self._stream_thread = None
+        logger.info("RtlSdrDevice: async stream stopped")
+
+    def stream_stats(self) -> dict:
+        return {
+            "blocks": self.stream_blocks,
+            "samples": self.stream_samples,
+            "dropped_samples": self.dropped_samples,
+            "late_blocks": self.late_blocks,
+            "callback_max_ms": self.callback_max_s * 1e3,
+        }
+
     def stop(self):
+        self.stop_stream()
         self._running = False
         try:
             self.sdr.close()
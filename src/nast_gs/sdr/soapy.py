@@ -2,6 +2,10 @@
 import logging
 from typing import List, Optional
 
+import numpy as np
+
+from .device import SDRDevice
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -22,24 +26,113 @@ def list_soapy_devices() -> List[dict]:
     return results
 
 
-class SoapyDevice:
-    def __init__(self, args: Optional[dict] = None):
+class SoapyDevice(SDRDevice):
+    """
+    SoapySDR RX device with CF32 streaming.
+
+    start() sets up and activates an RX stream; read_samples() fills a preallocated
+    complex64 buffer with readStream calls of at most ``mtu`` samples. Overflows
+    (samples lost in the driver) and timeouts are counted and skipped rather than
+    aborting the stream; see stream_stats().
+    """
+
+    def __init__(
+        self,
+        args: Optional[dict] = None,
+        channel: int = 0,
+        block_size: int = 65536,
+        mtu: Optional[int] = None,
+        timeout_s: float = 0.1,
+        stream_args: Optional[dict] = None,
+    ):
         if SoapySDR is None:
             raise RuntimeError("SoapySDR not available; install soapysdr and modules")
         self.dev = Device(args or {})
+        self.channel = int(channel)
+        self.block_size = int(block_size)
+        self.mtu = int(mtu) if mtu else None
+        self.timeout_us = int(timeout_s * 1e6)
+        self.stream_args = dict(stream_args or {})
+
+        self._stream = None
+        self._buf = np.zeros(0, dtype=np.complex64)
+        self.reads = 0
+        self.samples = 0
+        self.overflows = 0
+        self.timeouts = 0
+        self.errors = 0
 
     def set_center_frequency(self, freq_hz: float):
         # set for RX channel 0
-        self.dev.setFrequency(SoapySDR.SOAPY_SDR_RX, 0, float(freq_hz))
+        self.dev.setFrequency(SoapySDR.SOAPY_SDR_RX, self.channel, float(freq_hz))
 
     def get_center_frequency(self) -> float:
-        return float(self.dev.getFrequency(SoapySDR.SOAPY_SDR_RX, 0))
+        return float(self.dev.getFrequency(SoapySDR.SOAPY_SDR_RX, self.channel))
 
     def set_sample_rate(self, rate: float):
-        self.dev.setSampleRate(SoapySDR.SOAPY_SDR_RX, 0, float(rate))
+        self.dev.setSampleRate(SoapySDR.SOAPY_SDR_RX, self.channel, float(rate))
 
     def start(self):
-        logger.info("SoapyDevice start called (streaming not implemented in wrapper)")
+        if self._stream is not None:
+            return
+        self._stream = self.dev.setupStream(
+            SoapySDR.SOAPY_SDR_RX, SoapySDR.SOAPY_SDR_CF32, [self.channel], self.stream_args
+        )
+        driver_mtu = int(self.dev.getStreamMTU(self._stream))
+        self.mtu = min(self.mtu, driver_mtu) if self.mtu else driver_mtu
+        # read blocks are whole MTUs so every readStream call can be served in full
+        self.block_size = max(self.mtu, (self.block_size // self.mtu) * self.mtu)
+        self._buf = np.zeros(self.block_size, dtype=np.complex64)
+        self.dev.activateStream(self._stream)
+        logger.info("SoapyDevice: stream active (mtu=%d, block=%d)", self.mtu, self.block_size)
+
+    def read_samples(self, num_samples: int):
+        """
+        Read up to ``num_samples`` (capped at block_size) into the reusable buffer.
+
+        The returned array is a view of that buffer and is overwritten by the next
+        call. It may be shorter than requested if the driver timed out.
+        """
+        if self._stream is None:
+            self.start()
+        n = min(int(num_samples), self.block_size)
+        filled = 0
+        while filled < n:
+            sr = self.dev.readStream(self._stream, [self._buf[filled:]], min(self.mtu, n - filled),
+                                     timeoutUs=self.timeout_us)
+            ret = sr.ret
+            if ret > 0:
+                filled += ret
+                self.reads += 1
+            elif ret == SoapySDR.SOAPY_SDR_OVERFLOW:
+                # driver dropped samples; keep going with fresh data
+                self.overflows += 1
+            elif ret == SoapySDR.SOAPY_SDR_TIMEOUT:
+                self.timeouts += 1
+                break
+            else:
+                self.errors += 1
+                raise RuntimeError(f"SoapySDR readStream failed: {SoapySDR.errToStr(ret)}")
+        self.samples += filled
+        return self._buf[:filled]
+
+    def stream_stats(self) -> dict:
+        return {
+            "reads": self.reads,
+            "samples": self.samples,
+            "overflows": self.overflows,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "mtu": self.mtu,
+            "block_size": self.block_size,
+        }
 
     def stop(self):
-        logger.info("SoapyDevice stop called")
+        if self._stream is not None:
+            try:
+                self.dev.deactivateStream(self._stream)
+                self.dev.closeStream(self._stream)
+            except Exception as e:
+                logger.warning("SoapyDevice: closing stream failed: %s", e)
+            self._stream = None
+        logger.info("SoapyDevice: stopped")
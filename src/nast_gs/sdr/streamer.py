@@ -2,17 +2,24 @@
 import threading
 import time
 import numpy as np
-import queue
+
+from .ringbuffer import IQRingBuffer
 
 
 class SDRStreamer(threading.Thread):
-    def __init__(self, sdr_device, sample_rate: float = 2.4e6, block_size: int = 16384):
+    def __init__(self, sdr_device, sample_rate: float = 2.4e6, block_size: int = 16384,
+                 buffer_seconds: float = 1.0):
         super().__init__(daemon=True)
         self.sdr = sdr_device
         self.sample_rate = sample_rate
         self.block_size = block_size
         self._stop_evt = threading.Event()
-        self.out_q = queue.Queue(maxsize=10)
+        # consumers attach with self.ring.reader(); the producer never blocks on them
+        max_block = max(65536, int(block_size))
+        self.ring = IQRingBuffer(max(int(sample_rate * buffer_seconds), 4 * max_block), max_block=max_block)
+        self.read_errors = 0
+        # optional per-block IQ processor (e.g. DigitalDopplerCorrector); may be swapped at runtime
+        self.corrector = None
 
     def run(self):
         try:
@@ -20,15 +27,40 @@ class SDRStreamer(threading.Thread):
         except Exception:
             pass
 
+        # Devices with a callback stream (e.g. RTL-SDR async) push blocks to us; others are polled.
+        start_stream = getattr(self.sdr, "start_stream", None)
+        if callable(start_stream):
+            try:
+                start_stream(self._on_stream_block, self.block_size)
+                self._stop_evt.wait()
+                return
+            except Exception:
+                pass
+
         while not self._stop_evt.is_set():
             try:
-                samples = self.sdr.read_samples(self.block_size)
-                self.out_q.put(samples, timeout=1.0)
+                self._publish(self.sdr.read_samples(self.block_size))
             except Exception:
+                self.read_errors += 1
                 time.sleep(0.1)
 
+    def _on_stream_block(self, samples):
+        try:
+            self._publish(samples)
+        except Exception:
+            self.read_errors += 1
+
+    def _publish(self, samples):
+        corrector = self.corrector
+        if corrector is not None:
+            samples = corrector(samples)
+        self.ring.write(samples)
+
     def stop(self):
         self._stop_evt.set()
+        # let an in-flight read return before the device closes its stream underneath it
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout=1.0)
         try:
             self.sdr.stop()
         except Exception:
@@ -0,0 +1,250 @@
+"""Offline map support: an MBTiles (SQLite) tile store, region prefetch and bundled Leaflet.
+
+Tiles are kept in the standard MBTiles layout (``tiles`` table, TMS row order),
+so the cache file can also be opened by other map tools or built by them. The
+map view serves tiles and Leaflet from here through its own URL scheme, so a
+station without connectivity still gets a working map.
+"""
+import logging
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TILE_URL = "https://tile.openstreetmap.org/{z}/{x}/{y}.png"
+USER_AGENT = "NAST-Geo-Suite/0.1 (ground station map tile cache)"
+
+# OSM tile usage policy: no bulk prefetching from tile.openstreetmap.org. Small regions for a
+# station are tolerated; anything larger needs a tile server that allows it (--url).
+OSM_MAX_TILES = 1000
+OSM_MAX_TILES_HIGH_ZOOM = 250  # tiles at zoom >= OSM_HIGH_ZOOM
+OSM_HIGH_ZOOM = 13
+
+LEAFLET_VERSION = "1.9.3"  # must match the files vendored in assets/leaflet
+LEAFLET_CDN = f"https://unpkg.com/leaflet@{LEAFLET_VERSION}/dist/"
+LEAFLET_FILES = (
+    "leaflet.js",
+    "leaflet.css",
+    "images/layers.png",
+    "images/layers-2x.png",
+    "images/marker-icon.png",
+    "images/marker-icon-2x.png",
+    "images/marker-shadow.png",
+)
+
+MAX_LAT = 85.0511287798  # Web Mercator limit
+
+
+def default_cache_path() -> str:
+    return os.path.expanduser("~/.nast_gs_tiles.mbtiles")
+
+
+def leaflet_dir() -> Path:
+    """Vendored Leaflet directory (src/nast_gs/assets/leaflet, or the PyInstaller equivalent)."""
+    if hasattr(sys, "_MEIPASS"):
+        return Path(sys._MEIPASS) / "nast_gs" / "assets" / "leaflet"
+    return Path(__file__).resolve().parent / "assets" / "leaflet"
+
+
+def lonlat_to_tile(lon: float, lat: float, z: int) -> Tuple[int, int]:
+    """XYZ (slippy map) tile containing (lon, lat) at zoom z."""
+    n = 1 << z
+    lat = max(-MAX_LAT, min(MAX_LAT, lat))
+    x = int((lon + 180.0) / 360.0 * n)
+    r = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(r)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def _x_ranges(west: float, east: float, z: int):
+    x0, _ = lonlat_to_tile(west, 0.0, z)
+    x1, _ = lonlat_to_tile(east, 0.0, z)
+    if west <= east:
+        return [range(x0, x1 + 1)]
+    # box crosses the antimeridian
+    return [range(x0, 1 << z), range(0, x1 + 1)]
+
+
+def tiles_in_bbox(south: float, west: float, north: float, east: float, min_zoom: int,
+                  max_zoom: int) -> Iterator[Tuple[int, int, int]]:
+    """(z, x, y) of every tile covering the box, zoom by zoom; west > east wraps the antimeridian."""
+    for z in range(int(min_zoom), int(max_zoom) + 1):
+        _, y0 = lonlat_to_tile(west, north, z)
+        _, y1 = lonlat_to_tile(west, south, z)
+        for xs in _x_ranges(west, east, z):
+            for x in xs:
+                for y in range(y0, y1 + 1):
+                    yield z, x, y
+
+
+def count_tiles(south: float, west: float, north: float, east: float, min_zoom: int, max_zoom: int) -> int:
+    total = 0
+    for z in range(int(min_zoom), int(max_zoom) + 1):
+        _, y0 = lonlat_to_tile(west, north, z)
+        _, y1 = lonlat_to_tile(west, south, z)
+        total += sum(len(xs) for xs in _x_ranges(west, east, z)) * (y1 - y0 + 1)
+    return total
+
+
+def bbox_around(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """(south, west, north, east) box of about radius_km around a point."""
+    dlat = radius_km / 111.32
+    dlon = radius_km / (111.32 * max(0.01, math.cos(math.radians(lat))))
+    if dlon >= 180.0:
+        west, east = -180.0, 180.0
+    else:
+        west = (lon - dlon + 180.0) % 360.0 - 180.0
+        east = (lon + dlon + 180.0) % 360.0 - 180.0
+    return max(-MAX_LAT, lat - dlat), west, min(MAX_LAT, lat + dlat), east
+
+
+class TileCache:
+    """
+    MBTiles tile store. get/put take XYZ coordinates (as in the tile URL); rows are
+    stored flipped to TMS as the MBTiles spec requires. Safe to share between threads.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_cache_path()
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT)")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS tiles (zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, "
+                "tile_data BLOB, PRIMARY KEY (zoom_level, tile_column, tile_row))"
+            )
+            self._db.execute("INSERT OR IGNORE INTO metadata VALUES ('name', 'nast_gs tile cache')")
+            self._db.execute("INSERT OR IGNORE INTO metadata VALUES ('format', 'png')")
+
+    @staticmethod
+    def _key(z: int, x: int, y: int) -> Tuple[int, int, int]:
+        return int(z), int(x), (1 << int(z)) - 1 - int(y)
+
+    def get(self, z: int, x: int, y: int) -> Optional[bytes]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?", self._key(z, x, y)
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def __contains__(self, zxy) -> bool:
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?", self._key(*zxy)
+            ).fetchone() is not None
+
+    def put(self, z: int, x: int, y: int, data: bytes):
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)",
+                             self._key(z, x, y) + (sqlite3.Binary(data),))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM tiles").fetchone()[0]
+
+    def metadata(self) -> dict:
+        with self._lock:
+            return dict(self._db.execute("SELECT name, value FROM metadata").fetchall())
+
+    def set_metadata(self, **values):
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO metadata VALUES (?, ?)",
+                                 [(k, str(v)) for k, v in values.items()])
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def download(url: str, timeout: float = 15.0) -> bytes:
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(req, timeout=timeout) as r:
+        return r.read()
+
+
+def is_osm_url(url: str) -> bool:
+    return "tile.openstreetmap.org" in url
+
+
+def check_tile_policy(url: str, bbox: Tuple[float, float, float, float], min_zoom: int, max_zoom: int):
+    """Raise ValueError if prefetching this region from ``url`` would break the OSM tile usage policy."""
+    if not is_osm_url(url):
+        return
+    total = count_tiles(*bbox, min_zoom, max_zoom)
+    high = count_tiles(*bbox, max(min_zoom, OSM_HIGH_ZOOM), max_zoom) if max_zoom >= OSM_HIGH_ZOOM else 0
+    if total > OSM_MAX_TILES or high > OSM_MAX_TILES_HIGH_ZOOM:
+        raise ValueError(
+            f"Region needs {total} tiles ({high} at zoom >= {OSM_HIGH_ZOOM}); the OpenStreetMap tile policy "
+            f"forbids bulk downloads (limit {OSM_MAX_TILES}, {OSM_MAX_TILES_HIGH_ZOOM} at zoom >= {OSM_HIGH_ZOOM}). "
+            f"Use a tile server that permits prefetching (--url) or a smaller region."
+        )
+
+
+def prefetch(cache: TileCache, bbox: Tuple[float, float, float, float], min_zoom: int, max_zoom: int,
+             url: str = DEFAULT_TILE_URL, max_tiles: int = 20000, delay_s: float = 0.05,
+             fetch: Callable[[str], bytes] = download, progress: Callable[[int, int], None] = None) -> dict:
+    """
+    Download every tile of ``bbox`` (south, west, north, east) over the zoom range into ``cache``.
+
+    Tiles already cached are skipped, so an interrupted prefetch can simply be rerun.
+    Refuses regions of more than ``max_tiles`` tiles, and anything beyond the OSM usage
+    policy when ``url`` is an openstreetmap.org server (see check_tile_policy); ``delay_s``
+    paces the requests. Returns {"total", "fetched", "skipped", "failed"}.
+    """
+    total = count_tiles(*bbox, min_zoom, max_zoom)
+    check_tile_policy(url, bbox, min_zoom, max_zoom)
+    if total > max_tiles:
+        raise ValueError(f"Region needs {total} tiles (limit {max_tiles}); reduce the area or max zoom")
+
+    stats = {"total": total, "fetched": 0, "skipped": 0, "failed": 0}
+    for i, (z, x, y) in enumerate(tiles_in_bbox(*bbox, min_zoom, max_zoom)):
+        if (z, x, y) in cache:
+            stats["skipped"] += 1
+        else:
+            try:
+                cache.put(z, x, y, fetch(url.format(z=z, x=x, y=y)))
+                stats["fetched"] += 1
+            except Exception as e:
+                stats["failed"] += 1
+                logger.warning("Tile %d/%d/%d failed: %s", z, x, y, e)
+            if delay_s:
+                time.sleep(delay_s)
+        if progress is not None:
+            progress(i + 1, total)
+
+    s, w, n, e = bbox
+    cache.set_metadata(bounds=f"{w},{s},{e},{n}", minzoom=min_zoom, maxzoom=max_zoom)
+    return stats
+
+
+def fetch_leaflet(dest: Optional[str] = None, fetch: Callable[[str], bytes] = download) -> Path:
+    """
+    Re-download the pinned Leaflet release into ``dest`` (default: the bundled assets dir).
+
+    Only needed to update the vendored copy after bumping LEAFLET_VERSION; the package
+    already ships these files, so stations never need network access for them.
+    """
+    dest = Path(dest) if dest else leaflet_dir()
+    for name in LEAFLET_FILES:
+        path = dest / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(fetch(LEAFLET_CDN + name))
+    return dest
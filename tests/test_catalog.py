@@ -0,0 +1,49 @@
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from nast_gs.prop import load_catalog, parse_tle_text, propagate_arrays, propagate_catalog
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_load_catalog_indexes_every_entry():
+    cat = load_catalog(str(ROOT / "08-15_02.01.26_TLE (1).txt"))
+    assert len(cat) == 28
+    assert cat.get("object a")[0] == "OBJECT A"
+    assert cat.get(66994)[0] == "OBJECT B"
+    assert cat.index("OBJECT C") == cat.index(66995)
+    with pytest.raises(KeyError):
+        cat.get(12345)
+
+
+def test_parse_two_line_entries():
+    lines = (ROOT / "data" / "iss.tle").read_text().splitlines()
+    cat = parse_tle_text("\n".join(lines[1:3] + lines))
+    assert len(cat) == 2
+    assert cat.names[0] == "NORAD 39090"
+    assert cat.names[1] == "STRAND-1"
+
+
+def test_empty_catalog_propagates_to_empty_columns():
+    from nast_gs.prop.catalog import fleet_states
+    cat = parse_tle_text("no TLEs here\n")
+    assert len(cat) == 0
+    st = fleet_states(cat, datetime(2026, 1, 2, 12, 0, 0), 0.0, 27.7, 85.3)
+    assert st["sublat"].shape == st["eldeg"].shape == st["error"].shape == (0, 1)
+    cols = propagate_catalog(cat, datetime(2026, 1, 2, 12, 0, 0), 10, 60, 27.7, 85.3)
+    assert cols["range_km"].shape == (0, 11) and cols["names"] == []
+
+
+def test_propagate_catalog_matches_single_satellite():
+    cat = load_catalog(str(ROOT / "08-15_02.01.26_TLE (1).txt")).subset([66993, 66995])
+    start = datetime(2026, 1, 6, 3, 4, 5)
+    fleet = propagate_catalog(cat, start, minutes=60, step_s=60, gs_lat=27.7, gs_lon=85.3, gs_alt_m=1300.0)
+    assert fleet["eldeg"].shape == (2, 61)
+    one = propagate_arrays(cat[1], start, minutes=60, step_s=60, gs_lat=27.7, gs_lon=85.3, gs_alt_m=1300.0)
+    assert np.allclose(fleet["eldeg"][1], one["eldeg"], atol=1e-6)
+    assert np.allclose(fleet["range_km"][1], one["range_km"], atol=1e-6)
+    assert np.allclose(fleet["range_rate_km_s"][1], one["range_rate_km_s"], atol=1e-6)
+    assert np.allclose(fleet["sublat"][1], one["sublat"], atol=1e-6)
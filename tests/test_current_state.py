@@ -9,3 +9,17 @@ def test_current_state_has_fields():
     tle = load_tle(str(tle_path))
     st = current_state(tle, datetime.utcnow(), gs_lat=0.0, gs_lon=0.0)
     assert "azdeg" in st and "eldeg" in st and "range_km" in st and "range_rate_km_s" in st
+
+
+def test_tracker_matches_current_state_and_records_latency():
+    from nast_gs.prop.propagator import SatelliteTracker
+    here = Path(__file__).resolve().parents[1]
+    tle = load_tle(str(here / "data" / "iss.tle"))
+    dt = datetime(2026, 1, 6, 3, 4, 5)
+    tracker = SatelliteTracker(tle, 27.7, 85.3, 1300.0)
+    st = tracker.state_at(dt)
+    ref = current_state(tle, dt, 27.7, 85.3, 1300.0)
+    for k in ("azdeg", "eldeg", "range_km", "range_rate_km_s", "sublat", "sublon"):
+        assert abs(st[k] - ref[k]) < 1e-9
+    stats = tracker.tick_stats()
+    assert stats["ticks"] == 1 and stats["max_ms"] > 0.0
@@ -22,3 +22,28 @@ def test_doppler_controller_applies_freq():
     ctrl = DopplerController(sdr, center_freq_hz=145_800_000.0)
     new_f = ctrl.apply_correction(-0.2)
     assert sdr.get_center_frequency() == new_f
+
+
+def test_doppler_worker_hysteresis_and_stats():
+    import time
+    from datetime import datetime
+    from nast_gs.sdr.doppler import DopplerWorker
+
+    f0 = 437_000_000.0
+    sdr = SimulatedSDR(initial_freq_hz=f0)
+    rr = [0.0]
+    worker = DopplerWorker(sdr, f0, lambda dt: rr[0], rate_hz=50.0, min_step_hz=100.0)
+    assert worker.step() == f0
+    rr[0] = 0.05  # ~73 Hz shift at 437 MHz: below the step, tuner untouched
+    assert worker.step() == f0 and worker.retunes == 1
+    rr[0] = 0.2
+    tuned = worker.step()
+    assert tuned == sdr.get_center_frequency() < f0 and worker.retunes == 2
+    assert worker.latest()["target_hz"] == tuned
+
+    worker.start()
+    time.sleep(0.2)
+    worker.stop()
+    worker.join(timeout=1.0)
+    stats = worker.stats()
+    assert stats["updates"] >= 5 and stats["max_ms"] >= stats["mean_ms"] > 0.0
@@ -0,0 +1,124 @@
+import threading
+
+import numpy as np
+import pytest
+
+from nast_gs.processing.audio import AudioFifo
+from nast_gs.processing.spectrum import SpectrumPipeline
+from nast_gs.sdr.ringbuffer import IQRingBuffer
+
+
+def test_audio_fifo_splits_blocks_and_bounds_latency():
+    fifo = AudioFifo(fs=1000, max_seconds=1.0)
+    fifo.push(np.arange(300, dtype=np.float32))
+    fifo.push(np.arange(300, 600, dtype=np.float32))
+    out = np.empty(256, dtype=np.float32)
+    assert fifo.read_into(out) == 256 and np.array_equal(out, np.arange(256))
+    assert fifo.read_into(out) == 256 and np.array_equal(out, np.arange(256, 512))
+    assert fifo.read_into(out) == 88 and np.all(out[88:] == 0) and fifo.underruns == 1
+
+    for _ in range(12):
+        fifo.push(np.ones(100, dtype=np.float32))
+    assert len(fifo) == 1000 and fifo.dropped == 200
+
+
+def test_dsp_worker_demodulates_off_gui_thread_and_emits_spectrum(qtbot):
+    pytest.importorskip("PyQt6")
+    from nast_gs.gui.dsp_worker import DSPWorker
+
+    fs, block = 240_000.0, 8192
+    ring = IQRingBuffer(capacity=16 * block, max_block=block)
+    pipe = SpectrumPipeline(nfft=1024)
+    fifo = AudioFifo(fs=48000, max_seconds=5.0)
+    worker = DSPWorker(ring, block, fs, pipe, fifo, center_fn=lambda: 145.8e6, display_dt=0.01)
+    worker.configure(mode="FM", bandwidth_hz=12_000, audio=True)
+
+    threads = []
+    frames = []
+    worker.spectrum_ready.connect(lambda p, s, c, sr: (frames.append((p, s, c, sr)), worker.ack_display()))
+    orig = worker._demodulate_block
+    worker._demodulate_block = lambda s, st: (threads.append(threading.current_thread()), orig(s, st))
+
+    worker.start()
+    try:
+        n = np.arange(8 * block)
+        iq = np.exp(2j * np.pi * (3e3 / fs * n + 0.5 * np.sin(2 * np.pi * 1e3 / fs * n))).astype(np.complex64)
+        qtbot.wait(50)
+        for i in range(8):
+            ring.write(iq[i * block:(i + 1) * block])
+            qtbot.wait(20)
+        qtbot.waitUntil(lambda: worker.blocks >= 8 and bool(frames), timeout=3000)
+    finally:
+        worker.stop()
+
+    assert threads and all(t is not threading.main_thread() for t in threads)
+    assert len(fifo) > 0.9 * 8 * block / fs * 48000
+    psds, samples, center, sr = frames[-1]
+    assert psds[1024].shape == (1024,) and samples.shape == (block,) and (center, sr) == (145.8e6, fs)
+    assert worker.stats()["demod_errors"] == 0
+
+
+def test_dsp_worker_audio_rate_matches_fifo_at_2048_msps(qtbot):
+    pytest.importorskip("PyQt6")
+    from nast_gs.gui.dsp_worker import DSPWorker
+
+    # 2.048 MS/s has no integer decimation to 48 kHz (/43 gives 47 627.9 Hz)
+    fs, block = 2.048e6, 65536
+    ring = IQRingBuffer(capacity=32 * block, max_block=block)
+    fifo = AudioFifo(fs=48000, max_seconds=5.0)
+    worker = DSPWorker(ring, block, fs, SpectrumPipeline(nfft=1024), fifo, center_fn=lambda: 0.0,
+                       display_dt=0.01)
+    worker.configure(mode="FM", bandwidth_hz=12_000, audio=True)
+    worker.spectrum_ready.connect(lambda *a: worker.ack_display())
+
+    nblocks = 16  # 0.512 s of IQ
+    n = np.arange(nblocks * block)
+    iq = np.exp(2j * np.pi * 0.5 * np.sin(2 * np.pi * 1e3 / fs * n)).astype(np.complex64)
+    worker.start()
+    try:
+        qtbot.wait(50)
+        for i in range(nblocks):
+            ring.write(iq[i * block:(i + 1) * block])
+            qtbot.wait(20)
+        qtbot.waitUntil(lambda: worker.blocks >= nblocks, timeout=5000)
+    finally:
+        worker.stop()
+
+    assert worker.stats()["demod_errors"] == 0
+    assert abs(len(fifo) - nblocks * block / fs * 48000) <= 2
+
+
+def test_dsp_worker_keeps_display_rate_while_draining_audio(qtbot):
+    pytest.importorskip("PyQt6")
+    import time
+    from nast_gs.gui.dsp_worker import DSPWorker
+
+    fs, block = 240_000.0, 1024
+    ring = IQRingBuffer(capacity=512 * block, max_block=block)
+    fifo = AudioFifo(fs=48000, max_seconds=5.0)
+    worker = DSPWorker(ring, block, fs, SpectrumPipeline(nfft=256), fifo, center_fn=lambda: 0.0, display_dt=0.05)
+    worker.configure(audio=True)
+    worker._demodulate_block = lambda s, st: time.sleep(0.004)  # a demod that always has a backlog
+    worker.spectrum_ready.connect(lambda *a: worker.ack_display())
+
+    stop = threading.Event()
+    x = np.zeros(block, dtype=np.complex64)
+
+    def feed():
+        while not stop.is_set():
+            ring.write(x)
+            time.sleep(0.001)
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    worker.start()
+    try:
+        qtbot.wait(100)
+        f0, t0 = worker.frames, time.monotonic()
+        qtbot.wait(1000)
+        rate = (worker.frames - f0) / (time.monotonic() - t0)
+    finally:
+        worker.stop()
+        stop.set()
+        feeder.join()
+    assert rate > 0.75 / 0.05  # about 20 frames/s, not half of that
@@ -0,0 +1,22 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from nast_gs.prop.propagator import load_tle, SatelliteTracker
+from nast_gs.prop.ephemeris import build_pass_ephemeris
+
+
+def test_pass_ephemeris_interpolates_within_bound():
+    here = Path(__file__).resolve().parents[1]
+    tle = load_tle(str(here / "data" / "iss.tle"))
+    tracker = SatelliteTracker(tle, 27.7, 85.3, 1300.0)
+    eph = build_pass_ephemeris(tracker, datetime(2026, 1, 6, 0, 0, 0))
+    assert eph is not None
+    assert eph.max_error["azdeg"] < 0.01 and eph.max_error["range_km"] < 0.01
+
+    dt = eph.start + timedelta(seconds=eph.duration_s / 2 + 3.7)
+    assert eph.covers(dt) and not eph.covers(eph.end + timedelta(seconds=1))
+    st = eph.state_at(dt)
+    ref = tracker.state_at(dt)
+    for k in ("eldeg", "range_km", "range_rate_km_s", "sublat"):
+        assert abs(st[k] - ref[k]) < 1e-3
+    assert abs((st["azdeg"] - ref["azdeg"] + 180.0) % 360.0 - 180.0) < 1e-2
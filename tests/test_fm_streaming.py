@@ -0,0 +1,83 @@
+import numpy as np
+
+from nast_gs.demod.fm import StreamingFMDemodulator
+from nast_gs.processing.filters import FIRDecimator, lowpass_taps
+
+
+def test_fir_decimator_is_block_size_invariant():
+    from scipy.signal import upfirdn
+    x = (np.random.randn(20000) + 1j * np.random.randn(20000)).astype(np.complex64)
+    h = lowpass_taps(2.4e6, 100e3, 40e3)
+    dec = FIRDecimator(h, 10)
+    y = np.concatenate([dec.process(x[i:i + 1234]) for i in range(0, 20000, 1234)])
+    ref = upfirdn(h, x, down=10)[:y.size]
+    assert y.size == 2000 and np.max(np.abs(y - ref)) < 1e-5
+
+
+def test_rational_resampler_is_block_size_invariant():
+    from scipy.signal import upfirdn
+    from nast_gs.processing.filters import RationalResampler
+    rs = RationalResampler(2.048e6 / 43, 48000)
+    assert (rs.up, rs.down, rs.fs_out) == (129, 128, 48000.0)
+    x = np.random.randn(30000).astype(np.float32)
+    y = np.concatenate([rs.process(x[i:i + 777]) for i in range(0, 30000, 777)])
+    ref = upfirdn(rs.taps, x, rs.up, rs.down)
+    assert y.size == 30235 and np.max(np.abs(y - ref[:y.size])) < 1e-4
+
+
+def test_streaming_fm_recovers_tone_without_block_edges():
+    fs = 2.4e6
+    t = np.arange(int(0.2 * fs)) / fs
+    iq = np.exp(1j * 2 * np.pi * 75e3 * np.cumsum(np.sin(2 * np.pi * 1000 * t)) / fs).astype(np.complex64)
+
+    whole = StreamingFMDemodulator(fs, deemph_tau=0).process(iq)
+    dem = StreamingFMDemodulator(fs, deemph_tau=0)
+    blocks = np.concatenate([dem.process(iq[i:i + 8192]) for i in range(0, iq.size, 8192)])
+    assert dem.fs_out == 48000.0 and blocks.size == whole.size == 9600
+    assert np.max(np.abs(blocks - whole)) < 1e-4
+
+    spec = np.abs(np.fft.rfft(blocks[960:]))
+    assert abs(np.argmax(spec) * 48000.0 / (blocks.size - 960) - 1000.0) < 10.0
+
+
+def test_fm_demods_output_fs_audio_at_2048_msps():
+    from nast_gs.demod.fm import make_fm_demod
+    fs = 2.048e6  # /43 would give 47 627.9 Hz
+    t = np.arange(int(0.5 * fs)) / fs
+    iq = np.exp(1j * 2 * np.pi * 3e3 * np.cumsum(np.sin(2 * np.pi * 1000 * t)) / fs).astype(np.complex64)
+    for mode in ("FM", "WFM"):
+        dem = make_fm_demod(mode, fs, 12e3, 0.0, 48000)
+        audio = np.concatenate([dem.process(iq[i:i + 65536]) for i in range(0, iq.size, 65536)])
+        assert dem.fs_out == 48000.0 and abs(audio.size - 24000) <= 1
+        spec = np.abs(np.fft.rfft(audio[4800:]))
+        assert abs(np.argmax(spec) * 48000.0 / (audio.size - 4800) - 1000.0) < 5.0
+
+
+def test_deemphasis_matches_one_pole_recursion_across_blocks():
+    from nast_gs.processing.filters import Deemphasis
+    x = np.random.randn(3000)
+    a = np.exp(-1.0 / (48000.0 * 75e-6))
+    ref, z = np.empty_like(x), 0.0
+    for i, v in enumerate(x):
+        z = a * z + (1.0 - a) * v
+        ref[i] = z
+    de = Deemphasis(48000.0, 75e-6)
+    y = np.concatenate([de.process(x[i:i + 700]) for i in range(0, 3000, 700)])
+    assert np.max(np.abs(y - ref)) < 1e-12
+
+
+def test_nbfm_receiver_selects_offset_channel():
+    from nast_gs.demod.fm import NBFMReceiver
+    fs = 2.4e6
+    t = np.arange(int(0.1 * fs)) / fs
+    msg = np.sin(2 * np.pi * 1000 * t)
+    sig = np.exp(1j * (2 * np.pi * 50e3 * t + 2 * np.pi * 3e3 * np.cumsum(msg) / fs))
+    iq = (sig + 3.0 * np.exp(2j * np.pi * 80e3 * t)).astype(np.complex64)  # strong adjacent carrier
+
+    rx = NBFMReceiver(fs, center_offset_hz=50e3, channel_bw_hz=25e3)
+    audio = np.concatenate([rx.process(iq[i:i + 16384]) for i in range(0, iq.size, 16384)])
+    assert rx.fs_out == 48000.0 and audio.size == 4800
+    # full deviation maps to 0.8, so the 3 kHz-deviation tone has RMS 0.8 * 0.6 / sqrt(2)
+    assert abs(np.std(audio[480:]) - 0.8 * 0.6 / np.sqrt(2)) < 0.02
+    spec = np.abs(np.fft.rfft(audio[480:]))
+    assert abs(np.argmax(spec) * 48000.0 / (audio.size - 480) - 1000.0) < 15.0
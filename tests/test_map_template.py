@@ -1,3 +1,6 @@
+import json
+
+import numpy as np
 import pytest
 
 # Skip if PyQt6 isn't available in test environment
@@ -12,3 +15,63 @@ def test_html_template_valid():
     assert 'function setTrack' in tpl
     assert 'function setGroundStation' in tpl
     assert 'function setSatellite' in tpl
+    assert 'function applyUpdates' in tpl and 'setLatLng(' in tpl
+
+
+def test_track_segments_split_at_dateline_as_flat_arrays():
+    segs = MapWindow._track_segments([(0.0, 170.0), (1.0, 179.123456789), (2.0, -179.0), (3.0, -170.0)])
+    assert segs == [[0.0, 170.0, 1.0, 179.12346], [2.0, -179.0, 3.0, -170.0]]
+    assert MapWindow._track_segments([]) == []
+
+
+def test_fleet_layer_bulk_update():
+    tpl = MapWindow.HTML_TEMPLATE
+    assert 'L.canvas(' in tpl and 'function setFleet' in tpl and 'u.fleet' in tpl
+    pos = MapWindow._fleet_positions(np.array([[10.12345], [np.nan]]), np.array([[20.0], [30.0]]))
+    assert pos == [10.123, 20.0, None, None]
+    json.dumps(pos, allow_nan=False)
+
+
+def test_template_loads_map_from_local_scheme():
+    tpl = MapWindow.HTML_TEMPLATE
+    assert 'nastmap:/leaflet/leaflet.js' in tpl and 'nastmap:/tiles/{z}/{x}/{y}.png' in tpl
+    assert 'https://' not in tpl
+    online = MapWindow.online_html()
+    assert 'nastmap:' not in online and 'unpkg.com/leaflet@' in online and 'tile.openstreetmap.org' in online
+
+
+class _FakeMap:
+    """Enough of a MapWindow for the queue/flush logic, without a web view."""
+
+    def __init__(self):
+        self._pending = {}
+        self._page_ready = True
+        self.sent = []
+        self.view = self
+        self._flush_timer = self
+
+    def page(self):
+        return self
+
+    def runJavaScript(self, js):
+        self.sent.append(js)
+
+    def isActive(self):
+        return True
+
+    def _queue(self, kind, value):
+        MapWindow._queue(self, kind, value)
+
+
+def test_nan_position_does_not_wedge_updates():
+    m = _FakeMap()
+    MapWindow.set_satellite(m, float("nan"), 10.0)
+    MapWindow.set_ground_station(m, 27.7, float("inf"))
+    assert m._pending == {}
+    # a poisoned batch is dropped and the queue keeps working
+    m._pending["sat"] = [float("nan"), 0.0]
+    MapWindow._flush(m)
+    assert m._pending == {} and m.sent == []
+    MapWindow.set_satellite(m, 1.0, 2.0)
+    MapWindow._flush(m)
+    assert m.sent == ['applyUpdates({"sat":[1.0,2.0]});']
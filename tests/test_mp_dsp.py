@@ -0,0 +1,46 @@
+import numpy as np
+
+from nast_gs.demod.fm import make_fm_demod
+from nast_gs.processing.mp_dsp import ProcessDSPBackend, SharedBlockPool
+from nast_gs.processing.spectrum import SpectrumEngine
+
+
+def test_shared_block_pool_attach_sees_same_memory():
+    pool = SharedBlockPool(4, 128, np.complex64)
+    try:
+        other = SharedBlockPool.attach(pool.spec)
+        pool.array[2, :3] = [1, 2j, 3]
+        assert np.array_equal(other.array[2, :3], [1, 2j, 3])
+        other.close()
+    finally:
+        pool.close()
+
+
+def test_process_backend_matches_in_process_dsp():
+    fs, block, nblocks = 240_000.0, 4096, 6
+    n = np.arange(block * nblocks)
+    iq = (np.exp(2j * np.pi * (20e3 / fs * n + 0.8 * np.sin(2 * np.pi * 1e3 / fs * n)))
+          + np.exp(-2j * np.pi * 40e3 / fs * n)).astype(np.complex64)
+
+    with ProcessDSPBackend(fs, block, num_workers=2, n_slots=nblocks, nfft=1024) as be:
+        be.add_channel("a", "FM", offset_hz=20e3, bandwidth_hz=12e3)
+        be.add_channel("b", "FM", offset_hz=-40e3, bandwidth_hz=12e3)
+        seqs = [be.submit(iq[i * block:(i + 1) * block]) for i in range(nblocks)]
+        assert None not in seqs
+        res = []
+        while len(res) < 3 * nblocks:
+            got = be.poll(timeout=10.0)
+            assert got, "worker timed out"
+            res += got
+        assert be.errors == 0 and not be._pending and len(be._free) == nblocks
+
+    for name, offset in (("a", 20e3), ("b", -40e3)):
+        ref = make_fm_demod("FM", fs, 12e3, offset, 48000)
+        want = np.concatenate([ref.process(iq[i * block:(i + 1) * block]) for i in range(nblocks)])
+        chunks = [r for r in res if r["channel"] == name]
+        assert [r["seq"] for r in chunks] == seqs
+        assert np.allclose(np.concatenate([r["data"] for r in chunks]), want, atol=1e-5)
+
+    psd = {r["seq"]: r["data"] for r in res if r["kind"] == "psd"}
+    ref = SpectrumEngine(backend="scipy", workers=1).psd_db(iq[:block], 1024, max_segments=0)
+    assert np.allclose(psd[seqs[0]], ref, atol=1e-3)
@@ -0,0 +1,43 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from nast_gs.prop import load_catalog
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_schedule_runs_off_the_gui_thread(qtbot):
+    from nast_gs.gui.pass_panel import PassPanel
+
+    panel = PassPanel()
+    qtbot.addWidget(panel)
+    cat = load_catalog(str(ROOT / "08-15_02.01.26_TLE (1).txt"))
+    start = datetime(2026, 1, 6, 3, 4, 5)
+
+    with qtbot.waitSignal(panel.schedule_ready, timeout=20000) as sig:
+        worker = panel.compute_schedule(cat, start, hours=24, gs_lat=27.7, gs_lon=85.3, gs_alt_m=1300.0)
+        assert worker.isRunning() or worker.isFinished()
+        assert not panel.compute_btn.isEnabled()  # busy while the worker searches
+    sched = sig.args[0]
+    assert panel.compute_btn.isEnabled()
+    assert panel.table.rowCount() == len(sched["schedule"]) > 0
+    worker.wait()
+
+
+def test_stale_schedule_does_not_overwrite_newer_results(qtbot):
+    from nast_gs.gui.pass_panel import PassPanel
+
+    panel = PassPanel()
+    qtbot.addWidget(panel)
+    cat = load_catalog(str(ROOT / "08-15_02.01.26_TLE (1).txt"))
+    start = datetime(2026, 1, 6, 3, 4, 5)
+    worker = panel.compute_schedule(cat, start, hours=24, gs_lat=27.7, gs_lon=85.3)
+    panel.compute_and_update(cat[0], start, hours=24, gs_lat=27.7, gs_lon=85.3)
+    rows = panel.table.rowCount()
+    worker.wait()
+    qtbot.wait(50)  # deliver the queued result
+    assert panel.table.rowCount() == rows and panel.compute_btn.isEnabled()
@@ -12,4 +12,22 @@ def test_compute_passes_returns_list():
     # result is a list (may be empty depending on satellite and time)
     assert isinstance(passes, list)
     for p in passes:
-        assert 'aos' in p and 'los' in p and 'tca' in p and 'max_el_deg' in p
\ No newline at end of file
+        assert 'aos' in p and 'los' in p and 'tca' in p and 'max_el_deg' in p
+
+
+def test_compute_passes_refines_crossings_and_mask():
+    here = Path(__file__).resolve().parents[1]
+    tle = load_tle(str(here / "data" / "iss.tle"))
+    start = datetime(2026, 1, 6, 3, 4, 5)
+    passes = compute_passes(tle, start, hours=24, gs_lat=27.7, gs_lon=85.3, gs_alt_m=1300.0)
+    assert passes
+    from nast_gs.prop.propagator import current_state
+    for p in passes:
+        assert p['aos'] < p['tca'] < p['los']
+        # AOS/LOS land on the horizon, far tighter than the 30 s coarse scan
+        for key in ('aos', 'los'):
+            st = current_state(tle, p[key], 27.7, 85.3, 1300.0)
+            assert abs(st['eldeg']) < 0.01
+    masked = compute_passes(tle, start, hours=24, gs_lat=27.7, gs_lon=85.3, gs_alt_m=1300.0, min_el_deg=10.0)
+    assert all(p['max_el_deg'] > 10.0 for p in masked)
+    assert len(masked) <= len(passes)
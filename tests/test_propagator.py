@@ -1,5 +1,5 @@
 from datetime import datetime
-from nast_gs.prop import load_tle, propagate_tle
+from nast_gs.prop import load_tle, propagate_arrays, propagate_tle
 from pathlib import Path
 
 
@@ -12,3 +12,15 @@ def test_propagate_returns_points():
     assert len(pts) > 0
     p = pts[0]
     assert "sublat" in p and "sublon" in p and "azdeg" in p and "eldeg" in p
+
+
+def test_propagate_arrays_matches_list_output():
+    here = Path(__file__).resolve().parents[1]
+    tle = load_tle(str(here / "data" / "iss.tle"))
+    start = datetime(2026, 1, 6, 3, 4, 5, 123456)
+    cols = propagate_arrays(tle, start, minutes=30, step_s=30, gs_lat=27.7, gs_lon=85.3, gs_alt_m=1300.0)
+    pts = propagate_tle(tle, start, minutes=30, step_s=30, gs_lat=27.7, gs_lon=85.3, gs_alt_m=1300.0)
+    assert cols["eldeg"].shape == (61,) and len(pts) == 61
+    assert pts[-1]["time"] == cols["time"][-1] == datetime(2026, 1, 6, 3, 34, 5, 123456)
+    for k in ("sublat", "sublon", "azdeg", "eldeg", "range_km", "range_rate_km_s"):
+        assert abs(pts[7][k] - cols[k][7]) < 1e-9
@@ -0,0 +1,14 @@
+import numpy as np
+
+from nast_gs.sdr.rtl import bytes_to_iq
+
+
+def test_bytes_to_iq_matches_reference_scaling_into_reused_buffer():
+    raw = np.random.default_rng(1).integers(0, 256, 2 * 4096, dtype=np.uint8)
+    ref = (raw[0::2].astype(np.float64) - 127.5) / 127.5 + 1j * (raw[1::2].astype(np.float64) - 127.5) / 127.5
+    buf = np.empty(8192, dtype=np.complex64)
+    iq = bytes_to_iq(raw, buf)
+    assert iq.dtype == np.complex64 and iq.shape == (4096,)
+    assert np.shares_memory(iq, buf)
+    assert np.max(np.abs(iq - ref)) < 1e-6
+    assert np.array_equal(bytes_to_iq(raw.tobytes()), iq)
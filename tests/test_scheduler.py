@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from nast_gs.prop import load_catalog
+from nast_gs.prop.propagator import compute_passes
+from nast_gs.prop.scheduler import build_schedule, compute_catalog_passes
+
+T0 = datetime(2026, 1, 6, 0, 0, 0)
+
+
+def _pass(name, aos_min, los_min, max_el):
+    return {
+        "name": name,
+        "aos": T0 + timedelta(minutes=aos_min),
+        "los": T0 + timedelta(minutes=los_min),
+        "max_el_deg": max_el,
+    }
+
+
+def test_build_schedule_resolves_overlaps():
+    passes = [
+        _pass("A", 0, 10, 20.0),
+        _pass("B", 5, 15, 60.0),
+        _pass("C", 14, 20, 10.0),
+        _pass("D", 30, 40, 5.0),
+    ]
+    res = build_schedule(passes, policy="max_el")
+    assert [p["name"] for p in res["schedule"]] == ["B", "D"]
+    assert {p["name"]: p["conflicts_with"] for p in res["rejected"]} == {"A": "B", "C": "B"}
+
+    res = build_schedule(passes, priorities={"A": 5, "C": 1}, policy="priority")
+    assert [p["name"] for p in res["schedule"]] == ["A", "C", "D"]
+
+    res = build_schedule(passes, priorities={"A": 5, "C": 1}, min_gap_s=300)
+    assert [p["name"] for p in res["schedule"]] == ["A", "D"]
+
+
+def test_catalog_passes_match_single_satellite():
+    here = Path(__file__).resolve().parents[1]
+    cat = load_catalog(str(here / "08-15_02.01.26_TLE (1).txt")).subset([66993, 66994, 66995])
+    start = datetime(2026, 1, 6, 3, 4, 5)
+    passes = compute_catalog_passes(cat, start, hours=12, gs_lat=27.7, gs_lon=85.3, gs_alt_m=1300.0)
+    assert [p["aos"] for p in passes] == sorted(p["aos"] for p in passes)
+    ref = compute_passes(cat[1], start, hours=12, gs_lat=27.7, gs_lon=85.3, gs_alt_m=1300.0)
+    mine = [p for p in passes if p["norad_id"] == 66994]
+    assert len(mine) == len(ref) > 0
+    for a, b in zip(ref, mine):
+        assert abs((a["aos"] - b["aos"]).total_seconds()) < 0.5
+        assert abs(a["max_el_deg"] - b["max_el_deg"]) < 0.01
+
+
+def test_visibility_prefilter_loses_no_pass(monkeypatch):
+    import nast_gs.prop.scheduler as scheduler
+
+    cat = load_catalog(str(Path(__file__).resolve().parents[1] / "08-15_02.01.26_TLE (1).txt"))
+    start = datetime(2026, 1, 6, 3, 4, 5)
+    args = dict(hours=24, gs_lat=-60.0, gs_lon=-170.0, step_s=20, min_el_deg=10.0)
+    fast = compute_catalog_passes(cat, start, **args)
+    monkeypatch.setattr(scheduler, "_candidate_mask", lambda sr, r, obs, n, step, m: np.ones((len(sr), n), bool))
+    full = compute_catalog_passes(cat, start, **args)
+    assert len(fast) == len(full) > 0
+    assert [(p["norad_id"], p["aos"]) for p in fast] == [(p["norad_id"], p["aos"]) for p in full]
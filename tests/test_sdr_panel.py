@@ -19,3 +19,48 @@ def test_demod_combo_has_expected_items(qtbot):
     qtbot.addWidget(panel)
     items = [panel.demod_combo.itemText(i) for i in range(panel.demod_combo.count())]
     assert "FM" in items and "AM" in items and "CW" in items and "RTTY" in items
+
+
+class _FakeOutputStream:
+    def __init__(self, **kwargs):
+        self.active = False
+
+    def start(self):
+        self.active = True
+
+    def stop(self):
+        self.active = False
+
+    def close(self):
+        pass
+
+
+def test_device_start_reopens_audio_stream(qtbot, monkeypatch):
+    import sys
+    import types
+    from nast_gs.gui.sdr_panel import SDRPanel
+
+    # sound-card double: the panel only needs OutputStream
+    monkeypatch.setitem(sys.modules, "sounddevice", types.SimpleNamespace(OutputStream=_FakeOutputStream))
+    panel = SDRPanel()
+    qtbot.addWidget(panel)
+    panel.device_combo.setCurrentText("Simulated")
+    panel.play_audio_btn.setChecked(True)
+    try:
+        for _ in range(2):  # first start, then a restart with audio still checked
+            panel._start_device()
+            assert panel._audio_stream is not None and panel._audio_stream.active
+    finally:
+        panel._stop_device_internal(emit=False)
+    assert panel._audio_stream is None
+
+
+def test_spectrum_window_waterfall_holds_ten_seconds_at_display_rate(qtbot):
+    from nast_gs.gui.sdr_panel import SDRPanel
+    panel = SDRPanel()
+    qtbot.addWidget(panel)
+    panel._open_spectrum_window()
+    qtbot.addWidget(panel.spec_window)
+    wf = panel.spec_window.waterfall
+    # one line per DSP worker frame (display_dt), not per the old 0.2 s timer
+    assert wf.max_lines == round(wf.history_seconds / panel._display_dt) == 200
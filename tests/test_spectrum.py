@@ -0,0 +1,80 @@
+import numpy as np
+
+from nast_gs.processing.spectrum import SpectrumEngine, SpectrumPipeline, compute_spectrum
+
+
+def _reference_psd(iq, nfft):
+    x = iq[:nfft].astype(np.complex64)
+    x = (x - np.mean(x)) * np.hanning(nfft).astype(np.float32)
+    return np.fft.fftshift(10.0 * np.log10(np.abs(np.fft.fft(x)) ** 2 + 1e-20))
+
+
+def test_spectrum_engine_matches_reference_and_reuses_buffers():
+    iq = (np.random.randn(8192) + 1j * np.random.randn(8192)).astype(np.complex64)
+    ref = _reference_psd(iq, 4096)
+    for backend in ("numpy", "scipy"):
+        eng = SpectrumEngine(backend=backend, workers=2)
+        a = eng.psd_db(iq, 4096, dc_bins=0)
+        b = eng.psd_db(iq, 4096, dc_bins=0)
+        assert a.dtype == np.float32 and a is not b and np.array_equal(a, b)
+        assert np.max(np.abs(a - ref)) < 1e-2
+        assert eng.window(4096) is eng.window(4096)
+
+    bins, psd = compute_spectrum(iq, nfft=1024)
+    assert bins.shape == psd.shape == (1024,)
+
+
+def test_welch_mode_matches_scipy_and_lowers_variance():
+    from scipy.signal import welch
+
+    rng = np.random.default_rng(1)
+    iq = (rng.standard_normal(16384) + 1j * rng.standard_normal(16384)).astype(np.complex64)
+    eng = SpectrumEngine(backend="scipy", workers=1)
+    nfft = 1024
+
+    psd = eng.psd_db(iq, nfft, remove_dc=False, dc_bins=0, overlap=0.5, max_segments=0)
+    w = np.hanning(nfft)
+    _, ref = welch(iq, window=w, noverlap=nfft // 2, detrend=False, return_onesided=False, scaling="spectrum")
+    ref_db = np.fft.fftshift(10.0 * np.log10(ref * np.sum(w) ** 2))
+    assert np.max(np.abs(psd - ref_db)) < 1e-2
+
+    single = eng.psd_db(iq, nfft, remove_dc=False, dc_bins=0)
+    assert np.std(psd) < 0.25 * np.std(single)
+    # segment count cap: 3 segments of the same block
+    capped = eng.psd_db(iq, nfft, remove_dc=False, dc_bins=0, max_segments=3)
+    assert np.std(single) > np.std(capped) > np.std(psd)
+
+
+def test_pipeline_computes_once_and_publishes_all_resolutions():
+    eng = SpectrumEngine(backend="numpy")
+    calls = []
+    orig = eng.psd_db
+    eng.psd_db = lambda *a, **k: calls.append(1) or orig(*a, **k)
+
+    pipe = SpectrumPipeline(nfft=4096, engine=eng)
+    got = {}
+    pipe.subscribe(lambda p, c, sr: got.__setitem__("a", p))
+    pipe.subscribe(lambda p, c, sr: got.__setitem__("b", p))
+    pipe.subscribe(lambda p, c, sr: got.__setitem__("coarse", (p, c, sr)), nfft=1024)
+
+    iq = (np.random.randn(16384) + 1j * np.random.randn(16384)).astype(np.complex64)
+    pipe.push(iq, 100e6, 2.4e6)
+    assert len(calls) == 1
+    assert got["a"] is got["b"] and not got["a"].flags.writeable
+    coarse, c, sr = got["coarse"]
+    assert coarse.shape == (1024,) and (c, sr) == (100e6, 2.4e6)
+    lin = 10.0 ** (got["a"].astype(np.float64) / 10.0)
+    assert np.allclose(coarse, 10.0 * np.log10(np.roll(lin, 2).reshape(1024, 4).mean(axis=1)), atol=1e-3)
+
+
+def test_pipeline_coarse_resolution_puts_tone_in_native_fft_bin():
+    eng = SpectrumEngine(backend="numpy")
+    pipe = SpectrumPipeline(nfft=4096, engine=eng)
+    n = np.arange(16384)
+    rng = np.random.default_rng(1)
+    for k in (600.85, 700.2, 900.6):
+        f = (k - 512) / 1024  # cycles/sample; coarse bin k sits at -fs/2 + k * fs / 1024
+        iq = (np.exp(2j * np.pi * f * n) + 0.01 * rng.standard_normal(n.size)).astype(np.complex64)
+        coarse = pipe.compute(iq, [1024])[1024]
+        native = eng.psd_db(iq, 1024, remove_dc=True, floor=1e-20, dc_bins=2, overlap=0.5, max_segments=0)
+        assert np.argmax(coarse) == np.argmax(native) == round(k)
@@ -0,0 +1,80 @@
+import pytest
+
+from nast_gs.tile_cache import (TileCache, bbox_around, count_tiles, fetch_leaflet, lonlat_to_tile, prefetch,
+                                tiles_in_bbox)
+
+
+def test_tile_math_and_antimeridian_wrap():
+    assert lonlat_to_tile(0.0, 0.0, 0) == (0, 0)
+    assert lonlat_to_tile(85.3, 27.7, 8) == (188, 107)
+    tiles = list(tiles_in_bbox(-10, 170, 10, -170, 3, 3))
+    assert {x for _, x, _ in tiles} == {7, 0}
+    assert len(tiles) == count_tiles(-10, 170, 10, -170, 3, 3)
+    assert count_tiles(-85, -180, 85, 180, 0, 2) == 1 + 4 + 16
+    s, w, n, e = bbox_around(0.0, 179.0, 500.0)
+    assert w > e  # wraps
+
+
+def test_cache_roundtrip_uses_tms_rows(tmp_path):
+    path = str(tmp_path / "t.mbtiles")
+    with TileCache(path) as c:
+        c.put(3, 1, 2, b"png-bytes")
+        assert c.get(3, 1, 2) == b"png-bytes"
+        assert c.get(3, 1, 5) is None
+        assert (3, 1, 2) in c and len(c) == 1
+        row = c._db.execute("SELECT tile_row FROM tiles").fetchone()[0]
+        assert row == 5  # 2**3 - 1 - 2
+    with TileCache(path) as c:
+        assert c.get(3, 1, 2) == b"png-bytes"
+
+
+def test_prefetch_skips_cached_and_counts_failures(tmp_path):
+    urls = []
+
+    def fetch(url):
+        urls.append(url)
+        if url.endswith("/1/1/1.png"):
+            raise OSError("boom")
+        return url.encode()
+
+    with TileCache(str(tmp_path / "t.mbtiles")) as c:
+        c.put(0, 0, 0, b"old")
+        st = prefetch(c, (-80, -179, 80, 179), 0, 1, url="x/{z}/{x}/{y}.png", delay_s=0, fetch=fetch)
+        assert st == {"total": 5, "fetched": 3, "skipped": 1, "failed": 1}
+        assert c.get(0, 0, 0) == b"old" and c.get(1, 0, 1) == b"x/1/0/1.png"
+        assert c.metadata()["maxzoom"] == "1"
+        assert prefetch(c, (-80, -179, 80, 179), 0, 1, url="x/{z}/{x}/{y}.png", delay_s=0,
+                        fetch=fetch)["fetched"] == 0
+        with pytest.raises(ValueError):
+            prefetch(c, (-80, -179, 80, 179), 0, 10, max_tiles=100, fetch=fetch)
+    assert len(urls) == 5
+
+
+def test_fetch_leaflet_writes_assets(tmp_path):
+    dest = fetch_leaflet(str(tmp_path), fetch=lambda url: url.encode())
+    assert (dest / "leaflet.js").read_bytes().endswith(b"/leaflet.js")
+    assert (dest / "images" / "layers.png").is_file()
+
+
+def test_leaflet_is_vendored():
+    from nast_gs.tile_cache import LEAFLET_FILES, LEAFLET_VERSION, leaflet_dir
+
+    d = leaflet_dir()
+    for name in LEAFLET_FILES:
+        assert (d / name).is_file(), name
+    assert f"Leaflet {LEAFLET_VERSION}" in (d / "leaflet.js").read_text(encoding="utf-8")[:200]
+
+
+def test_osm_prefetch_is_limited_by_tile_policy(tmp_path):
+    from nast_gs.tile_cache import DEFAULT_TILE_URL, check_tile_policy
+
+    small = bbox_around(27.7, 85.3, 800.0)
+    check_tile_policy(DEFAULT_TILE_URL, small, 0, 8)  # a few hundred tiles: allowed
+    with pytest.raises(ValueError, match="tile policy"):
+        check_tile_policy(DEFAULT_TILE_URL, small, 0, 10)  # over the overall cap
+    with pytest.raises(ValueError, match="zoom >= 13"):
+        check_tile_policy(DEFAULT_TILE_URL, bbox_around(27.7, 85.3, 30.0), 13, 15)  # high zoom
+    # another server is only bound by max_tiles
+    check_tile_policy("https://tiles.example.org/{z}/{x}/{y}.png", small, 0, 10)
+    with TileCache(str(tmp_path / "t.mbtiles")) as c, pytest.raises(ValueError):
+        prefetch(c, small, 0, 10, fetch=lambda url: b"")
@@ -38,3 +38,26 @@ def test_tracking_applies_doppler_to_panel_device(qtbot):
     # ensure the panel device center was updated (within reasonable range)
     cf = mw.sdr_panel.sdr.get_center_frequency()
     assert cf != 145800000.0
+
+
+def test_doppler_range_rate_only_comes_from_the_pass_ephemeris(qtbot):
+    from datetime import datetime
+
+    class _Eph:
+        def covers(self, t):
+            return t.hour == 12
+
+        def range_rate_at(self, t):
+            return -3.5
+
+    class _Tracker:
+        def state_at(self, t):
+            raise AssertionError("tracker used from the Doppler worker")
+
+    mw = MainWindow()
+    qtbot.addWidget(mw)
+    mw._tracker = _Tracker()
+    assert mw._range_rate_at(datetime(2026, 1, 2, 12, 0)) is None
+    mw._ephemeris = _Eph()
+    assert mw._range_rate_at(datetime(2026, 1, 2, 12, 0)) == -3.5
+    assert mw._range_rate_at(datetime(2026, 1, 2, 13, 0)) is None
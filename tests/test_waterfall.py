@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("PyQt6")
+
+
+def test_waterfall_ring_writes_one_row_and_paints_newest_on_top(qtbot):
+    from nast_gs.gui.waterfall_widget import WaterfallWidget
+
+    wf = WaterfallWidget(width=64, height=40, history_seconds=1.0, update_dt_seconds=0.2)
+    qtbot.addWidget(wf)
+    ring = wf._ring
+    assert ring.rows.shape == (5, 64)
+
+    for level in range(7):  # wraps the 5-row ring
+        before = ring.rows.copy()
+        wf.update_from_psd(np.full(128, -100.0 + 10 * level, dtype=np.float32))
+        changed = np.any(ring.rows != before, axis=1)
+        assert changed.sum() <= 1 and changed[ring.head] == changed.any()
+    assert ring.count == 5 and sum(n for _, n in ring.segments()) == 5
+
+    # the QImage aliases the ring array
+    ring.rows[ring.head, 0] = 0xFF123456
+    assert wf.img.pixel(0, ring.head) == 0xFF123456
+
+    shot = wf.image_widget.grab().toImage()
+    newest = ring.rows[ring.head, 10]
+    oldest = ring.rows[(ring.head + 4) % 5, 10]
+    assert shot.pixel(10, 0) == newest and shot.pixel(10, shot.height() - 1) == oldest
+
+
+def test_waterfall_review_scrolls_back_through_history(qtbot, tmp_path):
+    from nast_gs.gui.waterfall_widget import WaterfallWidget
+
+    wf = WaterfallWidget(width=32, height=20, history_seconds=1.0, history_dir=str(tmp_path))
+    qtbot.addWidget(wf)
+    for i in range(200):
+        wf.update_from_psd(np.full(64, -120.0 + (i % 50), dtype=np.float32), 437e6, 2.4e6)
+    assert len(wf.history) == 200 and not wf.reviewing
+
+    wf._on_wheel(1.0, zoom=False)  # back in time
+    assert wf.reviewing and wf._review_end < 200
+    wf._on_wheel(-1.0, zoom=True)  # zoom out
+    assert wf._review_span > 5
+    assert wf.image_widget.review_img is not None
+    wf.image_widget.grab()
+    wf.go_live()
+    assert not wf.reviewing and wf.image_widget.review_img is None
+
+
+def test_waterfall_clear_forgets_history(qtbot, tmp_path):
+    from nast_gs.gui.waterfall_widget import WaterfallWidget
+
+    wf = WaterfallWidget(width=32, height=20, history_seconds=1.0, update_dt_seconds=0.2,
+                         history_dir=str(tmp_path))
+    qtbot.addWidget(wf)
+    for _ in range(50):
+        wf.update_from_psd(np.full(64, -100.0, dtype=np.float32), center_hz=100e6)
+    wf.review(50, 20)
+    wf.clear()
+    assert not wf.reviewing and len(wf.history) == 0 and all(mx.n == 0 for mx, _ in wf.history.levels)
+
+    # after the clear only the new frequency is in the history
+    for _ in range(10):
+        wf.update_from_psd(np.full(64, -60.0, dtype=np.float32), center_hz=437e6)
+    _, meta = wf.history.render(len(wf.history), len(wf.history), 10)
+    assert len(wf.history) == 10 and np.all(meta["center_hz"] == 437e6)
@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+
+from nast_gs.processing.waterfall_history import WaterfallHistory
+
+
+def test_history_spills_to_disk_and_pyramid_keeps_peaks(tmp_path):
+    h = WaterfallHistory(16, directory=str(tmp_path))
+    for i in range(5000):
+        row = np.full(16, 10, dtype=np.uint8)
+        if i == 1234:
+            row[5] = 250  # one-line burst
+        h.append(row, t=1000.0 + i, center_hz=437e6 + i, span_hz=2.4e6)
+
+    assert len(h) == 5000
+    assert os.path.getsize(tmp_path / "rows_0.bin") >= 5000 * 16
+    assert isinstance(h.levels[0][0].data, np.memmap)
+
+    # whole pass on 64 lines: served from a coarse level, burst still visible
+    rows, meta = h.render(end=5000, span=5000, out_rows=64)
+    assert rows.shape == (64, 16) and h.level_for(5000, 64) == 6
+    assert rows[:, 5].max() == 250 and rows[:, 4].max() == 10
+    assert meta["t"][0] > meta["t"][-1]  # newest first
+    # coarse levels only hold complete 2**k groups, so the top line may lag by < 2**k rows
+    assert meta["t"][0] > 1000.0 + 4999 - 64 and meta["center_hz"][0] - 437e6 == meta["t"][0] - 1000.0
+
+    # zoomed in at full resolution around the burst
+    rows, meta = h.render(end=1240, span=20, out_rows=20)
+    line = int(np.argmax(rows[:, 5]))
+    assert rows[line, 5] == 250 and meta["t"][line] == 1000.0 + 1234
+    h.close()
+
+
+def test_history_temp_dir_removed_on_close():
+    h = WaterfallHistory(8)
+    d = h.directory
+    h.append(np.zeros(8, np.uint8), t=0.0)
+    assert os.path.isdir(d)
+    h.close()
+    assert not os.path.exists(d)
+
+
+def test_history_rolls_over_at_max_rows(tmp_path):
+    h = WaterfallHistory(4, directory=str(tmp_path), max_rows=1000)
+    rng = np.random.default_rng(1)
+    rows = rng.integers(0, 256, size=(3333, 4), dtype=np.uint8)
+    for i, row in enumerate(rows):
+        h.append(row, t=float(i))
+
+    # oldest half dropped twice or more; newest rows kept in order
+    assert len(h) <= 1000 and h.dropped + len(h) == 3333
+    assert np.array_equal(h.levels[0][0][:], rows[h.dropped:])
+    assert h.meta["t"][0] == h.dropped and h.meta["t"][-1] == 3332
+    assert os.path.getsize(tmp_path / "rows_0.bin") <= 1000 * 4
+
+    # pyramid matches one built from scratch over the surviving rows
+    ref = WaterfallHistory(4, directory=str(tmp_path / "ref"), max_rows=1000)
+    for i, row in enumerate(rows[h.dropped:]):
+        ref.append(row, t=float(i))
+    assert len(h.levels) == len(ref.levels)
+    for (mx, mn), (rmx, rmn) in zip(h.levels, ref.levels):
+        assert np.array_equal(mx[:], rmx[:]) and np.array_equal(mn[:], rmn[:])
+    h.close()
+    ref.close()